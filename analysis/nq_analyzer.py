@@ -8,9 +8,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from indicators import IndicatorLibrary
+
 # הגדרת עיצוב עברית
 plt.rcParams['font.family'] = 'Arial Unicode MS'
 plt.rcParams['figure.figsize'] = (12, 8)
@@ -36,9 +43,7 @@ class NQAnalyzer:
         """
         print("📊 טוען נתוני NQ...")
         try:
-            self.df = pd.read_csv(self.data_file)
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
+            self.df = load_market_data(self.data_file)
             print(f"✅ נטענו {len(self.df):,} שורות נתונים")
             print(f"📅 תקופה: {self.df.index.min()} עד {self.df.index.max()}")
             return True
@@ -96,8 +101,9 @@ class NQAnalyzer:
         self.df['price_change_pct'] = self.df['close'].pct_change() * 100
         
         # זיהוי breakouts
-        self.df['high_breakout'] = self.df['high'] > self.df['high'].rolling(20).max().shift(1)
-        self.df['low_breakout'] = self.df['low'] < self.df['low'].rolling(20).min().shift(1)
+        ind = IndicatorLibrary(self.df)
+        self.df['high_breakout'] = self.df['high'] > ind.get('rolling_max', period=20).shift(1)
+        self.df['low_breakout'] = self.df['low'] < ind.get('rolling_min', period=20).shift(1)
         
         # זיהוי נפח חריג
         volume_mean = self.df['volume'].rolling(20).mean()
@@ -124,11 +130,12 @@ class NQAnalyzer:
         חישוב אינדיקטורים טכניים
         """
         print("📊 מחשב אינדיקטורים טכניים...")
+        ind = IndicatorLibrary(self.df)
         
         # Moving Averages
-        self.df['sma_20'] = self.df['close'].rolling(window=20).mean()
-        self.df['sma_50'] = self.df['close'].rolling(window=50).mean()
-        self.df['ema_20'] = self.df['close'].ewm(span=20).mean()
+        self.df['sma_20'] = ind.get('sma', period=20)
+        self.df['sma_50'] = ind.get('sma', period=50)
+        self.df['ema_20'] = ind.get('ema', period=20)
         
         # RSI
         self.df['rsi'] = self.calculate_rsi(self.df['close'])
@@ -140,8 +147,8 @@ class NQAnalyzer:
         self.calculate_bollinger_bands()
         
         # Volume indicators
-        self.df['volume_sma'] = self.df['volume'].rolling(window=20).mean()
-        self.df['volume_ratio'] = self.df['volume'] / self.df['volume_sma']
+        self.df['volume_sma'] = ind.get('volume_ma', period=20)
+        self.df['volume_ratio'] = ind.get('volume_ratio', period=20)
         
         print("✅ אינדיקטורים טכניים חושבו")
     
@@ -149,6 +156,9 @@ class NQAnalyzer:
         """
         חישוב RSI
         """
+        if prices.equals(self.df['close']):
+            return IndicatorLibrary(self.df).get('rsi', period=period)
+        
         delta = prices.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -160,21 +170,19 @@ class NQAnalyzer:
         """
         חישוב MACD
         """
-        exp1 = self.df['close'].ewm(span=12).mean()
-        exp2 = self.df['close'].ewm(span=26).mean()
-        self.df['macd'] = exp1 - exp2
-        self.df['macd_signal'] = self.df['macd'].ewm(span=9).mean()
-        self.df['macd_histogram'] = self.df['macd'] - self.df['macd_signal']
+        ind = IndicatorLibrary(self.df)
+        self.df['macd'] = ind.get('macd', fast=12, slow=26)
+        self.df['macd_signal'] = ind.get('macd_signal', fast=12, slow=26, signal=9)
+        self.df['macd_histogram'] = ind.get('macd_hist', fast=12, slow=26, signal=9)
     
     def calculate_bollinger_bands(self, period=20):
         """
         חישוב Bollinger Bands
         """
-        sma = self.df['close'].rolling(window=period).mean()
-        std = self.df['close'].rolling(window=period).std()
-        self.df['bb_upper'] = sma + (std * 2)
-        self.df['bb_lower'] = sma - (std * 2)
-        self.df['bb_middle'] = sma
+        ind = IndicatorLibrary(self.df)
+        self.df['bb_upper'] = ind.get('bb_upper', period=period, num_std=2)
+        self.df['bb_lower'] = ind.get('bb_lower', period=period, num_std=2)
+        self.df['bb_middle'] = ind.get('bb_middle', period=period)
     
     def find_trading_opportunities(self):
         """
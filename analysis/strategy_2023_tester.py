@@ -7,9 +7,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data, row_counts
+from indicators import IndicatorLibrary
+
 class Strategy2023Tester:
     def __init__(self):
         self.df = None
@@ -21,14 +28,11 @@ class Strategy2023Tester:
         
         try:
             # טעינת הנתונים
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת שנת 2023
-            self.df_2023 = self.df[self.df.index.year == 2023].copy()
+            # טעינת שנת 2023 בלבד מהמטמון הבינארי
+            self.df_2023 = load_market_data('../data/NQ2018.csv', years=[2023])
+            total_rows = sum(row_counts('../data/NQ2018.csv').values())
             
-            print(f"✅ נטענו {len(self.df):,} שורות נתונים כולל")
+            print(f"✅ נטענו {total_rows:,} שורות נתונים כולל")
             print(f"📅 מתוכם {len(self.df_2023):,} שורות מ-2023")
             print(f"📅 תקופת 2023: {self.df_2023.index.min()} עד {self.df_2023.index.max()}")
             
@@ -41,48 +45,41 @@ class Strategy2023Tester:
     def calculate_indicators(self, df):
         """חישוב אינדיקטורים טכניים"""
         print("📊 מחשב אינדיקטורים טכניים...")
+        ind = IndicatorLibrary(df)
         
         # חישוב תשואות
-        df['returns'] = df['close'].pct_change()
+        df['returns'] = ind.get('returns')
         
         # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = ind.get('rsi', period=14)
         
         # Moving Averages
-        df['sma_5'] = df['close'].rolling(window=5).mean()
-        df['sma_10'] = df['close'].rolling(window=10).mean()
-        df['sma_20'] = df['close'].rolling(window=20).mean()
-        df['sma_50'] = df['close'].rolling(window=50).mean()
-        df['sma_200'] = df['close'].rolling(window=200).mean()
+        for period in [5, 10, 20, 50, 200]:
+            df[f'sma_{period}'] = ind.get('sma', period=period)
         
         # EMA
-        df['ema_9'] = df['close'].ewm(span=9).mean()
-        df['ema_21'] = df['close'].ewm(span=21).mean()
+        df['ema_9'] = ind.get('ema', period=9)
+        df['ema_21'] = ind.get('ema', period=21)
         
         # MACD
-        df['macd'] = df['ema_9'] - df['ema_21']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
+        df['macd'] = ind.get('macd', fast=9, slow=21)
+        df['macd_signal'] = ind.get('macd_signal', fast=9, slow=21, signal=9)
+        df['macd_histogram'] = ind.get('macd_hist', fast=9, slow=21, signal=9)
         
         # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
+        df['bb_middle'] = ind.get('bb_middle', period=20)
+        df['bb_upper'] = ind.get('bb_upper', period=20, num_std=2)
+        df['bb_lower'] = ind.get('bb_lower', period=20, num_std=2)
         
         # Volume indicators
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
+        df['volume_ma'] = ind.get('volume_ma', period=20)
         df['volume_spike'] = df['volume'] > df['volume_ma'] * 1.5
         
         # Price position
         df['price_position'] = (df['close'] - df['low']) / (df['high'] - df['low'])
         
         # Volatility
-        df['volatility'] = df['returns'].rolling(window=20).std()
+        df['volatility'] = ind.get('volatility', period=20)
         
         # Time features
         df['hour'] = df.index.hour
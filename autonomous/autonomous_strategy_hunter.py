@@ -4,36 +4,82 @@ Autonomous Strategy Hunter
 IA-ב תולת אלל תימוקמ הצר
 """
 
-import pandas as pd
 import numpy as np
 import random
 import time
 import json
+import os
+import sys
+import signal
+import argparse
+import multiprocessing
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from backtest_kernel import BarArrays
+from fitness_cache import FitnessCache, dna_key
+from shared_dataset import SharedDataset
+from market_data import load_market_data
+from indicators import IndicatorLibrary, IndicatorDiskCache
+from jump_chain import JumpChainSimulator, min_holding_bars, trade_upper_bound
+from entry_mask_cache import EntryMaskCache
+from trade_ledger import TradeLedger
+
+# מינימום העסקאות של evaluate_fitness - DNA שחסם העסקאות שלו נמוך יותר נפסל לפני הסימולטור
+MIN_FITNESS_TRADES = 50
+
+def physical_core_count():
+    """מספר הליבות הפיזיות (Linux), אחרת מספר הליבות הלוגיות - לכל היותר הליבות שהתהליך רשאי לרוץ עליהן"""
+    allowed = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    try:
+        cores = set()
+        physical_id = None
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('physical id'):
+                    physical_id = line.split(':')[1].strip()
+                elif line.startswith('core id'):
+                    cores.add((physical_id, line.split(':')[1].strip()))
+        if cores:
+            return min(len(cores), allowed)
+    except OSError:
+        pass
+    return allowed
+
 class AutonomousStrategyHunter:
-    def __init__(self):
+    def __init__(self, workers=1, rebuild_indicators=False):
         self.df = None
         self.df_2024 = None
+        self.arrays = None
+        self.jump_chain = None
+        self.entry_masks = None
         self.population_size = 100
         self.elite_size = 20
         self.mutation_rate = 0.15
         self.best_strategies = []
         self.generation = 0
+        self.fitness_cache = FitnessCache(max_size=2000)
+        self.workers = workers
+        self.prescreen = True
+        self.prescreen_rejected = 0
+        self.prescreen_saved = 0.0
+        self.pool = None
+        self.shared_dataset = None
+        self.shared_masks = None
+        self.indicator_cache = IndicatorDiskCache()
+        if rebuild_indicators:
+            self.indicator_cache.clear()
         
     def load_data(self):
         """םינותנ תניעט"""
         print("🤖 ...םינותנ ןעוט - תימונוטוא תכרעמ")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ 4202-מ םינותנ תודוקנ {len(self.df_2024):,} ונעטנ")
             self.calculate_indicators()
@@ -49,6 +95,7 @@ class AutonomousStrategyHunter:
         print("📊 ...םירוטקידניא בשחמ")
         
         df = self.df_2024
+        ind = IndicatorLibrary(df, disk_cache=self.indicator_cache)
         
         # Basic
         df['hour'] = df.index.hour
@@ -64,32 +111,31 @@ class AutonomousStrategyHunter:
         
         # Moving averages
         for period in [5, 10, 20, 50]:
-            df[f'ma_{period}'] = df['close'].rolling(window=period).mean()
+            df[f'ma_{period}'] = ind.get('sma', period=period)
             df[f'above_ma_{period}'] = df['close'] > df[f'ma_{period}']
         
         # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = ind.get('rsi', period=14)
         
         # Volume
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma']
+        df['volume_ma'] = ind.get('volume_ma', period=20)
+        df['volume_ratio'] = ind.get('volume_ratio', period=20)
         df['high_volume'] = df['volume_ratio'] > 1.5
         
         # Price momentum
         for period in [3, 5, 10]:
-            df[f'momentum_{period}'] = (df['close'] / df['close'].shift(period) - 1) * 100
+            df[f'momentum_{period}'] = ind.get('momentum', period=period)
             df[f'positive_momentum_{period}'] = df[f'momentum_{period}'] > 0
         
         # Support/Resistance
-        df['recent_high'] = df['high'].rolling(window=20).max()
-        df['recent_low'] = df['low'].rolling(window=20).min()
+        df['recent_high'] = ind.get('rolling_max', period=20)
+        df['recent_low'] = ind.get('rolling_min', period=20)
         df['near_resistance'] = df['close'] > df['recent_high'] * 0.995
         df['near_support'] = df['close'] < df['recent_low'] * 1.005
         
+        # מערכים רציפים ל-backtest
+        self.arrays = BarArrays.from_frame(df)
+        
         print("✅ םיבושחמ םירוטקידניא")
     
     def create_random_dna(self):
@@ -125,160 +171,176 @@ class AutonomousStrategyHunter:
     
     def apply_strategy(self, dna):
         """הפעלת אסטרטגיה על הנתונים"""
-        df = self.df_2024.copy()
-        
-        # Build entry conditions
-        entry_condition = pd.Series(True, index=df.index)
-        
-        # Market hours
-        entry_condition &= df['is_market_open'] & df['is_weekday']
-        
-        # Time filter
-        if dna['use_time_filter']:
-            entry_condition &= df['hour'].isin(dna['allowed_hours'])
-        
-        # Trend filter
-        if dna['use_trend']:
-            ma_col = f"above_ma_{dna['ma_period']}"
-            entry_condition &= df[ma_col]
-        
-        # RSI filter
-        if dna['use_rsi']:
-            entry_condition &= (df['rsi'] > dna['rsi_low']) & (df['rsi'] < dna['rsi_high'])
-        
-        # Volume filter
-        if dna['use_volume']:
-            entry_condition &= df['volume_ratio'] > dna['volume_threshold']
-        
-        # Momentum filter
-        if dna['use_momentum']:
-            momentum_col = f"positive_momentum_{dna['momentum_period']}"
-            entry_condition &= df[momentum_col]
-        
-        # Price action filter
-        if dna['use_price_action']:
-            entry_condition &= df['is_green'] & (df['body_ratio'] > dna['min_body_ratio'])
-        
-        return self.backtest_strategy(df, entry_condition, dna)
+        return self.backtest_strategy(self.entry_signals(dna), dna)
     
-    def backtest_strategy(self, df, entry_signals, dna):
-        """Backtesting אסטרטגיה"""
-        position = 0
-        entry_price = 0
-        trades = []
-        bars_in_trade = 0
-        
-        for i in range(1, len(df)):
-            if i >= len(df) - 1:
-                break
+    def entry_mask_cache(self):
+        """מטמון המסכות של המערכים הנוכחיים"""
+        if self.entry_masks is None or self.entry_masks.arrays is not self.arrays:
+            self.entry_masks = EntryMaskCache(self.arrays)
+        return self.entry_masks
+    
+    def entry_signals(self, dna):
+        """תנאי הכניסה של DNA - ה-AND של הפילטרים הקטגוריים נשלף ממטמון המסכות"""
+        return self.entry_mask_cache().entry_signals(dna)
+    
+    def screen_dna(self, dna):
+        """מסכת הכניסה של DNA, או None אם נפסל בסינון המוקדם:
+        קודם חסם האותות (popcount + searchsorted, בלי מסכה), ואז חסם העסקאות ממסכת הכניסה"""
+        masks = self.entry_mask_cache()
+        hold = min_holding_bars(dna)
+        bound = masks.signal_upper_bound(dna) if self.prescreen else None
+        if self.prescreen and (hold is None or bound < MIN_FITNESS_TRADES):
+            return None
+        entry_signals = masks.entry_signals(dna)
+        # רצפי אותות מורידים את החסם לכל היותר פי hold + 1 - מעבר למסכה רק כשזה יכול לפסול
+        if (self.prescreen and bound < MIN_FITNESS_TRADES * (hold + 1)
+                and trade_upper_bound(entry_signals, dna) < MIN_FITNESS_TRADES):
+            return None
+        return entry_signals
+    
+    def evaluate_dna(self, dna):
+        """כושר ויומן עסקאות של DNA יחיד. DNA שנפסל בסינון המוקדם מקבל יומן ריק
+        עם pruned = 'prescreen' - אותו כושר (0) כמו אחרי backtest"""
+        entry_signals = self.screen_dna(dna)
+        if entry_signals is None:
+            trades = self.prescreened()
+        else:
+            trades = self.backtest_strategy(entry_signals, dna)
+        return self.evaluate_fitness(trades), trades
+    
+    def evaluate_batch(self, individuals):
+        """כושר ויומן עסקאות לקבוצת DNA - כל מי שעבר את הסינון המוקדם רץ יחד
+        בסימולטור האוכלוסיה (צעד אחד = העסקה הבאה של כל DNA פעיל)"""
+        screened = [self.screen_dna(dna) for dna in individuals]
+        survivors = [k for k, entry_signals in enumerate(screened) if entry_signals is not None]
+        ledgers = [self.prescreened() for _ in individuals]
+        if survivors:
+            simulated = self.jump_chain_simulator().run_population(
+                [screened[k] for k in survivors], [individuals[k] for k in survivors])
+            for k, trades in zip(survivors, simulated):
+                ledgers[k] = trades
+        return [(self.evaluate_fitness(trades), trades) for trades in ledgers]
+    
+    def prescreened(self):
+        """יומן ריק של DNA שנפסל בסינון המוקדם"""
+        trades = TradeLedger()
+        trades.pruned = 'prescreen'
+        return trades
+    
+    def jump_chain_simulator(self):
+        """סימולטור הקפיצות של המערכים הנוכחיים - נבנה מחדש אם המערכים הוחלפו"""
+        if self.jump_chain is None or self.jump_chain.arrays is not self.arrays:
+            self.jump_chain = JumpChainSimulator(self.arrays)
+        return self.jump_chain
+    
+    def backtest_strategy(self, entry_signals, dna):
+        """Backtesting אסטרטגיה - קפיצה מעסקה לעסקה במקום מעבר על כל בר"""
+        return self.jump_chain_simulator().run(entry_signals, dna)
+    
+    def evaluate_population(self, population):
+        """הערכת אוכלוסיה - DNA שכבר הוערך נשלף מהמטמון בלי backtest"""
+        results = [None] * len(population)
+        pending = {}
+        self.prescreen_rejected = 0
+        self.prescreen_saved = 0.0
+        
+        for k, individual in enumerate(population):
+            key = dna_key(individual)
+            if key in pending:
+                # כפיל בתוך אותו דור - יחושב פעם אחת
+                self.fitness_cache.hits += 1
+                pending[key].append(k)
+                continue
             
-            current_price = df.iloc[i]['open']
+            cached = self.fitness_cache.get(key)
+            if cached is not None:
+                results[k] = (cached[0], individual, cached[1])
+            else:
+                pending[key] = [k]
+        
+        if pending:
+            keys = list(pending)
+            individuals = [population[pending[key][0]] for key in keys]
             
-            # Entry
-            if position == 0 and entry_signals.iloc[i-1]:
-                position = 1
-                entry_price = current_price
-                bars_in_trade = 0
+            start = time.perf_counter()
+            if self.pool is not None:
+                # קבוצה רציפה לכל עובד; map שומר על סדר הקלט - הריצה נשארת דטרמיניסטית
+                size = -(-len(individuals) // self.workers)
+                chunks = [individuals[i:i + size] for i in range(0, len(individuals), size)]
+                evaluated = [result for chunk in self.pool.map(_evaluate_batch, chunks) for result in chunk]
+            else:
+                # כל הדור במעבר משותף אחד של סימולטור האוכלוסיה
+                evaluated = self.evaluate_batch(individuals)
+            elapsed = time.perf_counter() - start
             
-            # Exit
-            elif position == 1:
-                bars_in_trade += 1
-                should_exit = False
-                exit_reason = ""
-                
-                # Profit target
-                if dna['use_profit_target']:
-                    if current_price >= entry_price * (1 + dna['profit_target']):
-                        should_exit = True
-                        exit_reason = "profit_target"
-                
-                # Stop loss
-                if dna['use_stop_loss'] and not should_exit:
-                    if current_price <= entry_price * (1 - dna['stop_loss']):
-                        should_exit = True
-                        exit_reason = "stop_loss"
-                
-                # Time exit
-                if dna['use_time_exit'] and not should_exit:
-                    if bars_in_trade >= dna['max_bars']:
-                        should_exit = True
-                        exit_reason = "time_exit"
-                
-                # RSI exit
-                if dna['use_rsi_exit'] and not should_exit:
-                    if df.iloc[i]['rsi'] > dna['rsi_exit_high']:
-                        should_exit = True
-                        exit_reason = "rsi_exit"
-                
-                # Trend exit
-                if dna['use_trend_exit'] and not should_exit:
-                    ma_col = f"above_ma_{dna['ma_period']}"
-                    if not df.iloc[i][ma_col]:
-                        should_exit = True
-                        exit_reason = "trend_exit"
-                
-                # Resistance exit
-                if dna['use_resistance_exit'] and not should_exit:
-                    if df.iloc[i]['near_resistance']:
-                        should_exit = True
-                        exit_reason = "resistance_exit"
-                
-                if should_exit:
-                    exit_price = current_price
-                    trade_return = (exit_price - entry_price) / entry_price
-                    trade_pnl = trade_return * 20000
-                    
-                    trades.append({
-                        'pnl': trade_pnl,
-                        'return': trade_return,
-                        'bars_held': bars_in_trade,
-                        'exit_reason': exit_reason
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-                    bars_in_trade = 0
+            # זמן שנחסך - הערכה לפי הזמן הממוצע של DNA שכן הגיע לסימולטור
+            self.prescreen_rejected = sum(1 for _, trades in evaluated if trades.pruned == 'prescreen')
+            simulated = len(evaluated) - self.prescreen_rejected
+            if simulated:
+                self.prescreen_saved = elapsed / simulated * self.prescreen_rejected
+            
+            for key, (fitness, trades) in zip(keys, evaluated):
+                self.fitness_cache.put(key, fitness, trades)
+                for k in pending[key]:
+                    results[k] = (fitness, population[k], trades)
         
-        return trades
+        return results
+    
+    def start_worker_pool(self):
+        """הפעלת מאגר תהליכים - העמודות, אינדקסי הספים והמסכות הבסיסיות מפורסמים פעם אחת
+        בזיכרון משותף, וגם תהליך האב עובר לקרוא מה-views במקום מהעותק הפרטי"""
+        self.shared_dataset = SharedDataset.publish(self.arrays.columns)
+        self.shared_masks = SharedDataset.publish(self.entry_mask_cache().shared_columns(), prefix='nqmask')
+        self.use_shared(self.shared_dataset, self.shared_masks)
+        shared_bytes = self.shared_dataset.nbytes() + self.shared_masks.nbytes()
+        print(f"🖥️  {self.workers} :םידבוע | {shared_bytes / 1e6:.1f}MB :ףתושמ ןורכיז")
+        self.pool = multiprocessing.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(self.shared_dataset.manifest, self.shared_masks.manifest)
+        )
+    
+    def use_shared(self, dataset, masks):
+        """מעבר למערכים ולמטמון מסכות מעל הזיכרון המשותף - סימולטור הקפיצות נבנה מחדש עליהם"""
+        self.arrays = BarArrays(dataset.columns)
+        self.entry_masks = EntryMaskCache(self.arrays, shared=masks.columns)
+    
+    def stop_worker_pool(self):
+        """סגירת מאגר התהליכים ושחרור הזיכרון המשותף"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.shared_dataset is not None:
+            # ה-views לא תקפים אחרי close - עותק פרטי לפני השחרור
+            self.arrays = BarArrays({name: np.array(values) for name, values in self.arrays.columns.items()})
+            self.entry_masks = None
+            self.jump_chain = None
+            self.shared_dataset.close()
+            self.shared_masks.close()
+            self.shared_dataset = None
+            self.shared_masks = None
     
     def evaluate_fitness(self, trades):
         """הערכת כושר אסטרטגיה"""
-        if len(trades) < 50:  # Minimum trades for evaluation
+        # Minimum trades for evaluation - גם יומן ריק של DNA שנפסל בסינון המוקדם
+        if len(trades) < MIN_FITNESS_TRADES:
             return 0
         
-        trade_pnls = [t['pnl'] for t in trades]
-        total_return = sum(trade_pnls)
+        metrics = trades.metrics()
+        total_return = metrics['total_return']
         
         if total_return <= 0:
             return 0
         
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
-        
-        if len(losing_trades) == 0 or len(winning_trades) == 0:
+        if metrics['num_losses'] == 0 or metrics['num_wins'] == 0:
             return 0
         
-        win_rate = len(winning_trades) / len(trades)
-        avg_trade = total_return / len(trades)
-        
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss
-        
-        # Sharpe-like metric
-        returns_std = np.std(trade_pnls)
-        sharpe_like = avg_trade / returns_std if returns_std > 0 else 0
-        
-        # Max consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        sharpe_like = metrics['sharpe_per_trade']
+        max_consecutive_losses = metrics['max_consecutive_losses']
         
         # Fitness calculation - prioritize strategies that meet criteria
         fitness = 0
@@ -355,8 +417,8 @@ class AutonomousStrategyHunter:
             'dna': dna,
             'fitness': fitness,
             'num_trades': len(trades),
-            'total_return': sum([t['pnl'] for t in trades]),
-            'win_rate': len([t for t in trades if t['pnl'] > 0]) / len(trades) if trades else 0
+            'total_return': float(trades.metrics()['total_return']),
+            'win_rate': trades.metrics()['win_rate']
         }
         
         self.best_strategies.append(strategy_data)
@@ -369,46 +431,25 @@ class AutonomousStrategyHunter:
     
     def check_winning_criteria(self, trades):
         """בדיקת קריטריונים מנצחים"""
+        if trades.pruned is not None:
+            return False, f"נפסל מוקדם: {trades.pruned}"
+        
         if len(trades) < 200:
             return False, "עסקאות < 200"
         
-        trade_pnls = [t['pnl'] for t in trades]
-        total_return = sum(trade_pnls)
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
+        metrics = trades.metrics()
         
-        if len(losing_trades) == 0:
+        if metrics['num_losses'] == 0:
             return False, "אין עסקאות מפסידות"
         
-        avg_trade = total_return / len(trades)
-        win_rate = len(winning_trades) / len(trades)
-        
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss
-        
-        avg_win = gross_profit / len(winning_trades)
-        avg_loss = gross_loss / len(losing_trades)
-        win_loss_ratio = avg_win / avg_loss
-        
-        returns_std = np.std(trade_pnls)
-        sharpe = (avg_trade / returns_std) * np.sqrt(252*24) if returns_std > 0 else 0
-        
-        # Max consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
-        
-        # Drawdown
-        equity_curve = np.cumsum(trade_pnls) + 100000
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = equity_curve - peak
-        max_drawdown = np.min(drawdown)
+        total_return = metrics['total_return']
+        avg_trade = metrics['avg_trade']
+        win_rate = metrics['win_rate']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_hourly']
+        max_consecutive_losses = metrics['max_consecutive_losses']
+        max_drawdown = metrics['max_drawdown']
         
         criteria = {
             'min_trades': len(trades) >= 200,
@@ -435,6 +476,14 @@ class AutonomousStrategyHunter:
         if not self.load_data():
             return
         
+        cores = physical_core_count()
+        if self.workers > cores:
+            # יותר תהליכים מליבות פיזיות רק מוסיף החלפות הקשר ו-IPC - בליבה אחת זה סדרתי
+            print(f"⚠️  {cores} :תויזיפ תוביל - {cores}-ל ודרוה {self.workers} םידבוע")
+            self.workers = cores
+        if self.workers > 1:
+            self.start_worker_pool()
+        
         print(f"\n🤖 !תימונוטוא היצולובא ליחתמ")
         print(f"📊 {self.population_size} :הייסולכוא לדוג")
         print(f"🧬 {self.mutation_rate} :היצטומ רועיש")
@@ -453,11 +502,7 @@ class AutonomousStrategyHunter:
                 self.generation += 1
                 
                 # הערכת אוכלוסיה
-                fitness_scores = []
-                for individual in population:
-                    trades = self.apply_strategy(individual)
-                    fitness = self.evaluate_fitness(trades)
-                    fitness_scores.append((fitness, individual, trades))
+                fitness_scores = self.evaluate_population(population)
                 
                 # מיון לפי fitness
                 fitness_scores.sort(key=lambda x: x[0], reverse=True)
@@ -466,7 +511,7 @@ class AutonomousStrategyHunter:
                 best_fitness, best_individual, best_trades = fitness_scores[0]
                 avg_fitness = np.mean([f[0] for f in fitness_scores])
                 
-                print(f"🔄 {len(best_trades):3d} :sedart | {avg_fitness:6.1f} :gvA | {best_fitness:8.1f} :tseB | {self.generation:4d} רוד")
+                print(f"🔄 {self.prescreen_saved:5.2f}s :ךסחנ | {self.prescreen_rejected:3d} :שארמ ולספנ | {self.fitness_cache.hit_rate():5.1f}% :ehcac | {len(best_trades):3d} :sedart | {avg_fitness:6.1f} :gvA | {best_fitness:8.1f} :tseB | {self.generation:4d} רוד")
                 
                 # בדיקת קריטריונים מנצחים
                 is_winner, criteria_status = self.check_winning_criteria(best_trades)
@@ -511,10 +556,13 @@ class AutonomousStrategyHunter:
                     print(f"\n📊 סיכום ביניים - דור {self.generation}")
                     print(f"🏆 הטובה ביותר עד כה: {best_fitness:.1f}")
                     print(f"📈 עסקאות: {len(best_trades)}")
-                    if best_trades:
-                        total_return = sum([t['pnl'] for t in best_trades])
+                    if len(best_trades):
+                        total_return = best_trades.metrics()['total_return']
                         print(f"💰 תשואה: ${total_return:.0f}")
                     print(f"❌ {criteria_status}")
+                    if self.entry_masks is not None:
+                        print(f"🎭 מטמון מסכות כניסה: {self.entry_masks.hit_rate():.1f}% פגיעות | "
+                              f"{len(self.entry_masks)} מסכות | {self.entry_masks.nbytes / 1e6:.1f}MB")
                     print("-" * 60)
         
         except KeyboardInterrupt:
@@ -522,13 +570,15 @@ class AutonomousStrategyHunter:
             print(f"🏆 {best_fitness:.1f} :רתוי הבוטה")
             if self.best_strategies:
                 print(f"💾 תובוט תויגטרטסא {len(self.best_strategies)} ורמשנ")
+        
+        finally:
+            self.stop_worker_pool()
     
     def save_winning_strategy(self, dna, trades):
         """שמירת אסטרטגיה מנצחת"""
-        trade_pnls = [t['pnl'] for t in trades]
-        total_return = sum(trade_pnls)
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        win_rate = len(winning_trades) / len(trades)
+        metrics = trades.metrics()
+        total_return = float(metrics['total_return'])
+        win_rate = metrics['win_rate']
         
         winning_strategy = {
             'timestamp': datetime.now().isoformat(),
@@ -537,7 +587,7 @@ class AutonomousStrategyHunter:
             'num_trades': len(trades),
             'total_return': total_return,
             'win_rate': win_rate,
-            'avg_trade': total_return / len(trades)
+            'avg_trade': metrics['avg_trade']
         }
         
         # שמירה לקובץ
@@ -550,8 +600,31 @@ class AutonomousStrategyHunter:
         print(f"💰 תשואה: ${total_return:.0f}")
         print(f"🎯 אחוז הצלחה: {win_rate*100:.1f}%")
 
+# תהליך עובד - מחזיק עותק יחיד של המערכים לכל אורך חייו
+_worker_hunter = None
+
+def _init_worker(manifest, mask_manifest):
+    """אתחול תהליך עובד - התחברות לעמודות ולמסכות המשותפות כ-views ללא העתקה"""
+    global _worker_hunter
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_hunter = AutonomousStrategyHunter()
+    _worker_hunter.shared_dataset = SharedDataset.attach(manifest)
+    _worker_hunter.shared_masks = SharedDataset.attach(mask_manifest)
+    _worker_hunter.use_shared(_worker_hunter.shared_dataset, _worker_hunter.shared_masks)
+
+def _evaluate_batch(individuals):
+    """Backtest והערכת קבוצת DNA בתהליך עובד"""
+    return _worker_hunter.evaluate_batch(individuals)
+
 def main():
     """תישאר היצקנופ"""
+    parser = argparse.ArgumentParser(description='Autonomous Strategy Hunter')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='מספר תהליכים להערכת האוכלוסיה במקביל (לכל היותר מספר הליבות הפיזיות)')
+    parser.add_argument('--rebuild-indicators', action='store_true',
+                        help='מחיקת מטמון האינדיקטורים בדיסק וחישוב מחדש')
+    args = parser.parse_args()
+    
     print("🤖 Autonomous Strategy Hunter")
     print("=" * 60)
     print("תוחצנמ תויגטרטסא תאיצמל תימונוטוא תכרעמ")
@@ -559,7 +632,9 @@ def main():
     print("םלשומ ןורתפ תאיצמל דע 7/42 תויגטרטסא שפחמ")
     print()
     
-    hunter = AutonomousStrategyHunter()
+    hunter = AutonomousStrategyHunter(
+        workers=args.workers, rebuild_indicators=args.rebuild_indicators
+    )
     hunter.run_autonomous_evolution()
 
 if __name__ == "__main__":
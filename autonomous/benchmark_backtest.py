@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark Backtest - בדיקת זהות ומהירות של מנוע ה-backtest
+משווה את לולאת ה-iloc המקורית למנוע המערכים על אותם DNA
+"""
+
+import argparse
+import random
+import time
+import pandas as pd
+
+from autonomous_strategy_hunter import AutonomousStrategyHunter
+from bar_feed import make_synthetic_bars
+
+# השדות שהלולאה המקורית רשמה לכל עסקה
+LEGACY_FIELDS = ('pnl', 'return', 'bars_held', 'exit_reason')
+
+def prepare_hunter(synthetic_bars, volatility=4):
+    """הכנת hunter עם נתונים אמיתיים או סינתטיים"""
+    hunter = AutonomousStrategyHunter()
+    if synthetic_bars:
+        hunter.df_2024 = make_synthetic_bars(synthetic_bars, volatility=volatility)
+        hunter.calculate_indicators()
+        return hunter
+    if not hunter.load_data():
+        return None
+    return hunter
+
+def legacy_backtest(df, entry_signals, dna):
+    """לולאת ה-backtest המקורית (iloc לכל בר) - לבדיקת זהות בלבד"""
+    position = 0
+    entry_price = 0
+    trades = []
+    bars_in_trade = 0
+
+    for i in range(1, len(df)):
+        if i >= len(df) - 1:
+            break
+
+        current_price = df.iloc[i]['open']
+
+        # Entry
+        if position == 0 and entry_signals.iloc[i-1]:
+            position = 1
+            entry_price = current_price
+            bars_in_trade = 0
+
+        # Exit
+        elif position == 1:
+            bars_in_trade += 1
+            should_exit = False
+            exit_reason = ""
+
+            if dna['use_profit_target']:
+                if current_price >= entry_price * (1 + dna['profit_target']):
+                    should_exit = True
+                    exit_reason = "profit_target"
+
+            if dna['use_stop_loss'] and not should_exit:
+                if current_price <= entry_price * (1 - dna['stop_loss']):
+                    should_exit = True
+                    exit_reason = "stop_loss"
+
+            if dna['use_time_exit'] and not should_exit:
+                if bars_in_trade >= dna['max_bars']:
+                    should_exit = True
+                    exit_reason = "time_exit"
+
+            if dna['use_rsi_exit'] and not should_exit:
+                if df.iloc[i]['rsi'] > dna['rsi_exit_high']:
+                    should_exit = True
+                    exit_reason = "rsi_exit"
+
+            if dna['use_trend_exit'] and not should_exit:
+                ma_col = f"above_ma_{dna['ma_period']}"
+                if not df.iloc[i][ma_col]:
+                    should_exit = True
+                    exit_reason = "trend_exit"
+
+            if dna['use_resistance_exit'] and not should_exit:
+                if df.iloc[i]['near_resistance']:
+                    should_exit = True
+                    exit_reason = "resistance_exit"
+
+            if should_exit:
+                exit_price = current_price
+                trade_return = (exit_price - entry_price) / entry_price
+                trade_pnl = trade_return * 20000
+
+                trades.append({
+                    'pnl': trade_pnl,
+                    'return': trade_return,
+                    'bars_held': bars_in_trade,
+                    'exit_reason': exit_reason
+                })
+
+                position = 0
+                entry_price = 0
+                bars_in_trade = 0
+
+    return trades
+
+def legacy_entry_signals(hunter, dna):
+    """תנאי הכניסה כ-Series של pandas, כמו ב-apply_strategy"""
+    df = hunter.df_2024
+    entry_condition = pd.Series(True, index=df.index)
+    entry_condition &= df['is_market_open'] & df['is_weekday']
+    if dna['use_time_filter']:
+        entry_condition &= df['hour'].isin(dna['allowed_hours'])
+    if dna['use_trend']:
+        entry_condition &= df[f"above_ma_{dna['ma_period']}"]
+    if dna['use_rsi']:
+        entry_condition &= (df['rsi'] > dna['rsi_low']) & (df['rsi'] < dna['rsi_high'])
+    if dna['use_volume']:
+        entry_condition &= df['volume_ratio'] > dna['volume_threshold']
+    if dna['use_momentum']:
+        entry_condition &= df[f"positive_momentum_{dna['momentum_period']}"]
+    if dna['use_price_action']:
+        entry_condition &= df['is_green'] & (df['body_ratio'] > dna['min_body_ratio'])
+    return entry_condition
+
+def check_parity(hunter, num_dnas, legacy_bars):
+    """בדיקת זהות רשימת העסקאות מול הלולאה המקורית"""
+    print(f"🔍 בודק זהות על {num_dnas} DNA ({legacy_bars:,} ברים ללולאה המקורית)...")
+
+    full_df = hunter.df_2024
+    full_arrays = hunter.arrays
+    hunter.df_2024 = full_df.iloc[:legacy_bars]
+    hunter.calculate_indicators()
+
+    mismatches = 0
+    legacy_time = 0
+    kernel_time = 0
+
+    try:
+        for _ in range(num_dnas):
+            dna = hunter.create_random_dna()
+            entry_signals = legacy_entry_signals(hunter, dna)
+
+            start = time.perf_counter()
+            expected = legacy_backtest(hunter.df_2024, entry_signals, dna)
+            legacy_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = hunter.backtest_strategy(entry_signals.to_numpy(), dna)
+            kernel_time += time.perf_counter() - start
+
+            if expected != actual.to_dicts(LEGACY_FIELDS):
+                mismatches += 1
+                print(f"❌ אי-התאמה: {len(expected)} מול {len(actual)} עסקאות")
+    finally:
+        hunter.df_2024 = full_df
+        hunter.arrays = full_arrays
+
+    print(f"✅ {num_dnas - mismatches}/{num_dnas} DNA זהים")
+    if kernel_time > 0:
+        print(f"⚡ לולאה מקורית: {legacy_time / num_dnas * 1000:.1f}ms | "
+              f"מנוע מערכים: {kernel_time / num_dnas * 1000:.2f}ms | "
+              f"האצה: x{legacy_time / kernel_time:.0f}")
+
+    return mismatches == 0
+
+def benchmark_kernel(hunter, num_dnas):
+    """זמן הערכה ל-DNA על כל הנתונים"""
+    dnas = [hunter.create_random_dna() for _ in range(num_dnas)]
+
+    start = time.perf_counter()
+    total_trades = 0
+    for dna in dnas:
+        total_trades += len(hunter.apply_strategy(dna))
+    elapsed = time.perf_counter() - start
+
+    print(f"⏱️  {len(hunter.df_2024):,} ברים | {elapsed / num_dnas * 1000:.1f}ms ל-DNA | "
+          f"{total_trades / num_dnas:.0f} עסקאות בממוצע")
+    return elapsed
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Backtest parity & speed benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--dnas', type=int, default=20)
+    parser.add_argument('--legacy-bars', type=int, default=20000,
+                        help='מספר ברים ללולאה המקורית (איטית)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("⚡ Benchmark Backtest")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    parity_ok = check_parity(hunter, args.dnas, min(args.legacy_bars, len(hunter.df_2024)))
+    benchmark_kernel(hunter, args.dnas)
+
+    if not parity_ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
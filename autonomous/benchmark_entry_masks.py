@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark Entry Masks - בדיקת זהות ומהירות של מטמון מסכות הכניסה
+משווה את EntryMaskCache ל-build_entry_signals על DNA של אוכלוסיה מתפתחת
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from backtest_kernel import build_entry_signals
+from entry_mask_cache import EntryMaskCache
+from benchmark_backtest import prepare_hunter
+
+def evolved_dnas(hunter, count, elite):
+    """DNA כמו בדורות של run_autonomous_evolution - צאצאים של עילית קטנה"""
+    dnas = [hunter.create_random_dna() for _ in range(elite)]
+    while len(dnas) < count:
+        parents = dnas[-elite:]
+        child = hunter.crossover(random.choice(parents), random.choice(parents))
+        dnas.append(hunter.mutate(child))
+    return dnas
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Entry mask cache parity & speed benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--dnas', type=int, default=2000)
+    parser.add_argument('--elite', type=int, default=20)
+    parser.add_argument('--max-mb', type=float, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("🎭 Benchmark Entry Masks")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    dnas = evolved_dnas(hunter, args.dnas, args.elite)
+    cache = EntryMaskCache(hunter.arrays, max_bytes=int(args.max_mb * 1024 * 1024))
+
+    mismatches = 0
+    direct_time = 0
+    cached_time = 0
+    for dna in dnas:
+        start = time.perf_counter()
+        expected = build_entry_signals(hunter.arrays, dna)
+        direct_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = cache.entry_signals(dna)
+        cached_time += time.perf_counter() - start
+
+        if not np.array_equal(expected, actual):
+            mismatches += 1
+
+    lookups = len(dnas)
+    unpacked = hunter.arrays.length * len(cache)
+    print(f"✅ {lookups - mismatches}/{lookups} מסכות זהות")
+    print(f"🎯 פגיעות: {cache.hits / lookups * 100:.1f}% מלאות | {cache.prefix_hits / lookups * 100:.1f}% קידומת | "
+          f"{cache.misses / lookups * 100:.1f}% החמצות")
+    print(f"💾 {len(cache)} מסכות ב-{cache.nbytes / 1e6:.1f}MB (בלי דחיסה: {unpacked / 1e6:.1f}MB)")
+    print(f"⏱️  {hunter.arrays.length:,} ברים | ישיר: {direct_time / lookups * 1000:.2f}ms ל-DNA | "
+          f"מטמון: {cached_time / lookups * 1000:.2f}ms ל-DNA | האצה: x{direct_time / cached_time:.1f}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
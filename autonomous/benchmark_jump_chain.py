@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark Jump Chain - בדיקת זהות ומהירות של סימולטור הקפיצות
+משווה את JumpChainSimulator ללולאת הברים של run_backtest על אותם DNA
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from backtest_kernel import run_backtest, build_entry_signals
+from jump_chain import JumpChainSimulator
+from benchmark_backtest import prepare_hunter
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Jump-chain simulator parity & speed benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--dnas', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("🦘 Benchmark Jump Chain")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    simulator = JumpChainSimulator(hunter.arrays)
+    mismatches = 0
+    loop_time = 0
+    jump_time = 0
+    total_trades = 0
+
+    for k in range(args.dnas):
+        dna = hunter.create_random_dna()
+        # שליש מה-DNA רק עם יעד/סטופ - העסקאות הארוכות ביותר
+        if k % 3 == 0:
+            for exit_flag in ('use_time_exit', 'use_rsi_exit', 'use_trend_exit', 'use_resistance_exit'):
+                dna[exit_flag] = False
+        entry_signals = build_entry_signals(hunter.arrays, dna)
+
+        start = time.perf_counter()
+        expected = run_backtest(hunter.arrays, entry_signals, dna)
+        loop_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = simulator.run(entry_signals, dna)
+        jump_time += time.perf_counter() - start
+
+        total_trades += len(expected)
+        if expected.to_dicts() != actual.to_dicts():
+            mismatches += 1
+            print(f"❌ אי-התאמה: {len(expected)} מול {len(actual)} עסקאות")
+
+    print(f"✅ {args.dnas - mismatches}/{args.dnas} DNA זהים ({total_trades / args.dnas:.0f} עסקאות בממוצע)")
+    print(f"⏱️  {hunter.arrays.length:,} ברים | לולאת ברים: {loop_time / args.dnas * 1000:.1f}ms ל-DNA | "
+          f"קפיצות: {jump_time / args.dnas * 1000:.1f}ms ל-DNA | האצה: x{loop_time / jump_time:.1f}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark Paper Trading - בדיקת זהות ו-latency של מצב ה-paper trading
+מזין את הברים אחד-אחד ל-LiveSession ומשווה את העסקאות ל-backtest של אותם DNA
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from bar_feed import frame_bars
+from live_trading import LiveSession, PaperTrader, LatencyRecorder
+from benchmark_backtest import prepare_hunter, LEGACY_FIELDS
+
+def live_trades(session, bars):
+    """הרצת הסשן על כל הברים - עסקאות לכל DNA בפורמט של backtest_strategy"""
+    trades = [[] for _ in session.traders]
+    owners = {trader.name: k for k, trader in enumerate(session.traders)}
+    last_bar = len(bars) - 1
+
+    for bar in bars:
+        for fill in session.on_bar(bar):
+            # ה-backtest לא פועל בבר האחרון
+            if fill['side'] == 'SELL' and fill['index'] < last_bar:
+                trades[owners[fill['strategy']]].append({
+                    'pnl': fill['pnl'],
+                    'return': fill['return'],
+                    'bars_held': fill['bars_held'],
+                    'exit_reason': fill['exit_reason']
+                })
+    return trades
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Paper trading parity & latency benchmark')
+    parser.add_argument('--synthetic-bars', type=int, default=60000,
+                        help='מספר ברים סינתטיים (0 = נתונים אמיתיים)')
+    parser.add_argument('--dnas', type=int, default=20)
+    args = parser.parse_args()
+
+    print("📡 Benchmark Paper Trading")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic_bars)
+    if hunter is None:
+        raise SystemExit(1)
+
+    dnas = [hunter.create_random_dna() for _ in range(args.dnas)]
+    bars = list(frame_bars(hunter.df_2024))
+
+    mismatches = 0
+    session = LiveSession([PaperTrader(dna, name=str(k)) for k, dna in enumerate(dnas)])
+    start = time.perf_counter()
+    actual = live_trades(session, bars)
+    elapsed = time.perf_counter() - start
+
+    for dna, trades in zip(dnas, actual):
+        expected = hunter.apply_strategy(dna).to_dicts(LEGACY_FIELDS)
+        if expected != trades:
+            mismatches += 1
+            print(f"❌ אי-התאמה: {len(expected)} מול {len(trades)} עסקאות")
+    print(f"✅ {args.dnas - mismatches}/{args.dnas} DNA זהים ל-backtest "
+          f"({sum(len(trades) for trades in actual):,} עסקאות)")
+    print(f"⏱️  {len(bars):,} ברים × {args.dnas} DNA ב-{elapsed:.1f}s (כולל הפיצ'רים המשותפים)")
+    print(session.latency.report())
+
+    # אסטרטגיה יחידה - היעד הוא לבר לאסטרטגיה גם בלי חלוקת הפיצ'רים
+    single = LiveSession([PaperTrader(dnas[0])], latency=LatencyRecorder())
+    live_trades(single, bars)
+    stats = single.latency.summary()
+    print(f"🎯 DNA יחיד: p50 {stats['p50_us']:.1f}µs | p99 {stats['p99_us']:.1f}µs "
+          f"(יעד {single.latency.target_ns // 1000}µs)")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
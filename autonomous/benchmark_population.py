@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark Population - זמן דור כפונקציה של גודל האוכלוסיה
+משווה DNA אחד בכל פעם (run) מול מעבר משותף על כל האוכלוסיה (run_population),
+ובודק שיומני העסקאות והכושר זהים
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmark_backtest import prepare_hunter
+from benchmark_prescreen import warm_exit_chains
+
+def same_ledgers(a, b):
+    """האם שני יומני עסקאות זהים בכל העמודות"""
+    return (len(a) == len(b)
+            and np.array_equal(a.entry_idx, b.entry_idx)
+            and np.array_equal(a.exit_idx, b.exit_idx)
+            and np.array_equal(a.exit_reason, b.exit_reason))
+
+def best_of(rounds, fn):
+    """הזמן הקצר ביותר מכמה ריצות - מסנן רעש של המכונה"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Population jump-chain benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[25, 50, 100, 200, 400])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("👥 Benchmark Population")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    hunter.prescreen = False
+    masks = hunter.entry_mask_cache()
+    simulator = hunter.jump_chain_simulator()
+    mismatches = 0
+
+    for size in args.sizes:
+        population = [hunter.create_random_dna() for _ in range(size)]
+        warm_exit_chains(hunter, population)
+        signals = [masks.entry_signals(dna) for dna in population]
+
+        single_time, single = best_of(args.rounds, lambda: [
+            simulator.run(entry_signals, dna) for entry_signals, dna in zip(signals, population)])
+        batch_time, batch = best_of(args.rounds, lambda: simulator.run_population(signals, population))
+
+        # דור מלא דרך evaluate_population (מסכות כניסה + סימולטור + כושר), בלי מטמון fitness
+        def generation():
+            hunter.fitness_cache.entries.clear()
+            return hunter.evaluate_population(population)
+        generation_time, results = best_of(args.rounds, generation)
+
+        same = (all(same_ledgers(a, b) for a, b in zip(single, batch))
+                and [r[0] for r in results] == [hunter.evaluate_fitness(t) for t in single])
+        mismatches += not same
+        trades = max(len(t) for t in single)
+
+        print(f"  {size:4d} DNA: run {single_time:6.3f}s | run_population {batch_time:6.3f}s "
+              f"({batch_time / size * 1e3:5.2f}ms/DNA) | דור מלא {generation_time:6.3f}s | "
+              f"עסקאות מקס' {trades:5d} | {'✅' if same else '❌'}")
+
+    if mismatches:
+        print(f"❌ {mismatches} גדלים עם יומנים שונים")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
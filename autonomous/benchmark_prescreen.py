@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark Prescreen - DNA שנפסלים לפני הסימולטור וזמן שנחסך בכל דור
+מריץ את אותם דורות עם ובלי סינון מוקדם, בודק שהכושר זהה ושחסם העסקאות אף פעם לא נמוך ממספר העסקאות בפועל
+"""
+
+import argparse
+import random
+import time
+
+from benchmark_backtest import prepare_hunter
+from jump_chain import JumpChainSimulator, trade_upper_bound
+
+def warm_exit_chains(hunter, population):
+    """מערכי יציאות האותות משותפים לשתי הריצות - נבנים מראש כדי שלא ייזקפו לאחת מהן"""
+    if hunter.jump_chain is None:
+        hunter.jump_chain = JumpChainSimulator(hunter.arrays)
+    for dna in population:
+        hunter.jump_chain.signal_exit_chains(dna)
+
+def next_generation(hunter, population, results):
+    """דור הבא לפי הלולאה של run_autonomous_evolution (עילית + הכלאה + מוטציה)"""
+    order = sorted(range(len(results)), key=lambda k: results[k][0], reverse=True)
+    ranked = [population[k] for k in order]
+    new_population = ranked[:hunter.elite_size]
+    parents = ranked[:hunter.population_size // 2]
+    while len(new_population) < hunter.population_size:
+        child = hunter.crossover(random.choice(parents), random.choice(parents))
+        new_population.append(hunter.mutate(child))
+    return new_population
+
+def time_generation(hunter, population, prescreen):
+    """זמן הערכת דור אחד (ללא מטמון fitness)"""
+    hunter.prescreen = prescreen
+    hunter.fitness_cache.entries.clear()
+
+    start = time.perf_counter()
+    results = hunter.evaluate_population(population)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, results
+
+def bound_violations(hunter, population, results):
+    """DNA שבהם אחד החסמים נמוך ממספר העסקאות של הריצה המלאה"""
+    masks = hunter.entry_mask_cache()
+    violations = 0
+    for dna, (_, _, trades) in zip(population, results):
+        signals = masks.entry_signals(dna)
+        if masks.signal_upper_bound(dna) < len(trades) or trade_upper_bound(signals, dna) < len(trades):
+            violations += 1
+    return violations
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Trade-count prescreen benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--generations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("🚦 Benchmark Prescreen")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    hunter.population_size = args.population
+    hunter.elite_size = min(hunter.elite_size, args.population)
+    population = [hunter.create_random_dna() for _ in range(args.population)]
+
+    full_total = 0
+    screened_total = 0
+    mismatches = 0
+    violations = 0
+
+    for generation in range(1, args.generations + 1):
+        warm_exit_chains(hunter, population)
+        full_time, full = time_generation(hunter, population, prescreen=False)
+        screened_time, screened = time_generation(hunter, population, prescreen=True)
+        full_total += full_time
+        screened_total += screened_time
+
+        same = [a[0] for a in full] == [b[0] for b in screened]
+        mismatches += not same
+        violations += bound_violations(hunter, population, full)
+
+        print(f"  דור {generation:2d}: מלא {full_time:6.2f}s | סינון {screened_time:6.2f}s | "
+              f"נפסלו {hunter.prescreen_rejected:3d}/{len(population)} | "
+              f"חיסכון מוערך {hunter.prescreen_saved:5.2f}s | כושר: {'✅' if same else '❌'}")
+
+        population = next_generation(hunter, population, full)
+
+    print(f"⏱️  ממוצע לדור: מלא {full_total / args.generations:.2f}s | "
+          f"סינון {screened_total / args.generations:.2f}s | "
+          f"נחסך {(1 - screened_total / full_total) * 100:.0f}%")
+    print(f"🎯 כושר זהה ב-{args.generations - mismatches}/{args.generations} דורות | "
+          f"חסמים מתחת למספר העסקאות: {violations}")
+
+    if mismatches or violations:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark Signal Mask - בדיקת זהות ומהירות של SignalMask מול מערכים בוליאניים
+AND/OR/NOT, הזזה בבר, ספירה וחיפוש הבר הדלוק הבא על מסכות אמיתיות של ה-hunter
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from signal_mask import SignalMask
+from jump_chain import next_true_index
+from benchmark_backtest import prepare_hunter
+
+def timed(fn, repeat, rounds=5):
+    """זמן ממוצע לקריאה במיקרו-שניות - הסבב המהיר מתוך rounds, כדי לסנן רעש של המכונה"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Bit-packed signal mask parity & speed benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("🧮 Benchmark Signal Mask")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    arrays = hunter.arrays
+    n = arrays.length
+    rng = np.random.default_rng(args.seed)
+
+    # מסכות בצפיפויות שונות - מהפילטרים של ה-DNA
+    masks = [arrays.market_open, arrays.is_green, arrays.near_resistance, arrays.rsi > 70]
+    masks += list(arrays.above_ma.values()) + list(arrays.positive_momentum.values())
+    packed = [SignalMask.from_bool(mask) for mask in masks]
+
+    failures = []
+    operations = 0
+    for k, (a, pa) in enumerate(zip(masks, packed)):
+        b, pb = masks[k - 1], packed[k - 1]
+        checks = {
+            'roundtrip': np.array_equal(pa.to_bool(), a),
+            'and': np.array_equal((pa & pb).to_bool(), a & b),
+            'or': np.array_equal((pa | pb).to_bool(), a | b),
+            'not': np.array_equal((~pa).to_bool(), ~a),
+            'shift': all(np.array_equal(pa.shift(p).to_bool(), np.concatenate((np.zeros(p, bool), a[:n - p])))
+                         for p in (1, 63, 64, 65, 1000)),
+            'count': pa.count() == int(a.sum()),
+        }
+        ranges = np.sort(rng.integers(0, n + 1, (args.queries // 10, 2)), axis=1)
+        checks['count_range'] = all(pa.count(s, e) == int(a[s:e].sum()) for s, e in ranges.tolist())
+        next_true = next_true_index(a)
+        starts = rng.integers(0, n, args.queries).tolist()
+        checks['next_set'] = all(pa.next_set(i) == next_true[i] for i in starts)
+        operations = len(checks)
+        failures += [f"mask {k}: {name}" for name, ok in checks.items() if not ok]
+
+    print(f"✅ {len(masks)} מסכות × {operations} פעולות: {'הכל זהה' if not failures else failures}")
+
+    a, b = masks[0], masks[1]
+    pa, pb = packed[0], packed[1]
+    bool_and = timed(lambda: a & b, args.repeat)
+    packed_and = timed(lambda: pa & pb, args.repeat)
+    bool_count = timed(lambda: np.count_nonzero(a), args.repeat)
+    packed_count = timed(lambda: pa.count(), args.repeat)
+    bool_shift = timed(lambda: np.concatenate(([False], a[:-1])), args.repeat)
+    packed_shift = timed(lambda: pa.shift(1), args.repeat)
+    starts = rng.integers(0, n, args.queries).tolist()
+    packed_next = timed(lambda: [pa.next_set(i) for i in starts], 1) / args.queries
+
+    print(f"💾 {n:,} ברים: בוליאני {a.nbytes / 1024:.0f}KB | דחוס {pa.nbytes / 1024:.0f}KB למסכה")
+    print(f"⏱️  AND: {bool_and:.1f}µs -> {packed_and:.1f}µs | ספירה: {bool_count:.1f}µs -> {packed_count:.1f}µs | "
+          f"הזזה: {bool_shift:.1f}µs -> {packed_shift:.1f}µs | הבר הבא: {packed_next:.2f}µs")
+
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark Threshold Index - בדיקת זהות ומהירות של אינדקס הספים הממוין
+משווה ספירה ומסכה מ-ThresholdIndex להשוואה על כל העמודה, בטווחי הספים של ה-DNA
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from threshold_index import ThresholdIndex
+from benchmark_backtest import prepare_hunter
+
+# (עמודה, טווח low, טווח high) כמו ב-create_random_dna - None = בלי גבול
+THRESHOLD_RANGES = [
+    ('rsi', (20, 40), (60, 80)),
+    ('rsi', (70, 85), None),
+    ('volume_ratio', (1.0, 2.0), None),
+    ('body_ratio', (0.3, 0.8), None)
+]
+
+def direct_mask(values, low, high):
+    """ההשוואה המקורית על כל העמודה"""
+    mask = np.ones(len(values), dtype=bool)
+    if low is not None:
+        mask &= values > low
+    if high is not None:
+        mask &= values < high
+    return mask
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Sorted-rank threshold index parity & speed benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("📶 Benchmark Threshold Index")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    rng = np.random.default_rng(args.seed)
+    mismatches = 0
+
+    for name, low_range, high_range in THRESHOLD_RANGES:
+        values = getattr(hunter.arrays, name)
+
+        start = time.perf_counter()
+        index = ThresholdIndex(values)
+        build_time = time.perf_counter() - start
+
+        lows = rng.uniform(*low_range, args.queries).tolist() if low_range else [None] * args.queries
+        highs = rng.uniform(*high_range, args.queries).tolist() if high_range else [None] * args.queries
+        queries = list(zip(lows, highs))
+
+        start = time.perf_counter()
+        expected = [direct_mask(values, low, high) for low, high in queries]
+        direct_time = time.perf_counter() - start
+        expected_counts = [int(mask.sum()) for mask in expected]
+
+        start = time.perf_counter()
+        counts = [index.count(low, high) for low, high in queries]
+        count_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        masks = [index.mask(low, high) for low, high in queries]
+        mask_time = time.perf_counter() - start
+
+        bad = sum(1 for c, e in zip(counts, expected_counts) if c != e)
+        bad += sum(1 for m, e in zip(masks, expected) if not np.array_equal(m, e))
+        mismatches += bad
+
+        selected = np.mean(expected_counts) / len(values) * 100
+        print(f"  {name:12s} {str(low_range):12s} {str(high_range):10s} ({selected:4.1f}% עוברים) | "
+              f"בנייה {build_time * 1000:.0f}ms | השוואה {direct_time / args.queries * 1e6:.0f}µs | "
+              f"ספירה {count_time / args.queries * 1e6:.1f}µs | מסכה {mask_time / args.queries * 1e6:.0f}µs | "
+              f"{'✅' if not bad else f'❌ {bad}'}")
+
+    print(f"⏱️  {hunter.arrays.length:,} ברים | {len(THRESHOLD_RANGES) * args.queries} שאילתות | "
+          f"{'הכל זהה' if not mismatches else f'{mismatches} שונות'}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark Workers - מדידת האצה של הערכת אוכלוסיה במאגר תהליכים
+"""
+
+import argparse
+import random
+import time
+
+from benchmark_backtest import prepare_hunter
+from autonomous_strategy_hunter import physical_core_count
+
+def time_generations(hunter, generations, workers):
+    """זמן הערכה של כל דור עם מספר עובדים נתון (ללא מטמון) - המאגר עולה פעם אחת לכל הדורות"""
+    hunter.workers = workers
+    if workers > 1:
+        hunter.start_worker_pool()
+        # חימום - אתחול העובדים לא נכלל במדידה
+        hunter.pool.map(abs, range(workers))
+
+    times = []
+    fitness = []
+    try:
+        for population in generations:
+            hunter.fitness_cache.entries.clear()
+            start = time.perf_counter()
+            results = hunter.evaluate_population(population)
+            times.append(time.perf_counter() - start)
+            fitness.append([fitness for fitness, _, _ in results])
+    finally:
+        hunter.stop_worker_pool()
+
+    return times, fitness
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Worker pool speedup benchmark')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='מספר ברים סינתטיים במקום data/NQ2018.csv')
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--generations', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=0,
+                        help='ברירת מחדל: מספר הליבות הפיזיות')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    print("🖥️  Benchmark Workers")
+    print("=" * 60)
+
+    hunter = prepare_hunter(args.synthetic)
+    if hunter is None:
+        return
+
+    cores = physical_core_count()
+    max_workers = args.max_workers or cores
+    generations = [[hunter.create_random_dna() for _ in range(args.population)]
+                   for _ in range(args.generations)]
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != max_workers:
+        worker_counts.append(max_workers)
+
+    base_time = None
+    base_fitness = None
+
+    print(f"👥 אוכלוסיה: {args.population} | דורות: {args.generations} | ליבות פיזיות: {cores}")
+    if max_workers > cores:
+        print(f"⚠️  יותר עובדים מליבות פיזיות - המאגר יכול רק להאט (ה-hunter יורד ל-{cores} עובדים)")
+    for workers in worker_counts:
+        times, fitness = time_generations(hunter, generations, workers)
+        elapsed = sum(times) / len(times)
+        if base_time is None:
+            base_time = elapsed
+            base_fitness = fitness
+
+        same = "✅" if fitness == base_fitness else "❌"
+        speedup = base_time / elapsed
+        per_generation = " ".join(f"{t:.2f}" for t in times)
+        print(f"  {workers:3d} עובדים: {elapsed:7.2f}s לדור ({per_generation}) | האצה: x{speedup:5.2f} | "
+              f"יעילות: {speedup / workers * 100:5.1f}% | זהות: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Paper Trader - הרצת האסטרטגיה המנצחת על ברים חיים
+קורא ברים מ-CSV במעקב או מ-Unix socket, מחליט בר-אחר-בר ורושם fills ל-JSONL
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from bar_feed import tail_csv, unix_socket_bars
+from live_trading import LiveSession, PaperTrader, LatencyRecorder, LATENCY_TARGET_US
+
+DEFAULT_STRATEGY = '../results/winning_strategy_2024.json'
+DEFAULT_FILLS = '../results/paper_fills.jsonl'
+
+# מספיק לחלון הארוך ביותר של ה-hunter (ma_50)
+WARMUP_BARS = 200
+
+def load_strategy(path):
+    """DNA מקובץ winning_strategy (dict) או best_strategies (רשימה - הטוב ביותר לפי fitness)"""
+    with open(path, 'r') as f:
+        saved = json.load(f)
+    if isinstance(saved, list):
+        saved = max(saved, key=lambda s: s.get('fitness', 0))
+    return saved['dna']
+
+def build_session(args):
+    """סשן חדש מקבצי האסטרטגיה, או המשך ממצב שמור"""
+    if args.state and os.path.exists(args.state):
+        with open(args.state, 'r') as f:
+            session = LiveSession.from_state(json.load(f))
+        session.latency = LatencyRecorder(args.target_us)
+        print(f"♻️  ממשיך ממצב שמור: {args.state} (בר {session.features.index:,})")
+        return session, True
+
+    traders = [PaperTrader(load_strategy(path), name=os.path.splitext(os.path.basename(path))[0])
+               for path in args.strategy]
+    return LiveSession(traders, latency=LatencyRecorder(args.target_us)), False
+
+def save_state(session, path):
+    """שמירה אטומית של מצב האינדיקטורים והפוזיציות"""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(session.state(), f)
+    os.replace(tmp_path, path)
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Paper trading of a saved DNA on a live bar feed')
+    parser.add_argument('--strategy', action='append',
+                        help=f'קובץ אסטרטגיה (אפשר כמה פעמים, ברירת מחדל: {DEFAULT_STRATEGY})')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help='קובץ CSV במעקב (כמו tail -f)')
+    source.add_argument('--socket', help='נתיב Unix socket להאזנה')
+    parser.add_argument('--no-history', action='store_true',
+                        help='ב-CSV: לדלג על השורות הקיימות (ללא חימום)')
+    parser.add_argument('--fills', default=DEFAULT_FILLS, help='קובץ JSONL ל-fills')
+    parser.add_argument('--state', help='קובץ מצב לשמירה/המשך בין הרצות')
+    parser.add_argument('--target-us', type=float, default=LATENCY_TARGET_US,
+                        help='יעד latency לבר לאסטרטגיה')
+    parser.add_argument('--report-every', type=int, default=1000)
+    args = parser.parse_args()
+    args.strategy = args.strategy or [DEFAULT_STRATEGY]
+
+    print("📡 Paper Trader")
+    print("=" * 60)
+
+    session, resumed = build_session(args)
+    for trader in session.traders:
+        print(f"🧬 {trader.name}: {trader.trades} עסקאות, ${trader.total_pnl:,.0f}")
+
+    if args.csv:
+        bars = tail_csv(args.csv, history=not (args.no_history or resumed))
+    else:
+        bars = unix_socket_bars(args.socket)
+
+    history = deque(maxlen=WARMUP_BARS)
+    live_bars = 0
+
+    try:
+        with open(args.fills, 'a') as fills_log:
+            for bar in bars:
+                if bar is None:
+                    # סוף ההיסטוריה - חימום על הברים האחרונים בלבד
+                    for past in history:
+                        session.warmup(past)
+                    print(f"🔥 חימום על {len(history)} ברים - ממתין לברים חדשים")
+                    history.clear()
+                    continue
+                if bar['history']:
+                    history.append(bar)
+                    continue
+
+                for fill in session.on_bar(bar):
+                    fills_log.write(json.dumps(fill) + '\n')
+                    fills_log.flush()
+                    print(f"{'🟢' if fill['side'] == 'BUY' else '🔴'} {fill['strategy']} {fill['side']} "
+                          f"@ {fill['price']:.2f} ({fill['time']})"
+                          + (f" | {fill['exit_reason']} ${fill['pnl']:,.0f}" if fill['side'] == 'SELL' else ''))
+
+                live_bars += 1
+                if live_bars % args.report_every == 0:
+                    print(session.latency.report())
+                    save_state(session, args.state)
+
+    except KeyboardInterrupt:
+        print("\n⏹️  נעצר")
+
+    finally:
+        save_state(session, args.state)
+        print(session.latency.report())
+        for trader in session.traders:
+            print(f"📊 {trader.name}: {trader.trades} עסקאות, ${trader.total_pnl:,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Replay Trader - בדיקת עומס למצב ה-paper trading על נתונים היסטוריים
+משדר את NQ2018.csv (דרך המטמון הבינארי) או מאגר OHLCV ל-N צרכנים במהירות מואצת
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from bar_feed import frame_bars, make_synthetic_bars
+from live_trading import LiveSession, PaperTrader, LatencyRecorder, LATENCY_TARGET_US
+from market_data import load_market_data
+from replay import ReplayEngine
+from paper_trader import load_strategy
+from autonomous_strategy_hunter import AutonomousStrategyHunter
+
+def load_bars(args):
+    """נתונים אמיתיים (CSV / מאגר OHLCV) או סינתטיים"""
+    if args.synthetic_bars:
+        return make_synthetic_bars(args.synthetic_bars)
+    return load_market_data(args.data, years=args.years, columns=['open', 'high', 'low', 'close', 'volume'])
+
+def build_sessions(args):
+    """צרכן לכל סשן; כל סשן מחזיק dnas_per_consumer אסטרטגיות עם פיצ'רים משותפים"""
+    if args.strategy:
+        dnas = [load_strategy(args.strategy)] * args.dnas_per_consumer
+    else:
+        random.seed(args.seed)
+        hunter = AutonomousStrategyHunter()
+        dnas = [hunter.create_random_dna() for _ in range(args.dnas_per_consumer)]
+
+    return [
+        LiveSession([PaperTrader(dna, name=f"{k}.{j}") for j, dna in enumerate(dnas)],
+                    latency=LatencyRecorder(args.target_us))
+        for k in range(args.consumers)
+    ]
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Accelerated historical replay through the live trading path')
+    parser.add_argument('--data', default='../data/NQ2018.csv', help='קובץ CSV או תיקיית מאגר OHLCV')
+    parser.add_argument('--years', type=int, nargs='*', default=[2024])
+    parser.add_argument('--synthetic-bars', type=int, default=0, help='ברים סינתטיים במקום הנתונים')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='מכפיל זמן אמת (0 = מהר ככל האפשר)')
+    parser.add_argument('--consumers', type=int, default=4)
+    parser.add_argument('--dnas-per-consumer', type=int, default=1)
+    parser.add_argument('--strategy', help='קובץ אסטרטגיה (ברירת מחדל: DNA רנדומליים)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--queue-size', type=int, default=1024)
+    parser.add_argument('--max-bars', type=int)
+    parser.add_argument('--target-us', type=float, default=LATENCY_TARGET_US)
+    args = parser.parse_args()
+
+    print("🔁 Replay Trader")
+    print("=" * 60)
+
+    df = load_bars(args)
+    sessions = build_sessions(args)
+    total_dnas = args.consumers * args.dnas_per_consumer
+    print(f"📊 {len(df):,} ברים | {args.consumers} צרכנים × {args.dnas_per_consumer} DNA | "
+          f"מהירות: {'מקסימלית' if not args.speed else f'x{args.speed:g}'}")
+
+    engine = ReplayEngine([session.on_bar for session in sessions], speed=args.speed,
+                          queue_size=args.queue_size, target_us=args.target_us)
+    report = engine.run(frame_bars(df), max_bars=args.max_bars)
+
+    latency = report['latency']
+    print(f"⚡ {report['bars']:,} ברים ב-{report['elapsed']:.1f}s | {report['bars_per_sec']:,.0f} ברים/שנייה | "
+          f"x{report['speedup']:,.0f} מזמן אמת")
+    print(f"⏱️  latency מקצה לקצה: p50 {latency['p50_us']:.0f}µs | p90 {latency['p90_us']:.0f}µs | "
+          f"p99 {latency['p99_us']:.0f}µs | max {latency['max_us']:.0f}µs")
+    print(f"🚧 backpressure: {report['backpressure']:,} | ברים באיחור: {report['late']:,}")
+
+    for k, session in enumerate(sessions):
+        stats = session.latency.summary()
+        trades = sum(trader.trades for trader in session.traders)
+        print(f"   צרכן {k}: p50 {stats['p50_us']:.1f}µs | p99 {stats['p99_us']:.1f}µs לבר לאסטרטגיה | "
+              f"{trades:,} עסקאות")
+
+    # כמה DNA תהליך אחד יכול לעקוב אחריהם: לפי תקציב ה-latency לבר ולפי קצב זמן אמת
+    if not args.speed and report['bars']:
+        per_dna_us = report['elapsed'] / (report['bars'] * total_dnas) * 1e6
+        print(f"🎯 {per_dna_us:.1f}µs לבר ל-DNA | ~{args.target_us / per_dna_us:,.0f} DNA בתקציב "
+              f"{args.target_us:g}µs לבר | ~{total_dnas * report['speedup']:,.0f} DNA בקצב זמן אמת")
+
+if __name__ == "__main__":
+    main()
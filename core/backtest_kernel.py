@@ -0,0 +1,157 @@
+"""
+Backtest Kernel
+מנוע backtest מהיר על מערכי NumPy רציפים
+"""
+
+import numpy as np
+
+from trade_ledger import POINT_VALUE, EXIT_REASONS, TradeLedger
+
+MA_PERIODS = [5, 10, 20, 50]
+MOMENTUM_PERIODS = [3, 5, 10]
+
+class BarArrays:
+    """עמודות הנתונים של ה-backtest כמערכי NumPy - נשלפות פעם אחת"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.length = len(columns['open'])
+        self.open = columns['open']
+        self.rsi = columns['rsi']
+        self.above_ma = {period: columns[f'above_ma_{period}'] for period in MA_PERIODS}
+        self.near_resistance = columns['near_resistance']
+
+        # עמודות תנאי הכניסה
+        self.hour = columns['hour']
+        self.market_open = columns['market_open']
+        self.volume_ratio = columns['volume_ratio']
+        self.positive_momentum = {period: columns[f'positive_momentum_{period}'] for period in MOMENTUM_PERIODS}
+        self.is_green = columns['is_green']
+        self.body_ratio = columns['body_ratio']
+
+    @classmethod
+    def from_frame(cls, df):
+        """שליפת העמודות מ-df_2024 כמערכים רציפים"""
+        columns = {
+            'open': df['open'].to_numpy(dtype=np.float64),
+            'rsi': df['rsi'].to_numpy(dtype=np.float64),
+            'near_resistance': df['near_resistance'].to_numpy(dtype=bool),
+            'hour': df['hour'].to_numpy(dtype=np.int64),
+            'market_open': (df['is_market_open'] & df['is_weekday']).to_numpy(dtype=bool),
+            'volume_ratio': df['volume_ratio'].to_numpy(dtype=np.float64),
+            'is_green': df['is_green'].to_numpy(dtype=bool),
+            'body_ratio': df['body_ratio'].to_numpy(dtype=np.float64)
+        }
+        for period in MA_PERIODS:
+            columns[f'above_ma_{period}'] = df[f'above_ma_{period}'].to_numpy(dtype=bool)
+        for period in MOMENTUM_PERIODS:
+            columns[f'positive_momentum_{period}'] = df[f'positive_momentum_{period}'].to_numpy(dtype=bool)
+
+        return cls({name: np.ascontiguousarray(values) for name, values in columns.items()})
+
+def build_entry_signals(arrays, dna):
+    """תנאי הכניסה של DNA כמערך בוליאני - זהה ל-apply_strategy"""
+    entry = arrays.market_open.copy()
+
+    # Time filter
+    if dna['use_time_filter']:
+        entry &= np.isin(arrays.hour, dna['allowed_hours'])
+
+    # Trend filter
+    if dna['use_trend']:
+        entry &= arrays.above_ma[dna['ma_period']]
+
+    # RSI filter
+    if dna['use_rsi']:
+        entry &= (arrays.rsi > dna['rsi_low']) & (arrays.rsi < dna['rsi_high'])
+
+    # Volume filter
+    if dna['use_volume']:
+        entry &= arrays.volume_ratio > dna['volume_threshold']
+
+    # Momentum filter
+    if dna['use_momentum']:
+        entry &= arrays.positive_momentum[dna['momentum_period']]
+
+    # Price action filter
+    if dna['use_price_action']:
+        entry &= arrays.is_green & (arrays.body_ratio > dna['min_body_ratio'])
+
+    return entry
+
+def signal_exit_codes(arrays, dna):
+    """קוד סיבת יציאה לכל בר עבור יציאות האותות (rsi/trend/resistance), 1- אם אין"""
+    codes = np.full(arrays.length, -1, dtype=np.int8)
+
+    # הסדר הפוך כדי שהיציאה הראשונה בסדר העדיפויות תדרוס את הבאות
+    if dna['use_resistance_exit']:
+        codes[arrays.near_resistance] = EXIT_REASONS.index('resistance_exit')
+    if dna['use_trend_exit']:
+        codes[~arrays.above_ma[dna['ma_period']]] = EXIT_REASONS.index('trend_exit')
+    if dna['use_rsi_exit']:
+        codes[arrays.rsi > dna['rsi_exit_high']] = EXIT_REASONS.index('rsi_exit')
+
+    return codes
+
+def run_backtest(arrays, entry_signals, dna):
+    """Backtesting של DNA יחיד - מכונת המצבים רצה על מערכים בלבד"""
+    open_ = arrays.open
+    entry = np.asarray(entry_signals, dtype=bool)
+    codes = signal_exit_codes(arrays, dna)
+    n = arrays.length
+
+    use_profit_target = dna['use_profit_target']
+    profit_target = dna['profit_target']
+    use_stop_loss = dna['use_stop_loss']
+    stop_loss = dna['stop_loss']
+    use_time_exit = dna['use_time_exit']
+    max_bars = dna['max_bars']
+
+    position = 0
+    entry_price = 0
+    bars_in_trade = 0
+    entry_bar = 0
+    entry_bars = []
+    exit_bars = []
+    exit_codes = []
+    bars_held = []
+
+    for i in range(1, n - 1):
+        current_price = open_[i]
+
+        # Entry
+        if position == 0:
+            if entry[i-1]:
+                position = 1
+                entry_price = current_price
+                entry_bar = i
+                bars_in_trade = 0
+            continue
+
+        # Exit
+        bars_in_trade += 1
+        exit_code = -1
+
+        if use_profit_target and current_price >= entry_price * (1 + profit_target):
+            exit_code = 0
+        elif use_stop_loss and current_price <= entry_price * (1 - stop_loss):
+            exit_code = 1
+        elif use_time_exit and bars_in_trade >= max_bars:
+            exit_code = 2
+        else:
+            exit_code = codes[i]
+
+        if exit_code >= 0:
+            entry_bars.append(entry_bar)
+            exit_bars.append(i)
+            exit_codes.append(exit_code)
+            bars_held.append(bars_in_trade)
+
+            position = 0
+            entry_price = 0
+            bars_in_trade = 0
+
+    return TradeLedger.from_columns(
+        entry_bars, exit_bars, open_[entry_bars], open_[exit_bars],
+        exit_reason=exit_codes, bars_held=bars_held
+    )
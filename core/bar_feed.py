@@ -0,0 +1,149 @@
+"""
+Bar Feed
+מקורות ברים חיים: קובץ CSV במעקב (tail) או Unix socket - כל בר הוא dict אחיד
+"""
+
+from datetime import datetime
+import json
+import os
+import socket
+import time
+
+import numpy as np
+import pandas as pd
+
+# שדות הבר - הסדר משמש לשורות CSV ללא כותרת
+BAR_FIELDS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+PRICE_FIELDS = BAR_FIELDS[1:]
+
+# שמות חלופיים לעמודת הזמן (NQ2018.csv משתמש ב-datetime)
+TIMESTAMP_ALIASES = ('timestamp', 'datetime', 'date', 'time')
+
+def parse_timestamp(value):
+    """ISO -> datetime; fromisoformat מהיר, pandas כגיבוי לפורמטים אחרים"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return pd.Timestamp(value).to_pydatetime()
+
+def make_bar(record):
+    """נרמול רשומה (dict) לבר: timestamp כ-datetime ומחירים כ-float"""
+    bar = {field: float(record[field]) for field in PRICE_FIELDS}
+    for alias in TIMESTAMP_ALIASES:
+        if alias in record:
+            bar['timestamp'] = parse_timestamp(record[alias])
+            break
+    else:
+        raise ValueError(f"לבר אין עמודת זמן: {record}")
+    return bar
+
+def parse_line(line, header=None):
+    """שורת JSON או CSV -> בר (None לשורה ריקה)"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        return make_bar(json.loads(line))
+    values = line.split(',')
+    return make_bar(dict(zip(header or BAR_FIELDS, values)))
+
+def frame_bars(df, chunk_size=65536):
+    """ברים מ-DataFrame היסטורי (load_market_data) בפורמט האחיד, בחלקים כדי לא להחזיק את כולם בזיכרון"""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        columns = [chunk[field].to_numpy(dtype=float).tolist() for field in PRICE_FIELDS]
+        for timestamp, *values in zip(chunk.index.to_pydatetime(), *columns):
+            bar = dict(zip(PRICE_FIELDS, values))
+            bar['timestamp'] = timestamp
+            bar['history'] = True
+            yield bar
+
+def make_synthetic_bars(num_bars, seed=42, volatility=4):
+    """נתוני דקה סינתטיים ל-2024 ב-DataFrame כמו load_market_data (לבנצ'מרקים ולהרצה חוזרת כשאין את קובץ הנתונים)"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=num_bars, freq='min')
+    close = 17000 + np.cumsum(rng.normal(0, volatility, num_bars))
+    close = np.round(close * 4) / 4
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    spread = np.abs(rng.normal(0, 3, num_bars))
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(50, 2000, num_bars)
+    return pd.DataFrame({
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    }, index=index)
+
+def tail_csv(path, follow=True, history=True, poll_interval=0.25):
+    """ברים מקובץ CSV שממשיך לגדול.
+
+    history=True מחזיר גם את השורות הקיימות (לחימום האינדיקטורים) לפני המעקב,
+    ו-None פעם אחת כשההיסטוריה נגמרה. כל בר מסומן ב-'history'.
+    """
+    with open(path, 'r') as f:
+        header = [name.strip() for name in f.readline().strip().split(',')]
+        if not history:
+            f.seek(0, os.SEEK_END)
+
+        live = not history
+        pending = ''
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    return
+                if not live:
+                    live = True
+                    yield None
+                # קובץ שנחתך (רוטציה) - חזרה לתחילתו
+                if os.path.getsize(path) < f.tell():
+                    f.seek(0)
+                    f.readline()
+                time.sleep(poll_interval)
+                continue
+
+            pending += line
+            # שורה חלקית - הכותב עוד לא סיים אותה
+            if not pending.endswith('\n'):
+                continue
+
+            bar = parse_line(pending, header)
+            pending = ''
+            if bar is not None:
+                bar['history'] = not live
+                yield bar
+
+def unix_socket_bars(path, backlog=1):
+    """שרת Unix socket: כל חיבור שולח שורות JSON או CSV (בסדר BAR_FIELDS, או עם שורת כותרת)"""
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(backlog)
+    print(f"🔌 ממתין לברים ב-{path}")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile('r') as stream:
+                header = None
+                for line in stream:
+                    # שורת כותרת אופציונלית בתחילת החיבור
+                    if header is None and line[:1].isalpha():
+                        header = [name.strip() for name in line.strip().split(',')]
+                        continue
+                    bar = parse_line(line, header)
+                    if bar is not None:
+                        bar['history'] = False
+                        yield bar
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
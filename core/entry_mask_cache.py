@@ -0,0 +1,185 @@
+"""
+Entry Mask Cache
+מטמון מסכות כניסה לפי הפילטרים הקטגוריים של ה-DNA (שעות, ממוצע נע, מומנטום, נר ירוק).
+תוצאות ה-AND הביניים נשמרות כ-SignalMask דחוס, והספים הרציפים מופעלים מעליהן
+מתוך ThresholdIndex לכל עמודה רציפה.
+האינדקסים והמסכות הבסיסיות מתפרסמים כעמודות (shared_columns) כדי שעובדי ה-pool לא יבנו אותם שוב
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from signal_mask import SignalMask
+from threshold_index import ThresholdIndex
+
+# העמודות הרציפות עם ThresholdIndex
+THRESHOLD_COLUMNS = ('rsi', 'volume_ratio', 'body_ratio')
+
+def categorical_key(dna):
+    """רמות המפתח לפי סדר ה-AND - פילטר כבוי הוא None"""
+    return (
+        tuple(sorted(set(dna['allowed_hours']))) if dna['use_time_filter'] else None,
+        dna['ma_period'] if dna['use_trend'] else None,
+        dna['momentum_period'] if dna['use_momentum'] else None,
+        True if dna['use_price_action'] else None
+    )
+
+def component_name(key):
+    """שם העמודה המשותפת של מסכה בסיסית, למשל mask_hour_9 או mask_above_ma_20"""
+    return 'mask_' + '_'.join(str(part) for part in key)
+
+class EntryMaskCache:
+    """מסכות AND חלקיות לפי קידומת של categorical_key, עם פינוי LRU לפי גודל בבתים.
+
+    החמצה על המפתח המלא ממשיכה מהקידומת הארוכה ביותר שכבר במטמון,
+    ושומרת כל רמת ביניים שחושבה בדרך. גם ה-AND עצמו רץ על המילים הדחוסות -
+    המסכות הבסיסיות (שעה בודדת, ממוצע נע, מומנטום, נר ירוק) נדחסות פעם אחת בלבד.
+    """
+
+    def __init__(self, arrays, max_bytes=64 * 1024 * 1024, shared=None):
+        self.arrays = arrays
+        self.max_bytes = max_bytes
+        self.components = {}
+        self.thresholds = {}
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+        if shared is not None:
+            # אינדקסי הספים והמסכות הבסיסיות כ-views מ-shared_columns של תהליך אחר
+            for name in THRESHOLD_COLUMNS:
+                self.thresholds[name] = ThresholdIndex(
+                    getattr(arrays, name), order=shared[f'{name}_order'], sorted_values=shared[f'{name}_sorted'])
+            for key, _ in self.component_sources():
+                self.components[key] = SignalMask(shared[component_name(key)], arrays.length)
+
+    def _component(self, key, mask_fn):
+        if key not in self.components:
+            self.components[key] = SignalMask.from_bool(mask_fn())
+        return self.components[key]
+
+    def component_sources(self):
+        """(מפתח, פונקציית מסכה) לכל המסכות הבסיסיות: שעות המסחר, שעה בודדת, ממוצע נע, מומנטום, נר ירוק"""
+        arrays = self.arrays
+        sources = [(('market_open',), lambda: arrays.market_open), (('is_green',), lambda: arrays.is_green)]
+        for hour in np.unique(arrays.hour).tolist():
+            sources.append((('hour', hour), lambda hour=hour: arrays.hour == hour))
+        for period in sorted(arrays.above_ma):
+            sources.append((('above_ma', period), lambda period=period: arrays.above_ma[period]))
+        for period in sorted(arrays.positive_momentum):
+            sources.append((('positive_momentum', period), lambda period=period: arrays.positive_momentum[period]))
+        return sources
+
+    def shared_columns(self):
+        """אינדקסי הספים והמסכות הבסיסיות כעמודות ל-SharedDataset - הבסיס של EntryMaskCache(shared=...)"""
+        columns = {}
+        for name in THRESHOLD_COLUMNS:
+            index = self.threshold_index(name)
+            columns[f'{name}_order'] = index.order
+            columns[f'{name}_sorted'] = index.sorted
+        for key, mask_fn in self.component_sources():
+            columns[component_name(key)] = self._component(key, mask_fn).words
+        return columns
+
+    def threshold_index(self, name):
+        """ThresholdIndex של עמודה רציפה ב-BarArrays (rsi, volume_ratio, body_ratio)"""
+        if name not in self.thresholds:
+            self.thresholds[name] = ThresholdIndex(getattr(self.arrays, name))
+        return self.thresholds[name]
+
+    def _threshold_filters(self, dna):
+        """(עמודה, low, high) לכל סף רציף פעיל ב-DNA"""
+        filters = []
+        if dna['use_rsi']:
+            filters.append(('rsi', dna['rsi_low'], dna['rsi_high']))
+        if dna['use_volume']:
+            filters.append(('volume_ratio', dna['volume_threshold'], None))
+        if dna['use_price_action']:
+            filters.append(('body_ratio', dna['min_body_ratio'], None))
+        return filters
+
+    def _level_mask(self, level, value):
+        arrays = self.arrays
+        if level == 0:
+            # OR של מסכות השעות הבודדות
+            hours = SignalMask.zeros(arrays.length)
+            for hour in value:
+                hours |= self._component(('hour', hour), lambda: arrays.hour == hour)
+            return hours
+        if level == 1:
+            return self._component(('above_ma', value), lambda: arrays.above_ma[value])
+        if level == 2:
+            return self._component(('positive_momentum', value), lambda: arrays.positive_momentum[value])
+        return self._component(('is_green',), lambda: arrays.is_green)
+
+    def _get(self, key):
+        packed = self.entries.get(key)
+        if packed is not None:
+            self.entries.move_to_end(key)
+        return packed
+
+    def _put(self, key, mask):
+        self.entries[key] = mask
+        self.nbytes += mask.nbytes
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def categorical_mask(self, dna):
+        """AND של שעות המסחר והפילטרים הקטגוריים כ-SignalMask (משותף למטמון - לא לשנות)"""
+        key = categorical_key(dna)
+
+        depth = len(key)
+        mask = self._get(key)
+        while mask is None and depth > 1:
+            depth -= 1
+            mask = self._get(key[:depth])
+
+        if mask is not None and depth == len(key):
+            self.hits += 1
+            return mask
+
+        if mask is not None:
+            self.prefix_hits += 1
+        else:
+            self.misses += 1
+            depth = 0
+            mask = self._component(('market_open',), lambda: self.arrays.market_open)
+
+        # רמה עם פילטר כבוי זהה לקודמתה - נשמרת רק אם היא המפתח המלא
+        for level in range(depth, len(key)):
+            if key[level] is not None:
+                mask = mask & self._level_mask(level, key[level])
+            if key[level] is not None or level == len(key) - 1:
+                self._put(key[:level + 1], mask)
+
+        return mask
+
+    def entry_signals(self, dna):
+        """תנאי הכניסה של DNA - זהה ל-build_entry_signals"""
+        entry = self.categorical_mask(dna).to_bool()
+
+        # RSI / volume / price action - החלק הרציף (is_green כבר במסכה)
+        for name, low, high in self._threshold_filters(dna):
+            entry &= self.threshold_index(name).mask(low, high)
+
+        return entry
+
+    def signal_upper_bound(self, dna):
+        """חסם עליון למספר אותות הכניסה בלי לבנות מסכה: popcount של החלק הקטגורי
+        ו-searchsorted לכל סף רציף - המינימום מביניהם"""
+        bound = self.categorical_mask(dna).count()
+        for name, low, high in self._threshold_filters(dna):
+            bound = min(bound, self.threshold_index(name).count(low, high))
+        return bound
+
+    def hit_rate(self):
+        """אחוז הבקשות שנענו מהמפתח המלא"""
+        lookups = self.hits + self.prefix_hits + self.misses
+        return self.hits / lookups * 100 if lookups else 0.0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,164 @@
+"""
+First Passage
+"מתי המחיר חוצה לראשונה את היעד או את הסטופ" ב-O(log n) לעסקה:
+max/min לבלוקים + sparse table על הבלוקים, משותף לכל ה-DNA על אותם נתונים
+"""
+
+import numpy as np
+
+class FirstPassageIndex:
+    """אינדקס חצייה ראשונה על סדרת מחירים (open).
+
+    first_crossing(start, stop, upper, lower) מחזיר את הבר הראשון ב-[start, stop)
+    שבו המחיר >= upper או <= lower (strict=True: > / <), או None.
+    רק בלוק ההתחלה ובלוק החצייה נסרקים בר-בר; הבלוקים שביניהם נקפצים בירידה על ה-sparse table.
+    first_crossings עונה על מערך שאילתות יחד - אותה ירידה, וקטורית על כל השאילתות.
+    """
+
+    def __init__(self, values, block_size=32):
+        values = np.asarray(values, dtype=np.float64)
+        self.values = values
+        self.padded = values
+        self.prices = values.tolist()
+        self.block_size = block_size
+
+        n = len(values)
+        num_blocks = -(-n // block_size)
+        padded_max = np.full(num_blocks * block_size, -np.inf)
+        padded_min = np.full(num_blocks * block_size, np.inf)
+        padded_max[:n] = values
+        padded_min[:n] = values
+        # NaN נשאר NaN - בלוק כזה לא נקפץ אלא נסרק, ושם NaN לעולם לא חוצה (כמו בלולאת הברים)
+        block_max = padded_max.reshape(num_blocks, block_size).max(axis=1)
+        block_min = padded_min.reshape(num_blocks, block_size).min(axis=1)
+
+        # level k: קיצון של 2^k בלוקים שמתחילים בבלוק i
+        self.max_levels = [block_max]
+        self.min_levels = [block_min]
+        half = 1
+        while half * 2 <= num_blocks:
+            self.max_levels.append(np.maximum(self.max_levels[-1][:-half], self.max_levels[-1][half:]))
+            self.min_levels.append(np.minimum(self.min_levels[-1][:-half], self.min_levels[-1][half:]))
+            half *= 2
+        self.max_arrays = self.max_levels
+        self.min_arrays = self.min_levels
+        self.max_levels = [level.tolist() for level in self.max_levels]
+        self.min_levels = [level.tolist() for level in self.min_levels]
+        self.num_blocks = num_blocks
+
+    def __len__(self):
+        return len(self.prices)
+
+    def _scan(self, start, stop, upper, lower, strict):
+        prices = self.prices
+        if strict:
+            for j in range(start, stop):
+                if prices[j] > upper or prices[j] < lower:
+                    return j
+        else:
+            for j in range(start, stop):
+                if prices[j] >= upper or prices[j] <= lower:
+                    return j
+        return None
+
+    def _skip_blocks(self, block, upper, lower, strict):
+        """הבלוק הראשון מ-block והלאה שאי אפשר לקפוץ מעליו (או num_blocks)"""
+        max_levels = self.max_levels
+        min_levels = self.min_levels
+        for k in range(len(max_levels) - 1, -1, -1):
+            size = 1 << k
+            if block + size > self.num_blocks:
+                continue
+            high = max_levels[k][block]
+            low = min_levels[k][block]
+            if (high <= upper and low >= lower) if strict else (high < upper and low > lower):
+                block += size
+        return block
+
+    def first_crossing(self, start, stop, upper, lower, strict=False):
+        """הבר הראשון ב-[start, stop) שחוצה את upper או את lower, או None"""
+        stop = min(stop, len(self.prices))
+        if start >= stop:
+            return None
+
+        size = self.block_size
+        block_end = min((start // size + 1) * size, stop)
+        hit = self._scan(start, block_end, upper, lower, strict)
+        if hit is not None or block_end >= stop:
+            return hit
+
+        block = block_end // size
+        while True:
+            block = self._skip_blocks(block, upper, lower, strict)
+            first = block * size
+            if first >= stop:
+                return None
+            hit = self._scan(first, min(first + size, stop), upper, lower, strict)
+            if hit is not None:
+                return hit
+            # בלוק עם NaN שלא חצה בפועל
+            block += 1
+
+    def _crossed(self, first, stop, upper, lower, strict, width):
+        """(נמצא, בר) לסריקת width ברים מכל first (עד stop) - בר החצייה הראשון בכל שורה"""
+        if len(self.padded) < len(self.values) + width:
+            # ריפוד ב-NaN (לא חוצה לעולם) - בלי חיתוך אינדקסים בכל סריקה
+            self.padded = np.concatenate((self.values, np.full(width, np.nan)))
+        bars = first[:, None] + np.arange(width)
+        prices = self.padded[bars]
+        if strict:
+            crossed = (prices > upper[:, None]) | (prices < lower[:, None])
+        else:
+            crossed = (prices >= upper[:, None]) | (prices <= lower[:, None])
+        crossed &= bars < stop[:, None]
+        hit = crossed.argmax(axis=1)
+        found = crossed[np.arange(len(first)), hit]
+        return found, first + hit
+
+    def first_crossings(self, start, stop, upper, lower, strict=False, scan_blocks=4):
+        """first_crossing לכל שאילתה במערכים - stop (החסום באורך הסדרה) כשאין חצייה.
+
+        קודם סריקה ישירה של עד scan_blocks בלוקים מכל start (רוב החציות קרובות), ורק השאר
+        יורדות על ה-sparse table - עד הרמה שמכסה את הטווח הארוך ביותר שנותר.
+        """
+        size = self.block_size
+        start = np.asarray(start, dtype=np.int64)
+        stop = np.minimum(np.asarray(stop, dtype=np.int64), len(self.values))
+        upper = np.asarray(upper, dtype=np.float64)
+        lower = np.asarray(lower, dtype=np.float64)
+        result = stop.copy()
+
+        # סריקה ישירה עד גבול בלוק, scan_blocks בלוקים מ-start
+        scan_end = np.minimum((start // size + scan_blocks) * size, stop)
+        found, bars = self._crossed(start, scan_end, upper, lower, strict, scan_blocks * size)
+        result[found] = bars[found]
+
+        pending = np.flatnonzero(~found & (scan_end < stop))
+        block = scan_end[pending] // size
+        while len(pending):
+            # ירידה על ה-sparse table לכל השאילתות יחד
+            high_limit = upper[pending]
+            low_limit = lower[pending]
+            span = int((stop[pending] - block * size).max()) // size + 1
+            top = min(span.bit_length(), len(self.max_arrays)) - 1
+            for k in range(top, -1, -1):
+                width = 1 << k
+                fits = block + width <= self.num_blocks
+                at = np.where(fits, block, 0)
+                high = self.max_arrays[k][at]
+                low = self.min_arrays[k][at]
+                if strict:
+                    inside = (high <= high_limit) & (low >= low_limit)
+                else:
+                    inside = (high < high_limit) & (low > low_limit)
+                block = block + width * (fits & inside)
+
+            first = block * size
+            live = first < stop[pending]
+            pending, block, first = pending[live], block[live], first[live]
+            found, bars = self._crossed(first, stop[pending], upper[pending], lower[pending], strict, size)
+            result[pending[found]] = bars[found]
+            # בלוק עם NaN שלא חצה בפועל - ממשיכים מהבלוק הבא
+            pending = pending[~found]
+            block = block[~found] + 1
+        return result
@@ -0,0 +1,64 @@
+"""
+Fitness Cache
+מטמון LRU לתוצאות הערכת DNA לפי hash קנוני
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+FLOAT_DECIMALS = 6
+
+def canonical_dna(dna):
+    """צורה קנונית של DNA - מפתחות ממוינים, רשימות ממוינות ו-floats מעוגלים"""
+    canonical = {}
+    for key in sorted(dna):
+        value = dna[key]
+        if isinstance(value, dict):
+            value = canonical_dna(value)
+        elif isinstance(value, (list, tuple)):
+            value = sorted(value)
+        elif isinstance(value, float):
+            value = round(value, FLOAT_DECIMALS)
+        canonical[key] = value
+    return canonical
+
+def dna_key(dna):
+    """Hash קנוני של DNA"""
+    payload = json.dumps(canonical_dna(dna), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class FitnessCache:
+    """מטמון fitness ועסקאות עם פינוי LRU ומוני פגיעות"""
+
+    def __init__(self, max_size=2000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """שליפת (fitness, trades) לפי מפתח, או None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, fitness, trades):
+        """שמירת תוצאה ופינוי הישנה ביותר מעבר לגודל המקסימלי"""
+        self.entries[key] = (fitness, trades)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        """אחוז הפגיעות מכלל הבקשות"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups * 100 if lookups else 0.0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,190 @@
+"""
+Indicator Batch
+חישוב משפחת פרמטרים שלמה של אינדיקטור במעבר אחד למערך (פרמטרים × ברים) float32
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ברים לכל נקודת ייחוס בסכומי std/בולינגר - הסכומים נשארים קטנים גם על 355k ברים
+ANCHOR_BLOCK = 4096
+
+class IndicatorFamily:
+    """מערך (פרמטרים × ברים) עם גישה לשורה לפי ערך הפרמטר"""
+
+    def __init__(self, name, periods, values):
+        self.name = name
+        self.periods = [int(period) for period in periods]
+        self.values = values
+        self.rows = {period: row for row, period in enumerate(self.periods)}
+
+    def __getitem__(self, period):
+        return self.values[self.rows[period]]
+
+    def __contains__(self, period):
+        return period in self.rows
+
+    def __len__(self):
+        return len(self.periods)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+def _prefix_sums(values):
+    """סכומים מצטברים עם 0 בהתחלה ומונה NaN מצטבר - בסיס לכל החלונות"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    missing_counts = np.concatenate(([0], np.cumsum(missing)))
+    return sums, missing_counts
+
+class _AnchoredSums:
+    """סכומי x - ref ו-(x - ref)² לחלונות עד reach ברים, כשכל בלוק של ברים נמדד מהממוצע שלו.
+
+    E[x²] - E[x]² מסכומים גלובליים על מחירים של ~17,000 מאבד את רוב הספרות (הסכום מגיע ל-1e14).
+    כאן כל בלוק מחזיק סכומים מצטברים משלו, שמתחילים reach ברים לפניו - כך שכל חלון
+    שמסתיים בבלוק נמצא כולו בתוכו, והסכומים נשארים בסדר גודל של התנודה המקומית.
+    """
+
+    def __init__(self, values, reach):
+        values = np.asarray(values, dtype=np.float64)
+        self.length = len(values)
+        self.reach = reach
+        self.block = block = max(ANCHOR_BLOCK, reach)
+        num_blocks = -(-self.length // block)
+
+        missing = np.isnan(values)
+        padded = np.zeros(reach + num_blocks * block)
+        padded[reach:reach + self.length] = np.where(missing, 0.0, values)
+        valid = np.zeros(len(padded), dtype=bool)
+        valid[reach:reach + self.length] = ~missing
+
+        core = padded[reach:].reshape(num_blocks, block)
+        counts = valid[reach:].reshape(num_blocks, block).sum(axis=1)
+        self.refs = core.sum(axis=1) / np.maximum(counts, 1)
+
+        # כל שורה: reach הברים שלפני הבלוק + הבלוק עצמו, ביחס לממוצע הבלוק
+        spans = sliding_window_view(padded, reach + block)[::block]
+        span_valid = sliding_window_view(valid, reach + block)[::block]
+        centered = np.where(span_valid, spans - self.refs[:, None], 0.0)
+        self.sums = np.zeros((num_blocks, reach + block + 1))
+        self.squares = np.zeros((num_blocks, reach + block + 1))
+        np.cumsum(centered, axis=1, out=self.sums[:, 1:])
+        np.cumsum(centered * centered, axis=1, out=self.squares[:, 1:])
+
+    def bar_refs(self):
+        """ה-ref של הבלוק של כל בר"""
+        return np.repeat(self.refs, self.block)[:self.length]
+
+    def window(self, prefix, period):
+        """סכום כל חלון באורך period שמסתיים בבר i (period <= reach), כמערך באורך הסדרה"""
+        start = self.reach + 1
+        stop = prefix.shape[1]
+        return (prefix[:, start:] - prefix[:, start - period:stop - period]).ravel()[:self.length]
+
+    def moments(self, period):
+        """(סכום, סכום ריבועים) של x - ref לכל חלון שמסתיים בבר i >= period - 1"""
+        return self.window(self.sums, period)[period - 1:], self.window(self.squares, period)[period - 1:]
+
+def _window_diff(prefix, period):
+    """סכום כל חלון באורך period שמסתיים בבר i (מיושר לסוף, כמו rolling)"""
+    return prefix[period:] - prefix[:-period]
+
+def _allocate(num_params, num_bars, dtype):
+    return np.full((num_params, num_bars), np.nan, dtype=dtype)
+
+def _mask_missing(row, missing, period):
+    """NaN לחלונות שמכילים ערך חסר (כמו min_periods=window)"""
+    if missing[-1]:
+        row[period - 1:][_window_diff(missing, period) != 0] = np.nan
+
+def rolling_mean_family(values, periods, dtype=np.float32):
+    """ממוצע נע לכל תקופה - זהה ל-rolling(window).mean() (NaN בחלון -> NaN)"""
+    sums, missing = _prefix_sums(values)
+    n = len(sums) - 1
+    out = _allocate(len(periods), n, dtype)
+
+    for row, period in enumerate(periods):
+        if period > n:
+            continue
+        out[row, period - 1:] = _window_diff(sums, period) / period
+        _mask_missing(out[row], missing, period)
+
+    return IndicatorFamily('sma', periods, out)
+
+def rolling_std_family(values, periods, ddof=1, dtype=np.float32):
+    """סטיית תקן נעה לכל תקופה מסכומי x ו-x² מעוגנים (_AnchoredSums)"""
+    values = np.asarray(values, dtype=np.float64)
+    _, missing = _prefix_sums(values)
+    anchored = _AnchoredSums(values, max(periods, default=1))
+    n = len(values)
+    out = _allocate(len(periods), n, dtype)
+
+    for row, period in enumerate(periods):
+        if period > n or period <= ddof:
+            continue
+        window_sum, window_squares = anchored.moments(period)
+        variance = (window_squares - window_sum * window_sum / period) / (period - ddof)
+        out[row, period - 1:] = np.sqrt(np.maximum(variance, 0.0))
+        _mask_missing(out[row], missing, period)
+
+    return IndicatorFamily('rolling_std', periods, out)
+
+def rsi_family(close, periods, dtype=np.float32):
+    """RSI (ממוצע פשוט של רווחים/הפסדים, כמו ב-indicators.rsi) לכל תקופה"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.empty_like(close)
+    delta[0] = np.nan
+    delta[1:] = np.diff(close)
+
+    # כמו delta.where(delta > 0, 0): NaN (הבר הראשון) הופך ל-0 ולא פוסל את החלון
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    gain_sums, missing = _prefix_sums(gains)
+    loss_sums, _ = _prefix_sums(losses)
+    n = len(close)
+    out = _allocate(len(periods), n, dtype)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for row, period in enumerate(periods):
+            if period > n:
+                continue
+            # period מצטמצם ביחס gain / loss
+            rs = _window_diff(gain_sums, period) / _window_diff(loss_sums, period)
+            out[row, period - 1:] = 100 - (100 / (1 + rs))
+            _mask_missing(out[row], missing, period)
+
+    return IndicatorFamily('rsi', periods, out)
+
+def bollinger_family(close, periods, num_std=2, dtype=np.float32):
+    """פסי בולינגר לכל תקופה: {'middle', 'upper', 'lower'}"""
+    close = np.asarray(close, dtype=np.float64)
+    _, missing = _prefix_sums(close)
+    anchored = _AnchoredSums(close, max(periods, default=1))
+    refs = anchored.bar_refs()
+    n = len(close)
+    middle = _allocate(len(periods), n, dtype)
+    upper = _allocate(len(periods), n, dtype)
+    lower = _allocate(len(periods), n, dtype)
+
+    for row, period in enumerate(periods):
+        if period > n or period <= 1:
+            continue
+        window_sum, window_squares = anchored.moments(period)
+        offset = window_sum / period
+        variance = (window_squares - window_sum * offset) / (period - 1)
+        band = np.sqrt(np.maximum(variance, 0.0)) * num_std
+        mean = refs[period - 1:] + offset
+        middle[row, period - 1:] = mean
+        upper[row, period - 1:] = mean + band
+        lower[row, period - 1:] = mean - band
+        for values in (middle, upper, lower):
+            _mask_missing(values[row], missing, period)
+
+    return {
+        'middle': IndicatorFamily('bb_middle', periods, middle),
+        'upper': IndicatorFamily('bb_upper', periods, upper),
+        'lower': IndicatorFamily('bb_lower', periods, lower)
+    }
@@ -0,0 +1,99 @@
+"""
+Indicator Graph
+גרף תלויות עצל של עמודות אינדיקטורים - מחושבות רק העמודות שאסטרטגיה מצהירה עליהן (@uses_columns)
+"""
+
+import re
+
+from indicators import IndicatorLibrary, OHLCV_COLUMNS
+
+_PARAM_PATTERN = re.compile(r'\{(\w+)\}')
+
+class IndicatorGraph:
+    """עמודות מוצהרות כתבנית שם + תלויות; פתרון טופולוגי לפי דרישה"""
+
+    def __init__(self):
+        self.rules = []
+
+    def column(self, template, depends=()):
+        """דקורטור: fn(df, ind, **params) -> Series עבור עמודות בתבנית כמו 'bb_position_{period}'"""
+        regex = re.compile('^' + _PARAM_PATTERN.sub(r'(?P<\1>\\d+)', template) + '$')
+
+        def register(fn):
+            self.rules.append((regex, tuple(depends), fn))
+            return fn
+        return register
+
+    def indicator(self, template, name, depends=(), **fixed):
+        """עמודה שהיא ישירות get(name, ...) מספריית האינדיקטורים"""
+        def compute(df, ind, **params):
+            return ind.get(name, **dict(fixed, **params))
+        self.column(template, depends)(compute)
+
+    def node(self, name):
+        """(תלויות, פונקציית חישוב) לעמודה, או KeyError אם אינה מוצהרת"""
+        for regex, depends, fn in self.rules:
+            match = regex.match(name)
+            if match is None:
+                continue
+            params = {key: int(value) for key, value in match.groupdict().items()}
+            return [dep.format(**params) for dep in depends], (lambda df, ind: fn(df, ind, **params))
+        raise KeyError(f"עמודה לא מוצהרת בגרף: {name}")
+
+    def knows(self, name):
+        """האם העמודה מוצהרת בגרף"""
+        return any(regex.match(name) for regex, _, _ in self.rules)
+
+    def resolve(self, names, available=()):
+        """סדר חישוב טופולוגי של תת-הגרף הנדרש, בלי עמודות שכבר קיימות"""
+        done = set(available) | set(OHLCV_COLUMNS)
+        visiting = set()
+        order = []
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"תלות מעגלית בעמודה: {name}")
+            visiting.add(name)
+            depends, _ = self.node(name)
+            for dep in depends:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+    def materialize(self, df, names, ind=None):
+        """חישוב העמודות החסרות (ותלויותיהן) לתוך df; מחזיר את רשימת העמודות שנוספו"""
+        order = self.resolve(names, available=df.columns)
+        if order and ind is None:
+            ind = IndicatorLibrary(df)
+        for name in order:
+            _, compute = self.node(name)
+            df[name] = compute(df, ind)
+        return order
+
+    def required_columns(self, func, always=()):
+        """העמודות שפונקציה הצהירה עליהן ב-@uses_columns, אחרי always; עמודה לא מוכרת - KeyError"""
+        declared = getattr(func, 'required_columns', None)
+        if declared is None:
+            raise ValueError(f"{func.__name__} לא מצהירה על עמודות (@uses_columns)")
+        names = []
+        for name in list(always) + list(declared):
+            if name in OHLCV_COLUMNS or name in names:
+                continue
+            if not self.knows(name):
+                raise KeyError(f"עמודה לא מוצהרת בגרף: {name}")
+            names.append(name)
+        return names
+
+def uses_columns(*names):
+    """דקורטור: הצהרה מפורשת על העמודות שפונקציה קוראת מ-df, לחישוב עצל דרך הגרף"""
+    def mark(fn):
+        fn.required_columns = list(names)
+        return fn
+    return mark
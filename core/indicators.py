@@ -0,0 +1,298 @@
+"""
+Indicators
+ספריית אינדיקטורים אחידה עם memoization לפי (טביעת נתונים, אינדיקטור, פרמטרים)
+"""
+
+import hashlib
+import inspect
+import os
+import numpy as np
+import pandas as pd
+
+from rolling_extrema import ExtremaTable
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# מטמון דיסק ליד results/ - נשמר בין הפעלות
+INDICATOR_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'indicators')
+INDICATOR_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# מרשם האינדיקטורים: שם -> פונקציה(lib, **params)
+INDICATORS = {}
+
+# מטמון משותף לכל התהליך - כמה מחלקות על אותם נתונים מחשבות כל אינדיקטור פעם אחת
+_MEMO = {}
+# טבלאות קיצון לכל (טביעה, עמודה, סוג) - כל אורכי החלון נגזרים מאותה טבלה
+_EXTREMA_TABLES = {}
+_STATS = {'hits': 0, 'misses': 0, 'disk_hits': 0}
+
+def indicator(name):
+    """דקורטור לרישום אינדיקטור בספרייה"""
+    def register(fn):
+        INDICATORS[name] = fn
+        return fn
+    return register
+
+def data_fingerprint(df):
+    """טביעת אצבע של האינדקס ועמודות ה-OHLCV"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(df.index.asi8).tobytes())
+    for name in OHLCV_COLUMNS:
+        if name in df.columns:
+            digest.update(name.encode('utf-8'))
+            digest.update(np.ascontiguousarray(df[name].to_numpy()).tobytes())
+    return digest.hexdigest()
+
+def cache_stats():
+    """מוני פגיעות ומספר הרשומות במטמון"""
+    return dict(_STATS, entries=len(_MEMO))
+
+def clear_cache():
+    """ניקוי המטמון המשותף"""
+    _MEMO.clear()
+    _EXTREMA_TABLES.clear()
+    for name in _STATS:
+        _STATS[name] = 0
+
+class IndicatorDiskCache:
+    """מטמון עמודות אינדיקטורים על הדיסק (קובץ npy. לכל מפתח) עם תקרת גודל ופינוי LRU"""
+
+    def __init__(self, directory=INDICATOR_CACHE_DIR, max_bytes=INDICATOR_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        """קובץ המטמון של מפתח (fingerprint, name, params)"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key[1]}-{digest[:20]}.npy")
+
+    def load(self, key):
+        """ערכי העמודה או None; פגיעה מרעננת את זמן השימוש (LRU לפי mtime)"""
+        path = self.path_for(key)
+        try:
+            values = np.load(path)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return values
+
+    def save(self, key, values):
+        """כתיבה אטומית ופינוי הקבצים הישנים מעבר לתקרה"""
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) לכל קובץ במטמון"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.npy'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """סך גודל המטמון בבתים"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """מחיקת הקבצים שנעשה בהם שימוש לפני הכי הרבה זמן עד לתקרה"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """מחיקת כל המטמון (--rebuild-indicators)"""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+class IndicatorLibrary:
+    """גישה לאינדיקטורים של DataFrame אחד: get('rsi', period=14)"""
+
+    def __init__(self, df, disk_cache=None):
+        self.df = df
+        self.fingerprint = data_fingerprint(df)
+        self.disk_cache = disk_cache
+
+    def column(self, name):
+        """עמודת מקור (OHLCV) או אינדיקטור רשום בשם זה"""
+        if name in OHLCV_COLUMNS:
+            return self.df[name]
+        return self.get(name)
+
+    def extrema_table(self, column, kind):
+        """טבלת max/min משותפת לעמודה - נבנית פעם אחת לכל החלונות"""
+        key = (self.fingerprint, column, kind)
+        table = _EXTREMA_TABLES.get(key)
+        if table is None:
+            table = ExtremaTable(self.column(column).to_numpy(), kind)
+            _EXTREMA_TABLES[key] = table
+        return table
+
+    def key(self, name, **params):
+        """מפתח קנוני - פרמטרי ברירת מחדל נכללים, כך ש-get('rsi') == get('rsi', period=14)"""
+        if name not in INDICATORS:
+            raise KeyError(f"אינדיקטור לא מוכר: {name}")
+        bound = inspect.signature(INDICATORS[name]).bind(self, **params)
+        bound.apply_defaults()
+        arguments = tuple(sorted((k, v) for k, v in bound.arguments.items() if k != 'lib'))
+        return (self.fingerprint, name, arguments)
+
+    def get(self, name, **params):
+        """ערך האינדיקטור כ-Series, מחושב פעם אחת לכל טביעה ופרמטרים"""
+        key = self.key(name, **params)
+        result = _MEMO.get(key)
+        if result is not None:
+            _STATS['hits'] += 1
+            return result
+
+        if self.disk_cache is not None:
+            values = self.disk_cache.load(key)
+            if values is not None and len(values) == len(self.df):
+                _STATS['disk_hits'] += 1
+                result = pd.Series(values, index=self.df.index)
+                _MEMO[key] = result
+                return result
+
+        _STATS['misses'] += 1
+        result = INDICATORS[name](self, **params)
+        _MEMO[key] = result
+        if self.disk_cache is not None:
+            self.disk_cache.save(key, result.to_numpy())
+        return result
+
+# Price
+
+@indicator('returns')
+def _returns(lib):
+    return lib.column('close').pct_change()
+
+@indicator('sma')
+def _sma(lib, period, column='close'):
+    return lib.column(column).rolling(window=period).mean()
+
+@indicator('ema')
+def _ema(lib, period, column='close'):
+    return lib.column(column).ewm(span=period).mean()
+
+@indicator('rolling_std')
+def _rolling_std(lib, period, column='close'):
+    return lib.column(column).rolling(window=period).std()
+
+@indicator('rolling_max')
+def _rolling_max(lib, period, column='high'):
+    return pd.Series(lib.extrema_table(column, 'max').window(period), index=lib.df.index)
+
+@indicator('rolling_min')
+def _rolling_min(lib, period, column='low'):
+    return pd.Series(lib.extrema_table(column, 'min').window(period), index=lib.df.index)
+
+@indicator('momentum')
+def _momentum(lib, period):
+    close = lib.column('close')
+    return (close / close.shift(period) - 1) * 100
+
+@indicator('trend_strength')
+def _trend_strength(lib, period):
+    close = lib.column('close')
+    return (close - close.shift(period)) / close.shift(period)
+
+@indicator('volatility')
+def _volatility(lib, period=20):
+    return lib.get('returns').rolling(window=period).std()
+
+# Oscillators
+
+@indicator('rsi')
+def _rsi(lib, period=14):
+    delta = lib.column('close').diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+@indicator('macd')
+def _macd(lib, fast=12, slow=26):
+    return lib.get('ema', period=fast) - lib.get('ema', period=slow)
+
+@indicator('macd_signal')
+def _macd_signal(lib, fast=12, slow=26, signal=9):
+    return lib.get('macd', fast=fast, slow=slow).ewm(span=signal).mean()
+
+@indicator('macd_hist')
+def _macd_hist(lib, fast=12, slow=26, signal=9):
+    return lib.get('macd', fast=fast, slow=slow) - lib.get('macd_signal', fast=fast, slow=slow, signal=signal)
+
+@indicator('stoch_k')
+def _stoch_k(lib, period=14):
+    lowest_low = lib.get('rolling_min', period=period)
+    highest_high = lib.get('rolling_max', period=period)
+    return 100 * (lib.column('close') - lowest_low) / (highest_high - lowest_low)
+
+@indicator('stoch_d')
+def _stoch_d(lib, period=14, smooth=3):
+    return lib.get('stoch_k', period=period).rolling(window=smooth).mean()
+
+# Bands & volatility
+
+@indicator('bb_middle')
+def _bb_middle(lib, period=20):
+    return lib.get('sma', period=period)
+
+@indicator('bb_upper')
+def _bb_upper(lib, period=20, num_std=2):
+    return lib.get('bb_middle', period=period) + (lib.get('rolling_std', period=period) * num_std)
+
+@indicator('bb_lower')
+def _bb_lower(lib, period=20, num_std=2):
+    return lib.get('bb_middle', period=period) - (lib.get('rolling_std', period=period) * num_std)
+
+@indicator('bb_width')
+def _bb_width(lib, period=20, num_std=2):
+    return lib.get('bb_upper', period=period, num_std=num_std) - lib.get('bb_lower', period=period, num_std=num_std)
+
+@indicator('bb_position')
+def _bb_position(lib, period=20, num_std=2):
+    lower = lib.get('bb_lower', period=period, num_std=num_std)
+    return (lib.column('close') - lower) / lib.get('bb_width', period=period, num_std=num_std)
+
+@indicator('true_range')
+def _true_range(lib):
+    high, low, close = lib.column('high'), lib.column('low'), lib.column('close')
+    high_low = high - low
+    high_close = np.abs(high - close.shift())
+    low_close = np.abs(low - close.shift())
+    return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+@indicator('atr')
+def _atr(lib, period=14):
+    return lib.get('true_range').rolling(window=period).mean()
+
+# Volume
+
+@indicator('volume_ma')
+def _volume_ma(lib, period=20):
+    return lib.column('volume').rolling(window=period).mean()
+
+@indicator('volume_ratio')
+def _volume_ratio(lib, period=20):
+    return lib.column('volume') / lib.get('volume_ma', period=period)
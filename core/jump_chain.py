@@ -0,0 +1,317 @@
+"""
+Jump Chain
+סימולטור backtest שקופץ מעסקה לעסקה: מערכי "האינדקס האמיתי הבא" לכניסה ולאותות היציאה
+מחושבים פעם אחת ב-O(n), וכל עסקה עולה O(1) חיפושים (ו-O(log n) ליעד/סטופ) במקום לולאה על כל בר.
+run_population מקדם את כל האוכלוסיה יחד - צעד אחד הוא העסקה הבאה של כל DNA שעדיין פעיל
+"""
+
+import numpy as np
+
+from trade_ledger import TradeLedger
+from first_passage import FirstPassageIndex
+
+# מתחת למספר הזה של DNA פעילים, הזנב (ה-DNA עם הכי הרבה עסקאות) ממשיך בלולאה של DNA יחיד -
+# צעד וקטורי עולה כמו עשרות עסקאות סקלריות, ולא משתלם על קומץ DNA
+BATCH_MIN_ACTIVE = 8
+
+def next_true_index(mask):
+    """next[i] = האינדקס הקטן ביותר j >= i שבו mask[j] אמת, או n (מערך באורך n + 1)"""
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    candidates = np.full(n + 1, n, dtype=np.int64)
+    candidates[:n][mask] = np.flatnonzero(mask)
+    # סריקה מצטברת הפוכה: המינימום מכאן ועד הסוף
+    return np.minimum.accumulate(candidates[::-1])[::-1]
+
+def min_holding_bars(dna):
+    """מספר הברים המינימלי של עסקה לפי היציאות הפעילות, או None אם אף יציאה לא סוגרת עסקה"""
+    if (dna['use_profit_target'] or dna['use_stop_loss'] or dna['use_rsi_exit']
+            or dna['use_trend_exit'] or dna['use_resistance_exit']):
+        return 1
+    if dna['use_time_exit']:
+        return max(dna['max_bars'], 1)
+    return None
+
+def trade_upper_bound(entry_signals, dna):
+    """חסם עליון למספר העסקאות של JumpChainSimulator.run, בלי לסמלץ
+
+    אות בבר s נכנס ב-s + 1 ויוצא לכל המוקדם ב-s + 1 + hold, והאות הבא נלקח מבר היציאה ואילך -
+    כך שאותות של עסקאות עוקבות מרוחקים לפחות hold + 1 ברים. בכל רצף אותות באורך L
+    נכנסות לכל היותר ceil(L / (hold + 1)) עסקאות.
+    """
+    hold = min_holding_bars(dna)
+    if hold is None:
+        return 0
+    # אות אחרי הבר הזה כבר לא מספיק להיסגר לפני סוף הנתונים
+    last_signal = len(entry_signals) - 2 - hold
+    if last_signal <= 0:
+        return 0
+    mask = np.asarray(entry_signals, dtype=bool)[:last_signal].view(np.int8)
+    edges = np.diff(mask, prepend=np.int8(0), append=np.int8(0))
+    lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    gap = hold + 1
+    return int(((lengths + gap - 1) // gap).sum())
+
+class JumpChainSimulator:
+    """run_backtest בקפיצות: כניסה הבאה -> מינימום מועמדי היציאה -> כניסה הבאה.
+
+    יציאות האותות (rsi/trend/resistance) נשמרות במטמון לפי הפרמטר, כך שהן משותפות לכל ה-DNA.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.first_passage = FirstPassageIndex(arrays.open)
+        self.open_list = self.first_passage.prices
+        self.next_signal = {}
+        self.ma_periods = sorted(arrays.above_ma)
+        self.above_ma = None
+        self.exit_rows = {}
+        self.exit_table = None
+
+    def _next_signal(self, key, mask_fn):
+        if key not in self.next_signal:
+            self.next_signal[key] = next_true_index(mask_fn())
+        return self.next_signal[key]
+
+    def signal_exits(self, dna):
+        """(מפתח, פונקציית מסכה) לכל יציאת אות פעילה ב-DNA"""
+        arrays = self.arrays
+        exits = []
+        if dna['use_rsi_exit']:
+            threshold = dna['rsi_exit_high']
+            exits.append((('rsi_exit', threshold), lambda: arrays.rsi > threshold))
+        if dna['use_trend_exit']:
+            period = dna['ma_period']
+            exits.append((('trend_exit', period), lambda: ~arrays.above_ma[period]))
+        if dna['use_resistance_exit']:
+            exits.append((('resistance_exit',), lambda: arrays.near_resistance))
+        return exits
+
+    def signal_exit_chains(self, dna):
+        """מערכי next-true של יציאות האותות הפעילות ב-DNA"""
+        return [self._next_signal(key, mask_fn) for key, mask_fn in self.signal_exits(dna)]
+
+    def _exit_slots(self, dnas):
+        """שורות טבלת היציאות (עד 3 לכל DNA, שורה 0 = אין יציאה) וטבלת next-true שטוחה ב-int32.
+        הטבלה נבנית מחדש רק כשמופיע מפתח יציאה חדש - יש רק כמה עשרות מפתחות אפשריים"""
+        n = self.arrays.length
+        slots = np.zeros((len(dnas), 3), dtype=np.int64)
+        grown = self.exit_table is None
+        for k, dna in enumerate(dnas):
+            for slot, (key, mask_fn) in enumerate(self.signal_exits(dna)):
+                if key not in self.exit_rows:
+                    self._next_signal(key, mask_fn)
+                    self.exit_rows[key] = len(self.exit_rows) + 1
+                    grown = True
+                slots[k, slot] = self.exit_rows[key]
+        if grown:
+            rows = [np.full(n + 1, n, dtype=np.int32)] + [None] * len(self.exit_rows)
+            for key, row in self.exit_rows.items():
+                rows[row] = self.next_signal[key].astype(np.int32)
+            self.exit_table = np.concatenate(rows)
+        return slots
+
+    def _exit_reason(self, j, entry_price, bars_held, dna):
+        """קוד סיבת היציאה (אינדקס ב-EXIT_REASONS) בבר j לפי סדר העדיפויות של run_backtest"""
+        price = self.open_list[j]
+        arrays = self.arrays
+        if dna['use_profit_target'] and price >= entry_price * (1 + dna['profit_target']):
+            return 0
+        if dna['use_stop_loss'] and price <= entry_price * (1 - dna['stop_loss']):
+            return 1
+        if dna['use_time_exit'] and bars_held >= dna['max_bars']:
+            return 2
+        if dna['use_rsi_exit'] and arrays.rsi[j] > dna['rsi_exit_high']:
+            return 3
+        if dna['use_trend_exit'] and not arrays.above_ma[dna['ma_period']][j]:
+            return 4
+        return 5
+
+    def run(self, entry_signals, dna):
+        """יומן עסקאות זהה ל-run_backtest, בעלות O(עסקאות) אחרי O(n) לאות הכניסה"""
+        next_entry = next_true_index(entry_signals)
+        entry_bars = []
+        exit_bars = []
+        exit_codes = []
+        # אות כניסה בבר s נכנס בפתיחת בר s + 1; הבר הראשון שאפשר להיכנס בו הוא 1
+        self._walk(next_entry, dna, int(next_entry[0]), entry_bars, exit_bars, exit_codes)
+
+        open_ = self.arrays.open
+        return TradeLedger.from_columns(
+            entry_bars, exit_bars, open_[entry_bars], open_[exit_bars], exit_reason=exit_codes
+        )
+
+    def _walk(self, next_entry, dna, signal, entry_bars, exit_bars, exit_codes):
+        """שרשרת העסקאות של DNA יחיד מאות הכניסה signal ועד סוף הנתונים - מוסיפה לרשימות"""
+        last_bar = self.arrays.length - 2
+        prices = self.open_list
+        chains = self.signal_exit_chains(dna)
+
+        use_price_exit = dna['use_profit_target'] or dna['use_stop_loss']
+        target_mult = 1 + dna['profit_target'] if dna['use_profit_target'] else None
+        stop_mult = 1 - dna['stop_loss'] if dna['use_stop_loss'] else None
+        max_bars = max(dna['max_bars'], 1) if dna['use_time_exit'] else None
+
+        while signal + 1 <= last_bar:
+            entry_bar = signal + 1
+            entry_price = prices[entry_bar]
+            first = entry_bar + 1
+
+            # מועמדי יציאה שלא תלויים במחיר
+            exit_bar = last_bar + 1
+            for chain in chains:
+                candidate = chain[first]
+                if candidate < exit_bar:
+                    exit_bar = int(candidate)
+            if max_bars is not None and entry_bar + max_bars < exit_bar:
+                exit_bar = entry_bar + max_bars
+
+            # יעד רווח / סטופ - חצייה ראשונה לפני המועמד הקרוב ביותר, O(log n)
+            if use_price_exit and first < exit_bar:
+                upper = entry_price * target_mult if target_mult is not None else np.inf
+                lower = entry_price * stop_mult if stop_mult is not None else -np.inf
+                hit = self.first_passage.first_crossing(first, exit_bar, upper, lower)
+                if hit is not None:
+                    exit_bar = hit
+
+            if exit_bar > last_bar:
+                break
+
+            entry_bars.append(entry_bar)
+            exit_bars.append(exit_bar)
+            exit_codes.append(self._exit_reason(exit_bar, entry_price, exit_bar - entry_bar, dna))
+
+            # אחרי יציאה בבר j הכניסה הבאה אפשרית בבר j + 1 (אות מבר j ואילך)
+            signal = int(next_entry[exit_bar])
+
+    def _exit_codes(self, params, owners, entry_bars, exit_bars):
+        """_exit_reason וקטורי לכל העסקאות של run_population"""
+        arrays = self.arrays
+        if self.above_ma is None:
+            self.above_ma = np.stack([arrays.above_ma[period] for period in self.ma_periods])
+        entry_price = arrays.open[entry_bars]
+        price = arrays.open[exit_bars]
+        return np.select(
+            [
+                params['use_profit_target'][owners] & (price >= entry_price * params['target_mult'][owners]),
+                params['use_stop_loss'][owners] & (price <= entry_price * params['stop_mult'][owners]),
+                params['use_time_exit'][owners] & (exit_bars - entry_bars >= params['max_bars'][owners]),
+                params['use_rsi_exit'][owners] & (arrays.rsi[exit_bars] > params['rsi_exit_high'][owners]),
+                params['use_trend_exit'][owners] & ~self.above_ma[params['ma_row'][owners], exit_bars]
+            ],
+            [0, 1, 2, 3, 4],
+            default=5
+        ).astype(np.int8)
+
+    def run_population(self, entry_signals, dnas):
+        """יומני עסקאות לכל האוכלוסיה - זהים ל-run לכל DNA, במעבר משותף אחד על הזמן.
+
+        כל צעד מקדם את כל ה-DNA הפעילים בעסקה אחת: הכניסה הבאה היא searchsorted אחד על כל
+        האוכלוסיה (מיקומי האותות של כל DNA בהיסט k * (n + 1)), יציאות האותות הן שליפה אחת
+        מטבלת next-true משותפת, ויעד/סטופ הם first_crossings אחד.
+        מספר הצעדים הוא מספר העסקאות המקסימלי ולא הסכום שלהן.
+        """
+        arrays = self.arrays
+        n = arrays.length
+        last_bar = n - 2
+        stride = n + 1
+        population = len(dnas)
+        offsets = np.arange(population, dtype=np.int64) * stride
+
+        # אותות הכניסה של כל DNA בהיסט משלו, עם n בסוף כל קטע (כמו next_true_index)
+        entries = np.concatenate([
+            part for k, signals in enumerate(entry_signals)
+            for part in (np.flatnonzero(signals) + offsets[k], offsets[k:k + 1] + n)
+        ])
+
+        # יציאות האותות: עד 3 שורות לכל DNA בטבלת ה-next-true השטוחה
+        slot_offsets = self._exit_slots(dnas) * stride
+        exit_table = self.exit_table
+
+        params = {
+            'use_profit_target': np.array([dna['use_profit_target'] for dna in dnas], dtype=bool),
+            'use_stop_loss': np.array([dna['use_stop_loss'] for dna in dnas], dtype=bool),
+            'use_time_exit': np.array([dna['use_time_exit'] for dna in dnas], dtype=bool),
+            'use_rsi_exit': np.array([dna['use_rsi_exit'] for dna in dnas], dtype=bool),
+            'use_trend_exit': np.array([dna['use_trend_exit'] for dna in dnas], dtype=bool),
+            'target_mult': np.array([1 + dna['profit_target'] for dna in dnas], dtype=np.float64),
+            'stop_mult': np.array([1 - dna['stop_loss'] for dna in dnas], dtype=np.float64),
+            'max_bars': np.array([dna['max_bars'] for dna in dnas], dtype=np.int64),
+            'rsi_exit_high': np.array([dna['rsi_exit_high'] for dna in dnas], dtype=np.float64),
+            'ma_row': np.array([self.ma_periods.index(dna['ma_period']) for dna in dnas], dtype=np.int64)
+        }
+        use_price_exit = params['use_profit_target'] | params['use_stop_loss']
+        # יציאה כבויה - יעד/סטופ אינסופיים ומגבלת זמן שלא מגיעים אליה (מחיר * inf נשאר inf)
+        upper_mult = np.where(params['use_profit_target'], params['target_mult'], np.inf)
+        lower_mult = np.where(params['use_stop_loss'], params['stop_mult'], -np.inf)
+        time_limit = np.where(params['use_time_exit'], np.maximum(params['max_bars'], 1), stride)
+        open_ = arrays.open
+
+        owners = np.arange(population, dtype=np.int64)
+        signal = entries[np.searchsorted(entries, offsets)] - offsets
+        live = signal < last_bar
+        traded_owners = []
+        traded_entries = []
+        traded_exits = []
+
+        while True:
+            # אות בבר s נכנס ב-s + 1, שחייב להיות לכל היותר last_bar
+            owners, signal = owners[live], signal[live]
+            if len(owners) < BATCH_MIN_ACTIVE:
+                break
+
+            entry_bar = signal + 1
+            first = signal + 2
+
+            # מועמדי יציאה שלא תלויים במחיר - שליפה אחת מהטבלה לכל ה-slots; בלי אות היציאה היא n,
+            # שגדול מ-last_bar בדיוק כמו last_bar + 1 בסימולטור הבודד
+            candidates = exit_table[slot_offsets[owners] + first[:, None]].min(axis=1)
+            exit_bar = np.minimum(candidates, entry_bar + time_limit[owners])
+
+            # יעד רווח / סטופ לכל מי שיש לו יציאת מחיר לפני המועמד הקרוב
+            priced = np.flatnonzero(use_price_exit[owners] & (first < exit_bar))
+            if len(priced):
+                who = owners[priced]
+                entry_price = open_[entry_bar[priced]]
+                exit_bar[priced] = self.first_passage.first_crossings(
+                    first[priced], exit_bar[priced], entry_price * upper_mult[who], entry_price * lower_mult[who]
+                )
+
+            traded = exit_bar <= last_bar
+            owners, entry_bar, exit_bar = owners[traded], entry_bar[traded], exit_bar[traded]
+            traded_owners.append(owners)
+            traded_entries.append(entry_bar)
+            traded_exits.append(exit_bar)
+
+            # אחרי יציאה בבר j הכניסה הבאה אפשרית בבר j + 1 (אות מבר j ואילך)
+            base = offsets[owners]
+            signal = entries[np.searchsorted(entries, base + exit_bar)] - base
+            live = signal < last_bar
+
+        trade_owners = np.concatenate(traded_owners) if traded_owners else np.zeros(0, dtype=np.int64)
+        trade_entries = np.concatenate(traded_entries) if traded_entries else np.zeros(0, dtype=np.int64)
+        trade_exits = np.concatenate(traded_exits) if traded_exits else np.zeros(0, dtype=np.int64)
+        trade_codes = self._exit_codes(params, trade_owners, trade_entries, trade_exits)
+
+        # הזנב - כל DNA שעדיין פעיל ממשיך לבד מהאות שבו עצר
+        tail = {}
+        for k, start in zip(owners.tolist(), signal.tolist()):
+            tail[k] = ([], [], [])
+            self._walk(next_true_index(entry_signals[k]), dnas[k], start, *tail[k])
+
+        order = np.argsort(trade_owners, kind='stable')
+        bounds = np.searchsorted(trade_owners[order], np.arange(population + 1))
+        ledgers = []
+        for k in range(population):
+            picked = order[bounds[k]:bounds[k + 1]]
+            entry_bars = trade_entries[picked]
+            exit_bars = trade_exits[picked]
+            exit_codes = trade_codes[picked]
+            if k in tail:
+                entry_bars = np.concatenate((entry_bars, np.asarray(tail[k][0], dtype=np.int64)))
+                exit_bars = np.concatenate((exit_bars, np.asarray(tail[k][1], dtype=np.int64)))
+                exit_codes = np.concatenate((exit_codes, np.asarray(tail[k][2], dtype=np.int8)))
+            ledgers.append(TradeLedger.from_columns(
+                entry_bars, exit_bars, open_[entry_bars], open_[exit_bars], exit_reason=exit_codes
+            ))
+        return ledgers
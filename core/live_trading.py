@@ -0,0 +1,252 @@
+"""
+Live Trading
+הרצת DNA של ה-hunter בר-אחר-בר (paper trading): פיצ'רים מצטברים, החלטה ב-O(1) ומדידת latency
+"""
+
+from collections import deque
+import math
+import time
+
+import numpy as np
+
+from backtest_kernel import MA_PERIODS, MOMENTUM_PERIODS, POINT_VALUE, EXIT_REASONS
+from rolling_extrema import RollingExtremaStream
+from streaming_indicators import (StreamingIndicator, StreamingSMA, StreamingRSI,
+                                  StreamingVolumeRatio, streaming, restore_indicator)
+
+LATENCY_TARGET_US = 100
+
+@streaming
+class HunterFeatureStream(StreamingIndicator):
+    """העמודות של AutonomousStrategyHunter.calculate_indicators לבר הנוכחי - משותף לכל ה-DNA"""
+
+    def __init__(self):
+        self.index = -1
+        self.ma = [StreamingSMA(period) for period in MA_PERIODS]
+        self.rsi = StreamingRSI(14)
+        self.volume_ratio = StreamingVolumeRatio(20)
+        self.recent_high = RollingExtremaStream([20], 'max')
+        self.closes = deque(maxlen=max(MOMENTUM_PERIODS) + 1)
+        self.value = None
+
+    def update(self, bar):
+        self.index += 1
+        timestamp = bar['timestamp']
+        open_, high, low, close = bar['open'], bar['high'], bar['low'], bar['close']
+        hour = timestamp.hour
+
+        self.closes.append(close)
+        body = abs(close - open_)
+        bar_range = high - low
+        if bar_range:
+            body_ratio = body / bar_range
+        else:
+            body_ratio = math.inf if body else math.nan
+
+        # השוואה מול NaN היא False - כמו בעמודות הבוליאניות של ה-hunter
+        above_ma = {sma.period: close > sma.update(close) for sma in self.ma}
+        positive_momentum = {}
+        for period in MOMENTUM_PERIODS:
+            past = self.closes[-period - 1] if len(self.closes) > period else math.nan
+            positive_momentum[period] = (close / past - 1) * 100 > 0
+
+        recent_high = self.recent_high.update(high)[20]
+
+        self.value = {
+            'index': self.index,
+            'hour': hour,
+            'market_open': 9 <= hour <= 15 and timestamp.weekday() < 5,
+            'is_green': close > open_,
+            'body_ratio': body_ratio,
+            'above_ma': above_ma,
+            'rsi': self.rsi.update(close),
+            'volume_ratio': self.volume_ratio.update(bar),
+            'positive_momentum': positive_momentum,
+            'near_resistance': close > recent_high * 0.995
+        }
+        return self.value
+
+def entry_signal(dna, features):
+    """תנאי הכניסה של DNA לבר אחד - זהה ל-build_entry_signals"""
+    if not features['market_open']:
+        return False
+    if dna['use_time_filter'] and features['hour'] not in dna['allowed_hours']:
+        return False
+    if dna['use_trend'] and not features['above_ma'][dna['ma_period']]:
+        return False
+    if dna['use_rsi'] and not (dna['rsi_low'] < features['rsi'] < dna['rsi_high']):
+        return False
+    if dna['use_volume'] and not features['volume_ratio'] > dna['volume_threshold']:
+        return False
+    if dna['use_momentum'] and not features['positive_momentum'][dna['momentum_period']]:
+        return False
+    if dna['use_price_action'] and not (features['is_green'] and features['body_ratio'] > dna['min_body_ratio']):
+        return False
+    return True
+
+def signal_exit_code(dna, features):
+    """קוד יציאת האותות לבר אחד - זהה ל-signal_exit_codes"""
+    if dna['use_rsi_exit'] and features['rsi'] > dna['rsi_exit_high']:
+        return EXIT_REASONS.index('rsi_exit')
+    if dna['use_trend_exit'] and not features['above_ma'][dna['ma_period']]:
+        return EXIT_REASONS.index('trend_exit')
+    if dna['use_resistance_exit'] and features['near_resistance']:
+        return EXIT_REASONS.index('resistance_exit')
+    return -1
+
+class PaperTrader:
+    """מכונת המצבים של run_backtest לבר בודד.
+
+    כמו ב-backtest: אות כניסה של בר i-1 נכנס במחיר הפתיחה של בר i,
+    ויציאות נבדקות מול מחיר הפתיחה ואותות היציאה של אותו בר.
+    """
+
+    def __init__(self, dna, name='strategy'):
+        self.dna = dna
+        self.name = name
+        self.position = 0
+        self.entry_price = 0.0
+        self.entry_index = -1
+        self.bars_in_trade = 0
+        self.pending_entry = False
+        self.trades = 0
+        self.total_pnl = 0.0
+
+    def on_bar(self, bar, features):
+        """החלטה לבר אחד - מחזיר fill (dict) או None"""
+        dna = self.dna
+        price = bar['open']
+        fill = None
+
+        if self.position == 0:
+            if self.pending_entry:
+                self.position = 1
+                self.entry_price = price
+                self.entry_index = features['index']
+                self.bars_in_trade = 0
+                fill = self._fill(bar, features, 'BUY', price)
+        else:
+            self.bars_in_trade += 1
+            if dna['use_profit_target'] and price >= self.entry_price * (1 + dna['profit_target']):
+                exit_code = 0
+            elif dna['use_stop_loss'] and price <= self.entry_price * (1 - dna['stop_loss']):
+                exit_code = 1
+            elif dna['use_time_exit'] and self.bars_in_trade >= dna['max_bars']:
+                exit_code = 2
+            else:
+                exit_code = signal_exit_code(dna, features)
+
+            if exit_code >= 0:
+                trade_return = float((price - self.entry_price) / self.entry_price)
+                fill = self._fill(bar, features, 'SELL', price)
+                fill.update({
+                    'entry_index': self.entry_index,
+                    'entry_price': self.entry_price,
+                    'return': trade_return,
+                    'pnl': trade_return * POINT_VALUE,
+                    'bars_held': self.bars_in_trade,
+                    'exit_reason': EXIT_REASONS[exit_code]
+                })
+                self.trades += 1
+                self.total_pnl += fill['pnl']
+                self.position = 0
+                self.entry_price = 0.0
+                self.bars_in_trade = 0
+
+        self.pending_entry = entry_signal(dna, features)
+        return fill
+
+    def _fill(self, bar, features, side, price):
+        return {
+            'strategy': self.name,
+            'side': side,
+            'time': bar['timestamp'].isoformat(),
+            'index': features['index'],
+            'price': price
+        }
+
+    def state(self):
+        """מצב ניתן לסריאליזציה (לשמירה בין הרצות)"""
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_state(cls, state):
+        trader = cls(state['dna'], state['name'])
+        trader.__dict__.update(state)
+        return trader
+
+class LatencyRecorder:
+    """זמני החלטה לבר (ns): ממוצע וקצה מלאים, אחוזונים מחלון הדגימות האחרון"""
+
+    def __init__(self, target_us=LATENCY_TARGET_US, window=100000):
+        self.target_ns = target_us * 1000
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.over_target = 0
+
+    def record(self, elapsed_ns):
+        self.samples.append(elapsed_ns)
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if elapsed_ns > self.target_ns:
+            self.over_target += 1
+
+    def summary(self):
+        """{'count', 'mean_us', 'p50_us', 'p90_us', 'p99_us', 'max_us', 'over_target'}"""
+        if not self.count:
+            return {'count': 0}
+        p50, p90, p99 = np.percentile(np.fromiter(self.samples, dtype=np.int64), [50, 90, 99]) / 1000
+        return {
+            'count': self.count,
+            'mean_us': self.total_ns / self.count / 1000,
+            'p50_us': float(p50),
+            'p90_us': float(p90),
+            'p99_us': float(p99),
+            'max_us': self.max_ns / 1000,
+            'over_target': self.over_target
+        }
+
+    def report(self):
+        """שורת סיכום להדפסה"""
+        stats = self.summary()
+        if not stats['count']:
+            return "⏱️  אין עדיין ברים"
+        return (f"⏱️  {stats['count']:,} ברים | p50 {stats['p50_us']:.1f}µs | p99 {stats['p99_us']:.1f}µs | "
+                f"max {stats['max_us']:.1f}µs | מעל {self.target_ns // 1000}µs: {stats['over_target']:,}")
+
+class LiveSession:
+    """פיצ'רים משותפים + PaperTrader לכל DNA; latency נמדד לבר לאסטרטגיה"""
+
+    def __init__(self, traders, features=None, latency=None):
+        self.traders = traders
+        self.features = features or HunterFeatureStream()
+        self.latency = latency or LatencyRecorder()
+
+    def warmup(self, bar):
+        """עדכון האינדיקטורים בלבד (היסטוריה) - ללא מסחר, אבל אות הכניסה נשמר לבר הבא"""
+        features = self.features.update(bar)
+        for trader in self.traders:
+            trader.pending_entry = entry_signal(trader.dna, features)
+
+    def on_bar(self, bar):
+        """בר חי: פיצ'רים + החלטה לכל DNA. מחזיר רשימת fills"""
+        start = time.perf_counter_ns()
+        features = self.features.update(bar)
+        fills = [fill for fill in (trader.on_bar(bar, features) for trader in self.traders) if fill]
+        self.latency.record((time.perf_counter_ns() - start) // max(len(self.traders), 1))
+        return fills
+
+    def state(self):
+        return {
+            'features': self.features.state(),
+            'traders': [trader.state() for trader in self.traders]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        return cls([PaperTrader.from_state(trader) for trader in state['traders']],
+                   features=restore_indicator(state['features']))
@@ -0,0 +1,180 @@
+"""
+Market Data
+שכבת טעינה משותפת: המרת data/NQ2018.csv פעם אחת למטמון עמודות בינארי מחולק לפי שנים
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OHLCVStore, is_store
+
+CACHE_VERSION = 2
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'NQ2018.csv')
+
+def cache_dir_for(csv_path):
+    """תיקיית המטמון של קובץ CSV - data/.cache/<שם הקובץ>"""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), '.cache', stem)
+
+def file_sha1(path, chunk_size=1 << 20):
+    """Hash של תוכן הקובץ"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_manifest(cache_dir, manifest):
+    tmp_path = os.path.join(cache_dir, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, 'manifest.json'))
+
+def _is_fresh(csv_path, cache_dir, manifest):
+    """בדיקה אם המטמון תואם לקובץ - גודל ו-mtime, ו-hash רק אם ה-mtime השתנה"""
+    if manifest is None or manifest.get('version') != CACHE_VERSION:
+        return False
+
+    stat = os.stat(csv_path)
+    source = manifest['source']
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns == source['mtime_ns']:
+        return True
+
+    # הקובץ נגע אבל אולי לא השתנה
+    if file_sha1(csv_path) != source['sha1']:
+        return False
+    source['mtime_ns'] = stat.st_mtime_ns
+    _write_manifest(cache_dir, manifest)
+    return True
+
+def build_cache(csv_path):
+    """קריאת ה-CSV המלא פעם אחת וכתיבת עמודה לכל קובץ npy., תיקייה לכל שנה"""
+    cache_dir = cache_dir_for(csv_path)
+    print(f"🗄️  בונה מטמון בינארי עבור {os.path.basename(csv_path)}...")
+
+    stat = os.stat(csv_path)
+    df = pd.read_csv(csv_path)
+    index = pd.DatetimeIndex(pd.to_datetime(df.pop('datetime')))
+    # עמודות לא מספריות (סימול, סשן...) נשמרות כקטגוריות: קודים לכל שנה וטבלת ערכים אחת
+    categorical = [column for column in df.columns if not pd.api.types.is_numeric_dtype(df[column])]
+    categories = {}
+    for column in categorical:
+        values = df[column].astype('category')
+        categories[column] = values.cat.categories.astype(str).to_numpy(dtype=str)
+        df[column] = values.cat.codes.to_numpy(dtype=np.int32)
+    tz = str(index.tz) if index.tz is not None else None
+    years = index.year.to_numpy()
+    # datetime64 נשמר עם היחידה שלו (ns/us) - אזור זמן נשמר כ-UTC
+    timestamps = (index.tz_convert(None) if tz else index).to_numpy()
+
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    for column, values in categories.items():
+        np.save(os.path.join(tmp_dir, f'{column}.categories.npy'), values)
+
+    partitions = {}
+    for year in np.unique(years):
+        rows = np.flatnonzero(years == year)
+        year_dir = os.path.join(tmp_dir, str(year))
+        os.makedirs(year_dir)
+        np.save(os.path.join(year_dir, 'timestamp.npy'), timestamps[rows])
+        for column in df.columns:
+            np.save(os.path.join(year_dir, f'{column}.npy'), df[column].to_numpy()[rows])
+        partitions[str(year)] = int(len(rows))
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'source': {
+            'path': os.path.abspath(csv_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': file_sha1(csv_path)
+        },
+        'columns': list(df.columns),
+        'categorical': categorical,
+        'tz': tz,
+        'partitions': partitions
+    }
+    _write_manifest(tmp_dir, manifest)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+    os.replace(tmp_dir, cache_dir)
+
+    print(f"✅ מטמון נבנה: {sum(partitions.values()):,} שורות ב-{len(partitions)} שנים")
+    if categorical:
+        print(f"🏷️  עמודות קטגוריות: {', '.join(categorical)}")
+    return manifest
+
+def ensure_cache(csv_path, rebuild=False):
+    """החזרת manifest של מטמון עדכני, ובנייה מחדש אם ה-CSV השתנה"""
+    cache_dir = cache_dir_for(csv_path)
+    manifest = _read_manifest(cache_dir)
+    if rebuild or not _is_fresh(csv_path, cache_dir, manifest):
+        manifest = build_cache(csv_path)
+    return manifest
+
+def row_counts(csv_path):
+    """מספר השורות לכל שנה מתוך ה-manifest"""
+    if is_store(csv_path):
+        return OHLCVStore.open(csv_path).row_counts()
+    manifest = ensure_cache(csv_path)
+    return {int(year): rows for year, rows in manifest['partitions'].items()}
+
+def load_market_data(csv_path=DEFAULT_CSV, years=None, columns=None):
+    """טעינת השנים המבוקשות בלבד כ-DataFrame עם אינדקס datetime"""
+    if is_store(csv_path):
+        # מאגר ממופה לזיכרון - DataFrame מעל views ללא העתקה
+        return OHLCVStore.open(csv_path).frame_for_years(years, columns)
+
+    manifest = ensure_cache(csv_path)
+    cache_dir = cache_dir_for(csv_path)
+
+    if years is None:
+        selected = sorted(manifest['partitions'], key=int)
+    else:
+        selected = [str(year) for year in years if str(year) in manifest['partitions']]
+    names = columns if columns is not None else manifest['columns']
+
+    timestamps = [np.load(os.path.join(cache_dir, year, 'timestamp.npy')) for year in selected]
+    data = {}
+    for name in names:
+        parts = [np.load(os.path.join(cache_dir, year, f'{name}.npy')) for year in selected]
+        data[name] = np.concatenate(parts) if parts else np.array([])
+        if name in manifest['categorical']:
+            # קוד -1 הוא ערך חסר (NaN), כמו ב-Categorical
+            values = np.load(os.path.join(cache_dir, f'{name}.categories.npy'))
+            data[name] = pd.Categorical.from_codes(data[name].astype(np.int32), categories=values)
+
+    index = pd.DatetimeIndex(np.concatenate(timestamps) if timestamps else np.array([], dtype='datetime64[ns]'))
+    if manifest['tz']:
+        index = index.tz_localize('UTC').tz_convert(manifest['tz'])
+    index.name = 'datetime'
+
+    return pd.DataFrame(data, index=index)
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV
+    manifest = ensure_cache(csv_path, rebuild='--rebuild' in sys.argv)
+    for year, rows in sorted(manifest['partitions'].items()):
+        print(f"  {year}: {rows:,} שורות")
@@ -0,0 +1,149 @@
+"""
+OHLCV Store
+מאגר OHLCV ממופה לזיכרון: timestamp כ-int64 ועמודות float32, חיתוך זמנים ב-searchsorted ללא העתקה
+"""
+
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def is_store(path):
+    """האם הנתיב הוא תיקיית מאגר OHLCV"""
+    return os.path.isfile(os.path.join(path, 'store.json'))
+
+def _to_ns(value, tz):
+    """המרת תאריך (מחרוזת / Timestamp) ל-int64 ns באותו בסיס של המאגר"""
+    stamp = pd.Timestamp(value)
+    if tz:
+        stamp = stamp.tz_localize(tz) if stamp.tzinfo is None else stamp.tz_convert(tz)
+        stamp = stamp.tz_convert('UTC').tz_localize(None)
+    elif stamp.tzinfo is not None:
+        stamp = stamp.tz_convert('UTC').tz_localize(None)
+    return stamp.as_unit('ns').value
+
+class OHLCVStore:
+    """מאגר OHLCV על קבצי npy. ממופים - הנתונים נטענים מהדיסק רק כשנוגעים בהם"""
+
+    def __init__(self, path, timestamps, columns, meta):
+        self.path = path
+        self.timestamps = timestamps
+        self.columns = columns
+        self.meta = meta
+
+    @classmethod
+    def write(cls, path, df):
+        """כתיבת DataFrame עם אינדקס datetime למאגר חדש"""
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        if tz:
+            index = index.tz_convert(None)
+        timestamps = index.as_unit('ns').asi8
+
+        order = None
+        if len(timestamps) and not np.all(timestamps[1:] >= timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'timestamp.npy'), np.ascontiguousarray(timestamps, dtype=np.int64))
+        for name in OHLCV_COLUMNS:
+            values = df[name].to_numpy(dtype=np.float32)
+            if order is not None:
+                values = values[order]
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(values))
+
+        meta = {
+            'version': STORE_VERSION,
+            'rows': int(len(timestamps)),
+            'tz': tz,
+            'columns': OHLCV_COLUMNS
+        }
+        with open(os.path.join(path, 'store.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """פתיחת מאגר קיים במצב memory-map לקריאה בלבד"""
+        with open(os.path.join(path, 'store.json'), 'r') as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"גרסת מאגר לא נתמכת: {meta.get('version')}")
+
+        timestamps = np.load(os.path.join(path, 'timestamp.npy'), mmap_mode='r')
+        columns = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+            for name in meta['columns']
+        }
+        return cls(path, timestamps, columns, meta)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def locate(self, start=None, end=None):
+        """טווח שורות [start, end) בחיפוש בינארי על ה-timestamps הממוינים"""
+        tz = self.meta['tz']
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, _to_ns(start, tz), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, _to_ns(end, tz), side='left'))
+        return lo, max(lo, hi)
+
+    def slice(self, start=None, end=None, columns=None):
+        """views של העמודות לטווח הזמנים - ללא העתקה"""
+        lo, hi = self.locate(start, end)
+        names = columns if columns is not None else self.meta['columns']
+        data = {name: self.columns[name][lo:hi] for name in names}
+        data['timestamp'] = self.timestamps[lo:hi]
+        return data
+
+    def frame(self, start=None, end=None, columns=None):
+        """מתאם DataFrame מעל ה-views, באותה צורה כמו load_market_data"""
+        data = self.slice(start, end, columns)
+        index = pd.DatetimeIndex(data.pop('timestamp').view('datetime64[ns]'), copy=False)
+        if self.meta['tz']:
+            index = index.tz_localize('UTC').tz_convert(self.meta['tz'])
+        index.name = 'datetime'
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def frame_for_years(self, years=None, columns=None):
+        """DataFrame לשנים מסוימות - שנים רצופות נחתכות כ-view יחיד"""
+        if years is None:
+            return self.frame(columns=columns)
+
+        years = sorted(int(year) for year in years)
+        if not years:
+            return self.frame(columns=columns).iloc[:0]
+
+        runs = [[years[0], years[0]]]
+        for year in years[1:]:
+            if year == runs[-1][1] + 1:
+                runs[-1][1] = year
+            elif year != runs[-1][1]:
+                runs.append([year, year])
+
+        frames = [self.frame(f'{first}-01-01', f'{last + 1}-01-01', columns) for first, last in runs]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames)
+
+    def row_counts(self):
+        """מספר השורות לכל שנה"""
+        index = self.frame(columns=[]).index
+        years, counts = np.unique(index.year.to_numpy(), return_counts=True)
+        return {int(year): int(count) for year, count in zip(years, counts)}
+
+if __name__ == "__main__":
+    from market_data import load_market_data
+
+    if len(sys.argv) < 3:
+        print("שימוש: python ohlcv_store.py <csv> <store_dir>")
+        sys.exit(1)
+
+    store = OHLCVStore.write(sys.argv[2], load_market_data(sys.argv[1]))
+    size_mb = sum(values.nbytes for values in store.columns.values()) / 1e6
+    print(f"✅ נכתב מאגר: {len(store):,} שורות ({size_mb:.1f}MB) ב-{sys.argv[2]}")
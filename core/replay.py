@@ -0,0 +1,124 @@
+"""
+Replay
+שידור ברים היסטוריים דרך אותו ממשק של פיד חי: מכפיל מהירות, fan-out ל-N צרכנים,
+תפוקה (ברים/שנייה), אחוזוני latency ואירועי backpressure
+"""
+
+import queue
+import threading
+import time
+
+from live_trading import LatencyRecorder, LATENCY_TARGET_US
+
+class ReplayConsumer(threading.Thread):
+    """צרכן בתהליכון נפרד עם תור חסום משלו; latency נמדד משידור הבר ועד סוף הטיפול בו"""
+
+    def __init__(self, name, handler, queue_size, target_us):
+        super().__init__(name=name, daemon=True)
+        self.handler = handler
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.latency = LatencyRecorder(target_us)
+        self.processed = 0
+        self.error = None
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            emitted_ns, bar = item
+            if self.error is None:
+                try:
+                    self.handler(bar)
+                except Exception as e:
+                    self.error = e
+            self.latency.record(time.perf_counter_ns() - emitted_ns)
+            self.processed += 1
+
+class ReplayEngine:
+    """מפיץ כל בר לכל הצרכנים.
+
+    speed: מכפיל זמן אמת (60 = דקת נתונים בשנייה); 0 = מהר ככל האפשר.
+    backpressure: תור של צרכן מלא - המשדר נחסם עד שהצרכן מתפנה.
+    late: בר שיצא אחרי הזמן שלו בלוח הזמנים (רק כש-speed > 0).
+    """
+
+    def __init__(self, handlers, speed=0, queue_size=1024, target_us=LATENCY_TARGET_US):
+        self.speed = speed
+        self.target_us = target_us
+        self.consumers = [ReplayConsumer(f"consumer-{k}", handler, queue_size, target_us)
+                          for k, handler in enumerate(handlers)]
+        self.bars = 0
+        self.backpressure = 0
+        self.late = 0
+        self.elapsed = 0.0
+        self.data_seconds = 0.0
+
+    def _publish(self, consumer, item):
+        try:
+            consumer.queue.put_nowait(item)
+        except queue.Full:
+            self.backpressure += 1
+            consumer.queue.put(item)
+
+    def run(self, bars, max_bars=None):
+        """שידור הברים עד הסוף (או max_bars) והמתנה לכל הצרכנים"""
+        for consumer in self.consumers:
+            consumer.start()
+
+        start = time.perf_counter()
+        first_timestamp = None
+        try:
+            for bar in bars:
+                if max_bars is not None and self.bars >= max_bars:
+                    break
+
+                if first_timestamp is None:
+                    first_timestamp = bar['timestamp']
+                self.data_seconds = (bar['timestamp'] - first_timestamp).total_seconds()
+
+                if self.speed:
+                    delay = start + self.data_seconds / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    elif delay < -1 / self.speed:
+                        self.late += 1
+
+                item = (time.perf_counter_ns(), bar)
+                for consumer in self.consumers:
+                    self._publish(consumer, item)
+                self.bars += 1
+        finally:
+            for consumer in self.consumers:
+                consumer.queue.put(None)
+            for consumer in self.consumers:
+                consumer.join()
+            self.elapsed = time.perf_counter() - start
+
+        for consumer in self.consumers:
+            if consumer.error is not None:
+                raise consumer.error
+        return self.report()
+
+    def report(self):
+        """סיכום: תפוקה, קצב נדרש למהירות הנתונה, latency לכל צרכן ו-backpressure"""
+        merged = LatencyRecorder(self.target_us)
+        for consumer in self.consumers:
+            for sample in consumer.latency.samples:
+                merged.record(sample)
+
+        bars_per_sec = self.bars / self.elapsed if self.elapsed else 0.0
+        # קצב הברים בזמן אמת (בלי מכפיל), לפי טווח הזמנים של הנתונים ששודרו
+        realtime_rate = (self.bars - 1) / self.data_seconds if self.data_seconds else 0.0
+        return {
+            'bars': self.bars,
+            'consumers': len(self.consumers),
+            'elapsed': self.elapsed,
+            'bars_per_sec': bars_per_sec,
+            'realtime_bars_per_sec': realtime_rate,
+            'speedup': bars_per_sec / realtime_rate if realtime_rate else 0.0,
+            'backpressure': self.backpressure,
+            'late': self.late,
+            'latency': merged.summary(),
+            'consumer_latency': [consumer.latency.summary() for consumer in self.consumers]
+        }
@@ -0,0 +1,127 @@
+"""
+Rolling Extrema
+מינימום/מקסימום נע לכמה אורכי חלון ממעבר אחד על הסדרה
+
+בבאטץ' זו טבלת הכפלה (sparse table) ולא deque מונוטוני: O(n log w) לבנייה ו-O(n) לכל חלון.
+deque בלולאת Python לבר איטי מ-pandas, והגרסה הווקטורית שלו ב-O(n) (prefix/suffix בבלוקים,
+van Herk / Gil-Werman) נשענת על ufunc.accumulate שרץ בר-בר - כ-6ms לחלון על 355k ברים
+מול כ-0.5ms לחלון מהטבלה. המחיר הוא זיכרון: floor(log2 w_max) + 1 מערכי float64 באורך n
+לכל (עמודה, סוג) - כ-23MB ל-355k ברים עם חלון של 200. ה-deque נשאר ל-streaming.
+"""
+
+from collections import deque
+import numpy as np
+
+class ExtremaTable:
+    """טבלת הכפלה: level k מחזיק את ה-max/min של כל חלון באורך 2^k.
+    כל חלון w הוא איחוד של שני חלונות חופפים באורך 2^floor(log2 w) - השוואה אחת לבר.
+    ה-levels נבנים רק עד החלון הגדול שהתבקש ונשמרים (nbytes) לחלונות הבאים"""
+
+    def __init__(self, values, kind='max'):
+        if kind not in ('max', 'min'):
+            raise ValueError(f"kind חייב להיות max או min: {kind}")
+        self.kind = kind
+        self.op = np.maximum if kind == 'max' else np.minimum
+        self.levels = [np.asarray(values, dtype=np.float64)]
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def _level(self, k):
+        """בניית ה-levels עד k לפי הצורך (NaN מתפשט, כמו min_periods=window)"""
+        while len(self.levels) <= k:
+            prev = self.levels[-1]
+            half = 1 << (len(self.levels) - 1)
+            self.levels.append(self.op(prev[:-half], prev[half:]))
+        return self.levels[k]
+
+    def window(self, window):
+        """ערך הקיצון של כל חלון באורך window שמסתיים בבר i - זהה ל-rolling(window).max()/min()"""
+        n = len(self)
+        out = np.full(n, np.nan)
+        if window < 1 or window > n:
+            return out
+
+        k = window.bit_length() - 1
+        size = 1 << k
+        level = self._level(k)
+        out[window - 1:] = self.op(level[:n - window + 1], level[window - size:n - size + 1])
+        return out
+
+    def windows(self, windows):
+        """{window: מערך} לכמה חלונות מאותה טבלה"""
+        return {window: self.window(window) for window in windows}
+
+class RollingExtremaStream:
+    """גרסת streaming: deque מונוטוני אחד לחלון הגדול, ממנו נגזרים כל החלונות הקטנים"""
+
+    def __init__(self, windows, kind='max'):
+        if kind not in ('max', 'min'):
+            raise ValueError(f"kind חייב להיות max או min: {kind}")
+        self.windows = sorted(set(int(window) for window in windows))
+        self.kind = kind
+        self.index = -1
+        self.last_nan = -1
+        self.items = deque()
+
+    def _dominates(self, new, old):
+        return new >= old if self.kind == 'max' else new <= old
+
+    def update(self, value):
+        """הוספת בר והחזרת {window: קיצון} (NaN עד שהחלון מלא או אם יש בו NaN)"""
+        self.index += 1
+        items = self.items
+
+        if value != value:
+            self.last_nan = self.index
+        else:
+            while items and self._dominates(value, items[-1][1]):
+                items.pop()
+            items.append((self.index, value))
+
+        oldest = self.index - self.windows[-1]
+        while items and items[0][0] <= oldest:
+            items.popleft()
+
+        result = {}
+        for window in self.windows:
+            start = self.index - window + 1
+            if start < 0 or self.last_nan >= start:
+                result[window] = np.nan
+                continue
+            # האיבר הראשון בתוך החלון הוא הקיצון שלו - ה-deque ממוין לפי אינדקס
+            for idx, item in items:
+                if idx >= start:
+                    result[window] = item
+                    break
+        return result
+
+    def state(self):
+        """מצב ניתן לסריאליזציה"""
+        return {
+            'windows': self.windows,
+            'kind': self.kind,
+            'index': self.index,
+            'last_nan': self.last_nan,
+            'items': [list(item) for item in self.items]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        stream = cls(state['windows'], state['kind'])
+        stream.index = state['index']
+        stream.last_nan = state['last_nan']
+        stream.items = deque((int(idx), float(value)) for idx, value in state['items'])
+        return stream
+
+def rolling_max(values, windows):
+    """{window: rolling max} לכמה חלונות ממעבר אחד"""
+    return ExtremaTable(values, 'max').windows(windows)
+
+def rolling_min(values, windows):
+    """{window: rolling min} לכמה חלונות ממעבר אחד"""
+    return ExtremaTable(values, 'min').windows(windows)
@@ -0,0 +1,98 @@
+"""
+Shared Dataset
+פרסום עמודות ה-backtest (BarArrays) כבלוקי shared memory לעובדי ה-pool של הצייד
+"""
+
+import uuid
+import numpy as np
+from multiprocessing import shared_memory
+
+def _attach_block(name):
+    """התחברות לבלוק קיים בלי לרשום אותו שוב ב-resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 - העובדים חולקים את ה-tracker של תהליך האב, והרישום הכפול זניח
+        return shared_memory.SharedMemory(name=name)
+
+class SharedDataset:
+    """סט עמודות בזיכרון משותף: הבעלים מפרסם, העובדים מתחברים כ-views ללא העתקה"""
+
+    def __init__(self, manifest, blocks, owner):
+        self.manifest = manifest
+        self.blocks = blocks
+        self.owner = owner
+        self.columns = {}
+
+        for name, spec in manifest['columns'].items():
+            block = blocks[name]
+            view = np.ndarray(tuple(spec['shape']), dtype=np.dtype(spec['dtype']), buffer=block.buf)
+            if not owner:
+                view.flags.writeable = False
+            self.columns[name] = view
+
+    @classmethod
+    def publish(cls, columns, prefix='nq'):
+        """העתקת העמודות פעם אחת לבלוקים בעלי שם והחזרת הבעלים"""
+        run_id = uuid.uuid4().hex[:8]
+        manifest = {'length': None, 'columns': {}}
+        blocks = {}
+
+        try:
+            for name, values in columns.items():
+                values = np.ascontiguousarray(values)
+                block = shared_memory.SharedMemory(
+                    name=f"{prefix}_{run_id}_{len(blocks)}",
+                    create=True,
+                    size=max(values.nbytes, 1)
+                )
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+                blocks[name] = block
+                manifest['columns'][name] = {
+                    'shm': block.name,
+                    'dtype': values.dtype.str,
+                    'shape': list(values.shape)
+                }
+                if manifest['length'] is None and values.ndim:
+                    manifest['length'] = int(values.shape[0])
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        return cls(manifest, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, manifest):
+        """התחברות לבלוקים לפי ה-manifest - views לקריאה בלבד"""
+        blocks = {}
+        for name, spec in manifest['columns'].items():
+            blocks[name] = _attach_block(spec['shm'])
+        return cls(manifest, blocks, owner=False)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def nbytes(self):
+        """סך הזיכרון המשותף בבתים"""
+        return sum(view.nbytes for view in self.columns.values())
+
+    def close(self):
+        """ניתוק מהבלוקים; הבעלים גם מוחק אותם"""
+        self.columns = {}
+        for block in self.blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # עדיין קיימים views חיצוניים - הבלוק ישוחרר עם סיום התהליך
+                pass
+            if self.owner:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+        self.blocks = {}
@@ -0,0 +1,166 @@
+"""
+Signal Mask
+מסכת אותות דחוסה בביטים - מילה של 64 ברים ב-uint64 במקום בית לכל בר.
+AND/OR/NOT, הזזה בבר (אות ב-i-1, ביצוע ב-i), ספירה (popcount) וחיפוש הביט הדלוק הבא
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+# מספר המילים שנסרקות לפני חיפוש על כל שאר המסכה ב-next_set
+NEXT_SET_WINDOW = 32
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words):
+        # צובר uint32 מהיר מברירת המחדל (uint64) ומספיק לכל מסכה עד 2^32 ברים
+        return int(np.bitwise_count(words).sum(dtype=np.uint32))
+else:
+    # NumPy < 2.0 - טבלת ספירה לכל בית
+    _BYTE_COUNTS = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return int(_BYTE_COUNTS[words.view(np.uint8)].sum(dtype=np.int64))
+
+# קבועי uint64 מוכנים מראש - יצירת np.uint64 בכל קריאה עולה יותר מפעולה על מילה
+_SHIFTS = [np.uint64(count) for count in range(WORD_BITS + 1)]
+_LOW_BITS = [np.uint64((1 << count) - 1) for count in range(WORD_BITS + 1)]
+
+def _low_bits(count):
+    """מילה עם count הביטים הנמוכים דלוקים (0 <= count <= 64)"""
+    return _LOW_BITS[count]
+
+class SignalMask:
+    """מסכה בוליאנית באורך length, דחוסה ל-words (uint64 little-endian: בר i בביט i % 64 של מילה i // 64).
+
+    הביטים שאחרי length במילה האחרונה תמיד כבויים, כך ש-count ו-next_set לא רואים אותם.
+    """
+
+    def __init__(self, words, length):
+        self.words = words
+        self.length = length
+
+    @classmethod
+    def from_bool(cls, mask):
+        """דחיסה של מערך בוליאני"""
+        mask = np.asarray(mask, dtype=bool)
+        packed = np.packbits(mask, bitorder='little')
+        padding = -len(packed) % (WORD_BITS // 8)
+        if padding:
+            packed = np.concatenate((packed, np.zeros(padding, dtype=np.uint8)))
+        return cls(packed.view('<u8'), len(mask))
+
+    @classmethod
+    def zeros(cls, length):
+        return cls(np.zeros(-(-length // WORD_BITS), dtype='<u8'), length)
+
+    def to_bool(self):
+        """פריסה למערך בוליאני חדש (מותר לשנות אותו)"""
+        return np.unpackbits(self.words.view(np.uint8), count=self.length, bitorder='little').view(bool)
+
+    def copy(self):
+        return SignalMask(self.words.copy(), self.length)
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    def __len__(self):
+        return self.length
+
+    def _clear_tail(self, words):
+        tail = self.length % WORD_BITS
+        if tail and len(words):
+            words[-1] &= _low_bits(tail)
+        return words
+
+    def _check(self, other):
+        if self.length != other.length:
+            raise ValueError(f"Mask lengths differ: {self.length} != {other.length}")
+
+    def __and__(self, other):
+        self._check(other)
+        return SignalMask(self.words & other.words, self.length)
+
+    def __or__(self, other):
+        self._check(other)
+        return SignalMask(self.words | other.words, self.length)
+
+    def __iand__(self, other):
+        self._check(other)
+        self.words &= other.words
+        return self
+
+    def __ior__(self, other):
+        self._check(other)
+        self.words |= other.words
+        return self
+
+    def __invert__(self):
+        return SignalMask(self._clear_tail(~self.words), self.length)
+
+    def __eq__(self, other):
+        return isinstance(other, SignalMask) and self.length == other.length and np.array_equal(self.words, other.words)
+
+    __hash__ = None
+
+    def shift(self, periods=1):
+        """הזזה קדימה ב-periods ברים כמו Series.shift(periods) עם False בהתחלה - result[i] = mask[i - periods]"""
+        if periods < 0:
+            raise ValueError("Only forward shifts are supported")
+        words = self.words
+        word_shift, bit_shift = divmod(periods, WORD_BITS)
+        if word_shift >= len(words):
+            return SignalMask.zeros(self.length)
+
+        result = np.empty_like(words)
+        source = words[:len(words) - word_shift]
+        if bit_shift:
+            # הביטים העליונים של כל מילה עוברים לתחתית המילה הבאה - נכתבים ישר לתוצאה
+            result[:word_shift + 1] = 0
+            np.right_shift(source[:-1], _SHIFTS[WORD_BITS - bit_shift], out=result[word_shift + 1:])
+            result[word_shift:] |= source << _SHIFTS[bit_shift]
+        else:
+            result[:word_shift] = 0
+            result[word_shift:] = source
+        return SignalMask(self._clear_tail(result), self.length)
+
+    def count(self, start=0, stop=None):
+        """מספר הברים הדלוקים בטווח [start, stop)"""
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return 0
+        if start == 0 and stop == self.length:
+            # הביטים שאחרי length כבויים - כל המילים נספרות כמו שהן
+            return _popcount(self.words)
+        first, first_bit = divmod(start, WORD_BITS)
+        last, last_bit = divmod(stop, WORD_BITS)
+        # מילים שלמות ב-popcount וקטורי, קצוות חלקיים כמספר Python
+        total = _popcount(self.words[first:last])
+        if first_bit:
+            total -= bin(int(self.words[first]) & ((1 << first_bit) - 1)).count('1')
+        if last_bit:
+            total += bin(int(self.words[last]) & ((1 << last_bit) - 1)).count('1')
+        return total
+
+    def next_set(self, i):
+        """הבר הדלוק הראשון j >= i, או length אם אין - כמו next_true_index(mask)[i]"""
+        if i >= self.length:
+            return self.length
+        index, bit = divmod(max(i, 0), WORD_BITS)
+        word = int(self.words[index]) >> bit
+        if word:
+            return index * WORD_BITS + bit + (word & -word).bit_length() - 1
+        # קודם חלון קצר של מילים (אותות קרובים הם המקרה הנפוץ), ורק אז כל השאר
+        rest = np.flatnonzero(self.words[index + 1:index + 1 + NEXT_SET_WINDOW])
+        if not len(rest):
+            rest = np.flatnonzero(self.words[index + 1 + NEXT_SET_WINDOW:]) + NEXT_SET_WINDOW
+            if not len(rest):
+                return self.length
+        index += 1 + int(rest[0])
+        word = int(self.words[index])
+        return index * WORD_BITS + (word & -word).bit_length() - 1
+
+    def set_bits(self):
+        """אינדקסי כל הברים הדלוקים (כמו np.flatnonzero)"""
+        return np.flatnonzero(self.to_bool())
@@ -0,0 +1,275 @@
+"""
+Streaming Indicators
+אינדיקטורים מצטברים לבר-אחר-בר: update(bar) ב-O(1) אמורטייזד, מצב ניתן לסריאליזציה
+והתאמה לגרסאות ה-batch שב-indicators.py
+"""
+
+from collections import deque
+import math
+
+from rolling_extrema import RollingExtremaStream
+
+NAN = float('nan')
+
+# מרשם המחלקות לשחזור ממצב שמור
+STREAMING_INDICATORS = {}
+
+def streaming(cls):
+    """דקורטור לרישום מחלקה לשחזור ב-restore_indicator"""
+    STREAMING_INDICATORS[cls.__name__] = cls
+    return cls
+
+def _encode(value):
+    if isinstance(value, StreamingIndicator):
+        return {'__indicator__': value.state()}
+    if isinstance(value, RollingExtremaStream):
+        return {'__extrema__': value.state()}
+    if isinstance(value, RollingWindow):
+        return {'__window__': _encode(value.__dict__)}
+    if isinstance(value, deque):
+        return {'__deque__': [_encode(item) for item in value], 'maxlen': value.maxlen}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        if '__indicator__' in value:
+            return restore_indicator(value['__indicator__'])
+        if '__extrema__' in value:
+            return RollingExtremaStream.from_state(value['__extrema__'])
+        if '__window__' in value:
+            window = RollingWindow.__new__(RollingWindow)
+            window.__dict__.update(_decode(value['__window__']))
+            return window
+        if '__deque__' in value:
+            return deque((_decode(item) for item in value['__deque__']), value.get('maxlen'))
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+def restore_indicator(state):
+    """שחזור אינדיקטור ממצב שנשמר ב-state()"""
+    cls = STREAMING_INDICATORS[state['type']]
+    indicator = cls.__new__(cls)
+    indicator.__dict__.update(_decode(state['data']))
+    return indicator
+
+def _divide(numerator, denominator):
+    """חלוקה בסמנטיקה של pandas: x/0 -> ±inf, 0/0 -> NaN"""
+    if denominator == 0:
+        if numerator != numerator or numerator == 0:
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+class StreamingIndicator:
+    """בסיס: update(bar) מחזיר את הערך הנוכחי; state() מחזיר dict שניתן לשמור כ-JSON"""
+
+    value = NAN
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def state(self):
+        return {'type': type(self).__name__, 'data': _encode(self.__dict__)}
+
+    @classmethod
+    def from_state(cls, state):
+        return restore_indicator(state)
+
+class RollingWindow:
+    """חלון באורך קבוע עם סכום, סכום ריבועים ומונה NaN - כמו rolling(window) עם min_periods=window"""
+
+    def __init__(self, period):
+        self.period = period
+        self.values = deque()
+        self.total = 0.0
+        self.squares = 0.0
+        self.missing = 0
+
+    def push(self, value):
+        if value != value:
+            self.missing += 1
+        else:
+            self.total += value
+            self.squares += value * value
+        self.values.append(value)
+
+        if len(self.values) > self.period:
+            old = self.values.popleft()
+            if old != old:
+                self.missing -= 1
+            else:
+                self.total -= old
+                self.squares -= old * old
+
+    @property
+    def ready(self):
+        return len(self.values) == self.period and self.missing == 0
+
+    def mean(self):
+        return self.total / self.period if self.ready else NAN
+
+    def std(self, ddof=1):
+        if not self.ready or self.period <= ddof:
+            return NAN
+        variance = (self.squares - self.total * self.total / self.period) / (self.period - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+@streaming
+class StreamingSMA(StreamingIndicator):
+    """ממוצע נע פשוט - rolling(window=period).mean()"""
+
+    def __init__(self, period, field='close'):
+        self.period = period
+        self.field = field
+        self.window = RollingWindow(period)
+        self.value = NAN
+
+    def update(self, bar):
+        self.window.push(bar[self.field] if isinstance(bar, dict) else bar)
+        self.value = self.window.mean()
+        return self.value
+
+@streaming
+class StreamingEMA(StreamingIndicator):
+    """ewm(span=period).mean() עם adjust=True כמו ב-pandas"""
+
+    def __init__(self, period, field='close'):
+        self.period = period
+        self.field = field
+        self.decay = 1 - 2 / (period + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.value = NAN
+
+    def update(self, bar):
+        price = bar[self.field] if isinstance(bar, dict) else bar
+        self.numerator = price + self.decay * self.numerator
+        self.denominator = 1 + self.decay * self.denominator
+        self.value = self.numerator / self.denominator
+        return self.value
+
+@streaming
+class StreamingRSI(StreamingIndicator):
+    """RSI כמו ב-calculate_indicators (ממוצע פשוט של רווחים/הפסדים), או Wilder (wilder=True)"""
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self.prev_close = None
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self.value = NAN
+
+    def update(self, bar):
+        close = bar['close'] if isinstance(bar, dict) else bar
+        # הבר הראשון: delta=NaN -> 0 כמו delta.where(delta > 0, 0)
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.wilder:
+            # ewm(alpha=1/period, adjust=False) של הרווחים וההפסדים
+            alpha = 1 / self.period
+            if self.avg_gain != self.avg_gain:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += alpha * (gain - self.avg_gain)
+                self.avg_loss += alpha * (loss - self.avg_loss)
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        else:
+            self.gains.push(gain)
+            self.losses.push(loss)
+            avg_gain, avg_loss = self.gains.mean(), self.losses.mean()
+
+        self.value = _rsi_from_averages(avg_gain, avg_loss)
+        return self.value
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    """100 - 100 / (1 + gain/loss); הפסד 0 -> 100 (או NaN כששניהם 0) כמו ב-pandas"""
+    return 100 - (100 / (1 + _divide(avg_gain, avg_loss)))
+
+@streaming
+class StreamingBollinger(StreamingIndicator):
+    """פסי בולינגר: {'middle', 'upper', 'lower', 'position'}"""
+
+    def __init__(self, period=20, num_std=2):
+        self.period = period
+        self.num_std = num_std
+        self.window = RollingWindow(period)
+        self.value = {'middle': NAN, 'upper': NAN, 'lower': NAN, 'position': NAN}
+
+    def update(self, bar):
+        close = bar['close'] if isinstance(bar, dict) else bar
+        self.window.push(close)
+        middle = self.window.mean()
+        band = self.window.std() * self.num_std
+        upper = middle + band
+        lower = middle - band
+        width = upper - lower
+        position = _divide(close - lower, width)
+        self.value = {'middle': middle, 'upper': upper, 'lower': lower, 'position': position}
+        return self.value
+
+@streaming
+class StreamingStochastic(StreamingIndicator):
+    """%K ו-%D: min/max נע מ-deque מונוטוני, %D ממוצע של smooth ערכי %K"""
+
+    def __init__(self, period=14, smooth=3):
+        self.period = period
+        self.smooth = smooth
+        self.highs = RollingExtremaStream([period], 'max')
+        self.lows = RollingExtremaStream([period], 'min')
+        self.k_window = RollingWindow(smooth)
+        self.value = {'k': NAN, 'd': NAN}
+
+    def update(self, bar):
+        highest = self.highs.update(bar['high'])[self.period]
+        lowest = self.lows.update(bar['low'])[self.period]
+        k = _divide(100 * (bar['close'] - lowest), highest - lowest)
+        self.k_window.push(k)
+        d = self.k_window.mean()
+        self.value = {'k': k, 'd': d}
+        return self.value
+
+@streaming
+class StreamingATR(StreamingIndicator):
+    """ATR - ממוצע פשוט של ה-true range (בבר הראשון: high - low)"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.window = RollingWindow(period)
+        self.value = NAN
+
+    def update(self, bar):
+        true_range = bar['high'] - bar['low']
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(bar['high'] - self.prev_close), abs(bar['low'] - self.prev_close))
+        self.prev_close = bar['close']
+        self.window.push(true_range)
+        self.value = self.window.mean()
+        return self.value
+
+@streaming
+class StreamingVolumeRatio(StreamingIndicator):
+    """volume / ממוצע הנפח - כמו volume_ratio"""
+
+    def __init__(self, period=20):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.value = NAN
+
+    def update(self, bar):
+        volume = bar['volume']
+        self.window.push(volume)
+        self.value = _divide(volume, self.window.mean())
+        return self.value
@@ -0,0 +1,65 @@
+"""
+Threshold Index
+אינדקס דירוג ממוין לעמודת אינדיקטור: פרמוטציית argsort והערכים הממוינים.
+מספר הברים שעוברים סף הוא searchsorted אחד (O(log n)), והמסכה נבנית מפיזור הפרוסה המתאימה
+"""
+
+import numpy as np
+
+# פיזור אקראי עולה בערך פי 6 מהשוואה לבר - מעל השבר הזה לכל גבול, השוואה ישירה זולה יותר
+SCATTER_FRACTION = 0.15
+
+class ThresholdIndex:
+    """low < values < high לכל סף, מעמודה אחת שמויינה פעם אחת.
+
+    NaN ממוין לסוף ולא עובר אף סף - כמו השוואה רגילה.
+    """
+
+    def __init__(self, values, order=None, sorted_values=None):
+        """order / sorted_values - אינדקס שכבר נבנה (למשל views מזיכרון משותף), בלי argsort"""
+        self.values = np.asarray(values, dtype=np.float64)
+        self.length = len(self.values)
+        self.order = np.argsort(self.values, kind='stable') if order is None else order
+        self.sorted = self.values[self.order] if sorted_values is None else sorted_values
+        self.valid = self.length - int(np.count_nonzero(np.isnan(self.sorted)))
+
+    def span(self, low=None, high=None):
+        """טווח [start, stop) בסדר הממוין של הברים עם low < value < high"""
+        sorted_valid = self.sorted[:self.valid]
+        start = int(np.searchsorted(sorted_valid, low, side='right')) if low is not None else 0
+        stop = int(np.searchsorted(sorted_valid, high, side='left')) if high is not None else self.valid
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None):
+        """מספר הברים שעוברים את הסף - בלי לבנות מסכה"""
+        start, stop = self.span(low, high)
+        return stop - start
+
+    def mask(self, low=None, high=None):
+        """מסכה בוליאנית חדשה של low < value < high"""
+        start, stop = self.span(low, high)
+        bounds = (low is not None) + (high is not None)
+        limit = SCATTER_FRACTION * bounds * self.length
+        selected = stop - start
+
+        if selected <= limit:
+            mask = np.zeros(self.length, dtype=bool)
+            mask[self.order[start:stop]] = True
+        elif self.length - selected <= limit:
+            # פיזור המשלים - כולל ה-NaN שבסוף הסדר
+            mask = np.ones(self.length, dtype=bool)
+            mask[self.order[:start]] = False
+            mask[self.order[stop:]] = False
+        elif high is None:
+            mask = self.values > low
+        elif low is None:
+            mask = self.values < high
+        else:
+            mask = (self.values > low) & (self.values < high)
+        return mask
+
+    def above(self, threshold):
+        return self.mask(low=threshold)
+
+    def below(self, threshold):
+        return self.mask(high=threshold)
@@ -0,0 +1,125 @@
+"""
+Trade Ledger
+יומן עסקאות על מערך NumPy מובנה - עמודה לכל שדה במקום מילון לכל עסקה,
+כך שכל מדד הוא רדוקציה וקטורית. תצוגת מילונים נשמרת רק לייצוא JSON
+"""
+
+import numpy as np
+
+from trade_metrics import trade_metrics
+
+POINT_VALUE = 20000
+
+# סדר הבדיקה זהה לסדר ב-AutonomousStrategyHunter.backtest_strategy
+EXIT_REASONS = [
+    'profit_target',
+    'stop_loss',
+    'time_exit',
+    'rsi_exit',
+    'trend_exit',
+    'resistance_exit'
+]
+
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('pnl', np.float64),
+    ('return', np.float64),
+    ('bars_held', np.int64),
+    ('exit_reason', np.int8)
+])
+
+class TradeLedger:
+    """עסקאות כמערך TRADE_DTYPE.
+
+    exit_reason הוא קוד לתוך reasons (1- אם אין סיבה); index הוא אינדקס הזמן של הנתונים,
+    ממנו נגזרים זמני הכניסה והיציאה רק כשמבקשים אותם.
+    המדדים (trade_metrics) מחושבים פעם אחת ונשמרים על היומן - גם במטמון ה-fitness.
+    pruned: סיבת הפסילה אם ה-DNA לא הגיע ל-backtest (היומן ריק), אחרת None.
+    """
+
+    def __init__(self, records=None, index=None, reasons=EXIT_REASONS):
+        self.records = records if records is not None else np.zeros(0, dtype=TRADE_DTYPE)
+        self.index = index
+        self.reasons = reasons
+        self.pruned = None
+        self._metrics = None
+
+    @classmethod
+    def from_columns(cls, entry_idx, exit_idx, entry_price, exit_price, exit_reason=None,
+                     bars_held=None, index=None, reasons=EXIT_REASONS, point_value=POINT_VALUE):
+        """בניית יומן מעמודות - התשואה וה-P&L מחושבים וקטורית"""
+        records = np.zeros(len(entry_idx), dtype=TRADE_DTYPE)
+        records['entry_idx'] = entry_idx
+        records['exit_idx'] = exit_idx
+        records['entry_price'] = entry_price
+        records['exit_price'] = exit_price
+        records['return'] = (records['exit_price'] - records['entry_price']) / records['entry_price']
+        records['pnl'] = records['return'] * point_value
+        records['bars_held'] = bars_held if bars_held is not None else records['exit_idx'] - records['entry_idx']
+        records['exit_reason'] = exit_reason if exit_reason is not None else -1
+        return cls(records, index, reasons)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def pnl(self):
+        return self.records['pnl']
+
+    @property
+    def returns(self):
+        return self.records['return']
+
+    @property
+    def bars_held(self):
+        return self.records['bars_held']
+
+    @property
+    def exit_reason(self):
+        return self.records['exit_reason']
+
+    @property
+    def entry_idx(self):
+        return self.records['entry_idx']
+
+    @property
+    def exit_idx(self):
+        return self.records['exit_idx']
+
+    def exit_times(self):
+        """זמני היציאה מתוך אינדקס הנתונים"""
+        return self.index[self.records['exit_idx']]
+
+    def metrics(self):
+        """כל מדדי ההערכה של היומן - מחושבים בפעם הראשונה בלבד"""
+        if self._metrics is None:
+            exit_times = self.exit_times() if self.index is not None else None
+            self._metrics = trade_metrics(self.records['pnl'], exit_times)
+        return self._metrics
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.records[key]
+        if isinstance(key, slice):
+            return TradeLedger(self.records[key], self.index, self.reasons)
+        return TradeLedger(self.records[[key]], self.index, self.reasons).to_dicts()[0]
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def _column(self, name):
+        if name in ('entry_time', 'exit_time'):
+            return list(self.index[self.records[name.replace('time', 'idx')]])
+        if name == 'exit_reason':
+            return [self.reasons[code] if self.reasons is not None and code >= 0 else None
+                    for code in self.records['exit_reason'].tolist()]
+        return self.records[name].tolist()
+
+    def to_dicts(self, fields=None):
+        """רשימת מילונים בטיפוסי Python (exit_reason בשמו) - לייצוא JSON ולהשוואות"""
+        names = fields or TRADE_DTYPE.names
+        columns = [self._column(name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
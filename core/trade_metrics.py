@@ -0,0 +1,80 @@
+"""
+Trade Metrics
+כל מדדי ההערכה ממערך P&L של עסקאות במעבר וקטורי אחד -
+משותף ל-evaluate_fitness, check_winning_criteria ולכל מחלקות החיפוש
+"""
+
+import numpy as np
+
+INITIAL_CAPITAL = 100000
+
+# קנה מידה ל-Sharpe: לעסקה, "יומי" (252) ו"שעתי" (252*24) כמו במחלקות השונות
+SHARPE_SCALES = {
+    'sharpe_per_trade': 1.0,
+    'sharpe_daily': np.sqrt(252),
+    'sharpe_hourly': np.sqrt(252 * 24)
+}
+
+def max_run_length(mask):
+    """אורך הרצף הארוך ביותר של אמת - run-length encoding על קצוות הרצפים"""
+    mask = np.asarray(mask, dtype=np.int8)
+    if not len(mask):
+        return 0
+    edges = np.diff(np.concatenate(([0], mask, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max()) if len(starts) else 0
+
+def monthly_totals(pnl, exit_times):
+    """סכום P&L לכל חודש יציאה ('YYYY-MM') בסדר כרונולוגי"""
+    months = np.asarray(exit_times.year * 12 + exit_times.month - 1, dtype=np.int64)
+    keys, inverse = np.unique(months, return_inverse=True)
+    # bincount מצטבר לפי סדר העסקאות - אותו סכום כמו לולאה על העסקאות
+    totals = np.bincount(inverse, weights=pnl, minlength=len(keys))
+    return {f'{key // 12:04d}-{key % 12 + 1:02d}': total for key, total in zip(keys.tolist(), totals.tolist())}
+
+def trade_metrics(pnl, exit_times=None):
+    """כל המדדים של סדרת עסקאות; exit_times (DatetimeIndex) מוסיף רווח חודשי"""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    num_trades = len(pnl)
+    wins = pnl > 0
+    losses = pnl < 0
+
+    num_wins = int(wins.sum())
+    num_losses = int(losses.sum())
+    total_return = pnl.sum()
+    gross_profit = pnl[wins].sum()
+    gross_loss = abs(pnl[losses].sum())
+
+    avg_trade = total_return / num_trades if num_trades else 0
+    avg_win = gross_profit / num_wins if num_wins else 0
+    avg_loss = gross_loss / num_losses if num_losses else 0
+    pnl_std = pnl.std() if num_trades else 0
+
+    equity_curve = np.cumsum(pnl) + INITIAL_CAPITAL
+    drawdown = equity_curve - np.maximum.accumulate(equity_curve)
+
+    metrics = {
+        'num_trades': num_trades,
+        'num_wins': num_wins,
+        'num_losses': num_losses,
+        'total_return': total_return,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'win_rate': num_wins / num_trades if num_trades else 0,
+        'avg_trade': avg_trade,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0,
+        'win_loss_ratio': avg_win / avg_loss if avg_loss > 0 else 0,
+        'pnl_std': pnl_std,
+        'max_drawdown': drawdown.min() if num_trades else 0,
+        'max_consecutive_losses': max_run_length(losses)
+    }
+    for name, scale in SHARPE_SCALES.items():
+        metrics[name] = (avg_trade / pnl_std) * scale if pnl_std > 0 else 0
+
+    if exit_times is not None:
+        metrics['monthly_profits'] = monthly_totals(pnl, exit_times)
+
+    return metrics
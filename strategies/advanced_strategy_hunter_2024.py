@@ -6,9 +6,18 @@ Advanced Strategy Hunter 2024
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from indicators import IndicatorLibrary
+from indicator_batch import rsi_family, bollinger_family
+from trade_ledger import TradeLedger
+
 class AdvancedStrategyHunter:
     def __init__(self):
         self.df = None
@@ -19,12 +28,8 @@ class AdvancedStrategyHunter:
         print("📊 טוען נתוני NQ לשנת 2024...")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ נטענו {len(self.df_2024):,} נקודות נתונים מ-2024")
             print(f"📅 תקופה: {self.df_2024.index.min()} עד {self.df_2024.index.max()}")
@@ -38,49 +43,45 @@ class AdvancedStrategyHunter:
     def calculate_advanced_indicators(self, df):
         """חישוב אינדיקטורים מתקדמים"""
         print("📊 מחשב אינדיקטורים מתקדמים...")
+        ind = IndicatorLibrary(df)
         
         # Basic indicators
-        df['returns'] = df['close'].pct_change()
+        df['returns'] = ind.get('returns')
         df['hl2'] = (df['high'] + df['low']) / 2
         df['hlc3'] = (df['high'] + df['low'] + df['close']) / 3
         df['ohlc4'] = (df['open'] + df['high'] + df['low'] + df['close']) / 4
         
         # Moving Averages - multiple timeframes
         for period in [5, 8, 12, 13, 21, 26, 34, 55, 89, 144]:
-            df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+            df[f'sma_{period}'] = ind.get('sma', period=period)
+            df[f'ema_{period}'] = ind.get('ema', period=period)
         
         # RSI with different periods
         for period in [14, 21, 28]:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            df[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+            df[f'rsi_{period}'] = ind.get('rsi', period=period)
         
         # MACD variants
-        df['macd_12_26'] = df['ema_12'] - df['ema_26']
-        df['macd_signal_12_26'] = df['macd_12_26'].ewm(span=9).mean()
-        df['macd_hist_12_26'] = df['macd_12_26'] - df['macd_signal_12_26']
+        df['macd_12_26'] = ind.get('macd', fast=12, slow=26)
+        df['macd_signal_12_26'] = ind.get('macd_signal', fast=12, slow=26, signal=9)
+        df['macd_hist_12_26'] = ind.get('macd_hist', fast=12, slow=26, signal=9)
         
         # Bollinger Bands
         for period in [20, 50]:
-            df[f'bb_middle_{period}'] = df['close'].rolling(window=period).mean()
-            bb_std = df['close'].rolling(window=period).std()
-            df[f'bb_upper_{period}'] = df[f'bb_middle_{period}'] + (bb_std * 2)
-            df[f'bb_lower_{period}'] = df[f'bb_middle_{period}'] - (bb_std * 2)
-            df[f'bb_width_{period}'] = df[f'bb_upper_{period}'] - df[f'bb_lower_{period}']
-            df[f'bb_position_{period}'] = (df['close'] - df[f'bb_lower_{period}']) / df[f'bb_width_{period}']
+            df[f'bb_middle_{period}'] = ind.get('bb_middle', period=period)
+            df[f'bb_upper_{period}'] = ind.get('bb_upper', period=period, num_std=2)
+            df[f'bb_lower_{period}'] = ind.get('bb_lower', period=period, num_std=2)
+            df[f'bb_width_{period}'] = ind.get('bb_width', period=period, num_std=2)
+            df[f'bb_position_{period}'] = ind.get('bb_position', period=period, num_std=2)
         
         # Stochastic
-        df['lowest_low_14'] = df['low'].rolling(window=14).min()
-        df['highest_high_14'] = df['high'].rolling(window=14).max()
-        df['stoch_k'] = 100 * (df['close'] - df['lowest_low_14']) / (df['highest_high_14'] - df['lowest_low_14'])
-        df['stoch_d'] = df['stoch_k'].rolling(window=3).mean()
+        df['lowest_low_14'] = ind.get('rolling_min', period=14)
+        df['highest_high_14'] = ind.get('rolling_max', period=14)
+        df['stoch_k'] = ind.get('stoch_k', period=14)
+        df['stoch_d'] = ind.get('stoch_d', period=14, smooth=3)
         
         # Volume indicators
-        df['volume_ma_20'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma_20']
+        df['volume_ma_20'] = ind.get('volume_ma', period=20)
+        df['volume_ratio'] = ind.get('volume_ratio', period=20)
         df['volume_spike'] = df['volume_ratio'] > 1.5
         
         # Price action indicators
@@ -103,8 +104,8 @@ class AdvancedStrategyHunter:
         df['trend_strength_20'] = df['close'].rolling(window=20).apply(lambda x: (x.iloc[-1] - x.iloc[0]) / x.iloc[0])
         
         # Support/Resistance levels
-        df['resistance_20'] = df['high'].rolling(window=20).max()
-        df['support_20'] = df['low'].rolling(window=20).min()
+        df['resistance_20'] = ind.get('rolling_max', period=20)
+        df['support_20'] = ind.get('rolling_min', period=20)
         df['distance_to_resistance'] = (df['resistance_20'] - df['close']) / df['close']
         df['distance_to_support'] = (df['close'] - df['support_20']) / df['close']
         
@@ -114,19 +115,24 @@ class AdvancedStrategyHunter:
         """Backtesting מתקדם עם ביצוע realistic"""
         print(f"🧪 מבצע backtesting מתקדם עבור {strategy_name}...")
         
-        # Initialize
-        df = df.copy()
-        df['signal'] = 0
-        df['position'] = 0
-        df['entry_price'] = 0
-        df['exit_price'] = 0
-        df['trade_return'] = 0
-        df['cumulative_return'] = 0
-        df['drawdown'] = 0
+        # Initialize - עמודות המעקב כמערכים בצד במקום עותק של df
+        tracking = {
+            'signal': np.zeros(len(df), dtype=np.int8),
+            'position': np.zeros(len(df), dtype=np.int8),
+            'entry_price': np.zeros(len(df)),
+            'exit_price': np.zeros(len(df)),
+            'trade_return': np.zeros(len(df)),
+            'cumulative_return': np.zeros(len(df)),
+            'drawdown': np.zeros(len(df))
+        }
         
         position = 0
         entry_price = 0
-        trades = []
+        entry_bar = 0
+        entry_bars = []
+        exit_bars = []
+        exit_prices = []
+        realized_pnl = 0
         equity_curve = []
         current_equity = 100000  # starting capital
         peak_equity = 100000
@@ -140,9 +146,10 @@ class AdvancedStrategyHunter:
                 if i < len(df) - 1:  # Make sure we have next bar
                     position = 1
                     entry_price = current_bar['open']  # Execute on current open (next bar after signal)
-                    df.iloc[i, df.columns.get_loc('signal')] = 1
-                    df.iloc[i, df.columns.get_loc('position')] = 1
-                    df.iloc[i, df.columns.get_loc('entry_price')] = entry_price
+                    entry_bar = i
+                    tracking['signal'][i] = 1
+                    tracking['position'][i] = 1
+                    tracking['entry_price'][i] = entry_price
             
             # Exit logic (signal on close, execute on next open)
             elif position == 1 and exit_signals.iloc[i-1]:
@@ -154,36 +161,31 @@ class AdvancedStrategyHunter:
                     trade_pnl = trade_return * 20000  # NQ point value
                     
                     # Record trade
-                    trades.append({
-                        'entry_time': df.index[i-1],
-                        'exit_time': df.index[i],
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'return': trade_return,
-                        'pnl': trade_pnl,
-                        'bars_held': 1
-                    })
+                    entry_bars.append(entry_bar)
+                    exit_bars.append(i)
+                    exit_prices.append(exit_price)
                     
                     # Update equity
                     current_equity += trade_pnl
+                    realized_pnl += trade_pnl
                     peak_equity = max(peak_equity, current_equity)
                     
-                    # Update dataframe
-                    df.iloc[i, df.columns.get_loc('signal')] = -1
-                    df.iloc[i, df.columns.get_loc('position')] = 0
-                    df.iloc[i, df.columns.get_loc('exit_price')] = exit_price
-                    df.iloc[i, df.columns.get_loc('trade_return')] = trade_return
+                    # Update tracking
+                    tracking['signal'][i] = -1
+                    tracking['position'][i] = 0
+                    tracking['exit_price'][i] = exit_price
+                    tracking['trade_return'][i] = trade_return
                     
                     position = 0
                     entry_price = 0
             
             # Update position
-            df.iloc[i, df.columns.get_loc('position')] = position
+            tracking['position'][i] = position
             
             # Update equity curve
             if position == 1:
                 unrealized_pnl = (current_bar['close'] - entry_price) / entry_price * 20000
-                current_unrealized_equity = 100000 + sum([t['pnl'] for t in trades]) + unrealized_pnl
+                current_unrealized_equity = 100000 + realized_pnl + unrealized_pnl
             else:
                 current_unrealized_equity = current_equity
             
@@ -192,25 +194,20 @@ class AdvancedStrategyHunter:
             # Update drawdown
             peak_equity = max(peak_equity, current_unrealized_equity)
             drawdown = current_unrealized_equity - peak_equity
-            df.iloc[i, df.columns.get_loc('drawdown')] = drawdown
+            tracking['drawdown'][i] = drawdown
         
         # Close final position if still open
         if position == 1 and len(df) > 1:
-            exit_price = df.iloc[-1]['close']
-            trade_return = (exit_price - entry_price) / entry_price
-            trade_pnl = trade_return * 20000
-            
-            trades.append({
-                'entry_time': df.index[-2],
-                'exit_time': df.index[-1],
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'return': trade_return,
-                'pnl': trade_pnl,
-                'bars_held': 1
-            })
-        
-        return df, trades, equity_curve
+            entry_bars.append(entry_bar)
+            exit_bars.append(len(df) - 1)
+            exit_prices.append(df.iloc[-1]['close'])
+        
+        trades = TradeLedger.from_columns(
+            entry_bars, exit_bars, df['open'].to_numpy()[entry_bars], exit_prices,
+            bars_held=1, index=df.index, reasons=None
+        )
+        
+        return tracking, trades, equity_curve
     
     def evaluate_strategy(self, trades, equity_curve, strategy_name):
         """הערכת ביצועי אסטרטגיה לפי הקריטריונים"""
@@ -219,46 +216,20 @@ class AdvancedStrategyHunter:
             return None  # לא עומד בקריטריון מספר עסקאות
         
         # חישוב מדדים בסיסיים
-        trade_returns = [t['pnl'] for t in trades]
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
-        
-        total_return = sum(trade_returns)
-        num_trades = len(trades)
-        win_rate = len(winning_trades) / num_trades if num_trades > 0 else 0
-        avg_trade = total_return / num_trades if num_trades > 0 else 0
+        metrics = trades.metrics()
         
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-        
-        # Win/Loss ratio
-        avg_win = gross_profit / len(winning_trades) if len(winning_trades) > 0 else 0
-        avg_loss = gross_loss / len(losing_trades) if len(losing_trades) > 0 else 0
-        win_loss_ratio = avg_win / avg_loss if avg_loss > 0 else 0
+        total_return = metrics['total_return']
+        num_trades = metrics['num_trades']
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_daily']
+        max_consecutive_losses = metrics['max_consecutive_losses']
         
         # Drawdown
         max_drawdown = min(equity_curve) - max(equity_curve) if equity_curve else 0
         
-        # Sharpe Ratio
-        if len(trade_returns) > 1:
-            returns_mean = np.mean(trade_returns)
-            returns_std = np.std(trade_returns)
-            sharpe = returns_mean / returns_std * np.sqrt(252) if returns_std > 0 else 0
-        else:
-            sharpe = 0
-        
-        # רצף הפסדים
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
-        
         # בדיקת קריטריונים
         criteria_met = {
             'min_trades': num_trades >= 200,
@@ -287,23 +258,11 @@ class AdvancedStrategyHunter:
             'max_consecutive_losses': max_consecutive_losses,
             'criteria_met': criteria_met,
             'all_criteria_met': all_criteria_met,
-            'monthly_profits': self.calculate_monthly_profits(trades)
+            'monthly_profits': metrics['monthly_profits']
         }
         
         return result
     
-    def calculate_monthly_profits(self, trades):
-        """חישוב רווחים חודשיים"""
-        monthly_profits = {}
-        
-        for trade in trades:
-            month = trade['exit_time'].strftime('%Y-%m')
-            if month not in monthly_profits:
-                monthly_profits[month] = 0
-            monthly_profits[month] += trade['pnl']
-        
-        return monthly_profits
-    
     def strategy_advanced_rsi_momentum(self, df):
         """אסטרטגיית RSI מתקדמת עם מומנטום"""
         
@@ -502,7 +461,7 @@ class AdvancedStrategyHunter:
                 entry_signals, exit_signals = strategy_func(self.df_2024)
                 
                 # Backtesting
-                df_result, trades, equity_curve = self.realistic_backtest(
+                tracking, trades, equity_curve = self.realistic_backtest(
                     self.df_2024, entry_signals, exit_signals, name
                 )
                 
@@ -554,48 +513,42 @@ class AdvancedStrategyHunter:
         best_strategy = None
         best_score = 0
         
+        # כל משפחת פרמטרים מחושבת פעם אחת כמערך (פרמטרים × ברים)
+        # float64 - מעט שורות, וההשוואות לספים נשארות כמו בחישוב per-period
+        df = self.df_2024
+        close = df['close'].to_numpy()
+        rsi = rsi_family(close, rsi_periods, dtype=np.float64)
+        bb = bollinger_family(close, bb_periods, dtype=np.float64)
+        
+        # תנאים שלא תלויים בפרמטרים
+        volume_ratio = df['volume_ratio'].to_numpy()
+        trend_up = (df['ema_13'] > df['ema_21']).to_numpy()
+        trend_down = (df['ema_13'] < df['ema_21']).to_numpy()
+        session = (df['is_market_open'] & df['hour'].isin([9, 10, 11, 13, 14])).to_numpy()
+        
         for rsi_period in rsi_periods:
+            rsi_row = rsi[rsi_period]
+            rsi_entry = (rsi_row < 38) & (rsi_row > 28)
+            rsi_exit = rsi_row > 68
+            
             for bb_period in bb_periods:
+                band_entry = (close > bb['lower'][bb_period]) & (close < bb['middle'][bb_period])
+                band_exit = close > bb['upper'][bb_period]
+                
                 for vol_threshold in volume_thresholds:
                     
                     try:
-                        # חישוב אינדיקטורים עם פרמטרים מותאמים
-                        df_test = self.df_2024.copy()
-                        
-                        # RSI מותאם
-                        delta = df_test['close'].diff()
-                        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-                        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-                        rs = gain / loss
-                        df_test['rsi_custom'] = 100 - (100 / (1 + rs))
-                        
-                        # BB מותאם
-                        df_test['bb_middle_custom'] = df_test['close'].rolling(window=bb_period).mean()
-                        bb_std = df_test['close'].rolling(window=bb_period).std()
-                        df_test['bb_upper_custom'] = df_test['bb_middle_custom'] + (bb_std * 2)
-                        df_test['bb_lower_custom'] = df_test['bb_middle_custom'] - (bb_std * 2)
-                        
-                        # אסטרטגיה מותאמת
-                        entry_conditions = (
-                            (df_test['rsi_custom'] < 38) &
-                            (df_test['rsi_custom'] > 28) &
-                            (df_test['close'] > df_test['bb_lower_custom']) &
-                            (df_test['close'] < df_test['bb_middle_custom']) &
-                            (df_test['volume_ratio'] > vol_threshold) &
-                            (df_test['ema_13'] > df_test['ema_21']) &
-                            (df_test['is_market_open']) &
-                            (df_test['hour'].isin([9, 10, 11, 13, 14]))
+                        # אסטרטגיה מותאמת - שורות מהמשפחות במקום חישוב מחדש
+                        entry_conditions = pd.Series(
+                            rsi_entry & band_entry & (volume_ratio > vol_threshold) & trend_up & session,
+                            index=df.index
                         )
                         
-                        exit_conditions = (
-                            (df_test['rsi_custom'] > 68) |
-                            (df_test['close'] > df_test['bb_upper_custom']) |
-                            (df_test['ema_13'] < df_test['ema_21'])
-                        )
+                        exit_conditions = pd.Series(rsi_exit | band_exit | trend_down, index=df.index)
                         
                         # Backtesting
-                        df_result, trades, equity_curve = self.realistic_backtest(
-                            df_test, entry_conditions, exit_conditions, 
+                        tracking, trades, equity_curve = self.realistic_backtest(
+                            df, entry_conditions, exit_conditions, 
                             f"Optimized RSI{rsi_period}_BB{bb_period}_Vol{vol_threshold}"
                         )
                         
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark First Passage - בדיקת זהות ומהירות של אינדקס החצייה הראשונה
+משווה את FirstPassageIndex לסריקה בר-אחר-בר על שאילתות יעד/סטופ אקראיות
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'autonomous'))
+
+from first_passage import FirstPassageIndex
+from bar_feed import make_synthetic_bars
+
+def linear_crossing(prices, start, stop, upper, lower, strict):
+    """הלולאה המקורית: בדיקת כל בר עד החצייה"""
+    for j in range(start, min(stop, len(prices))):
+        if (prices[j] > upper or prices[j] < lower) if strict else (prices[j] >= upper or prices[j] <= lower):
+            return j
+    return None
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='First-passage index parity & speed benchmark')
+    parser.add_argument('--bars', type=int, default=355000)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("🎯 Benchmark First Passage")
+    print("=" * 60)
+
+    prices = make_synthetic_bars(args.bars)['open'].to_numpy()
+    rng = np.random.default_rng(args.seed)
+
+    start = time.perf_counter()
+    index = FirstPassageIndex(prices)
+    build_time = time.perf_counter() - start
+
+    # יעדים וסטופים בטווח של ה-DNA (0.2%-2%), חלק בלי סטופ או בלי יעד
+    starts = rng.integers(0, args.bars, args.queries)
+    targets = rng.uniform(0.002, 0.02, args.queries)
+    stops = rng.uniform(0.002, 0.02, args.queries)
+    kinds = rng.integers(0, 3, args.queries)
+    queries = []
+    for s, target, stop, kind in zip(starts.tolist(), targets.tolist(), stops.tolist(), kinds.tolist()):
+        upper = prices[s] * (1 + target) if kind != 1 else np.inf
+        lower = prices[s] * (1 - stop) if kind != 2 else -np.inf
+        queries.append((s, args.bars, upper, lower, bool(s % 2)))
+
+    price_list = prices.tolist()
+    start = time.perf_counter()
+    expected = [linear_crossing(price_list, *query) for query in queries]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [index.first_crossing(*query) for query in queries]
+    index_time = time.perf_counter() - start
+
+    mismatches = sum(1 for e, a in zip(expected, actual) if e != a)
+    held = [(e if e is not None else args.bars) - q[0] for e, q in zip(expected, queries)]
+    print(f"✅ {args.queries - mismatches:,}/{args.queries:,} שאילתות זהות "
+          f"(חצייה אחרי {np.median(held):.0f} ברים בחציון)")
+    print(f"⏱️  בנייה: {build_time * 1000:.0f}ms | סריקה: {linear_time / args.queries * 1e6:.1f}µs לשאילתה | "
+          f"אינדקס: {index_time / args.queries * 1e6:.1f}µs לשאילתה | האצה: x{linear_time / index_time:.1f}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark Indicator Batch - בדיקת זהות ומהירות של משפחות אינדיקטורים
+משווה RSI / Bollinger לכל תקופה ב-pandas מול מעבר אחד לכל משפחה,
+ובודק את דיוק סטיית התקן (float64) על מחירים לא מעוגלים מול חישוב דו-מעברי
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'autonomous'))
+
+from indicator_batch import rsi_family, bollinger_family, rolling_std_family
+from bar_feed import make_synthetic_bars
+
+def pandas_rsi(close, period):
+    """RSI לתקופה אחת כמו בלולאה המקורית"""
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def pandas_bollinger(close, period):
+    """(middle, upper, lower) לתקופה אחת כמו בלולאה המקורית"""
+    middle = close.rolling(window=period).mean()
+    std = close.rolling(window=period).std()
+    return middle, middle + (std * 2), middle - (std * 2)
+
+def max_error(expected, actual):
+    """סטייה מקסימלית והתאמת מיקומי NaN"""
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    same_nan = np.array_equal(np.isnan(expected), np.isnan(actual))
+    valid = ~np.isnan(expected)
+    error = float(np.max(np.abs(expected[valid] - actual[valid]))) if valid.any() else 0.0
+    return error, same_nan
+
+def check_std_precision(num_bars, periods, tolerance):
+    """סטיית תקן float64 על הליכה אקראית סביב 17,000 בלי עיגול לטיק - מול std דו-מעברי מדויק"""
+    rng = np.random.default_rng(1)
+    values = 17000 + np.cumsum(rng.normal(0, 4, num_bars))
+    family = rolling_std_family(values, periods, dtype=np.float64)
+
+    worst = 0.0
+    for period in periods:
+        exact = sliding_window_view(values, period).std(axis=1, ddof=1)
+        worst = max(worst, float(np.max(np.abs(family[period][period - 1:] - exact))))
+    print(f"🎯 std {periods[0]}..{periods[-1]} על מחירים לא מעוגלים: סטייה מקסימלית {worst:.2e}")
+    return worst <= tolerance
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Batched indicator family benchmark')
+    parser.add_argument('--bars', type=int, default=355000)
+    parser.add_argument('--tolerance', type=float, default=1e-2,
+                        help='סטייה מותרת (float32 על מחירי NQ)')
+    parser.add_argument('--std-tolerance', type=float, default=1e-4,
+                        help='סטייה מותרת ל-std ב-float64 מול חישוב דו-מעברי')
+    args = parser.parse_args()
+
+    print("📐 Benchmark Indicator Batch")
+    print("=" * 60)
+
+    close = make_synthetic_bars(args.bars)['close']
+    rsi_periods = list(range(2, 51))
+    bb_periods = list(range(10, 51))
+    ok = True
+
+    start = time.perf_counter()
+    expected_rsi = [pandas_rsi(close, period) for period in rsi_periods]
+    expected_bb = [pandas_bollinger(close, period) for period in bb_periods]
+    pandas_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rsi = rsi_family(close.to_numpy(), rsi_periods)
+    bb = bollinger_family(close.to_numpy(), bb_periods)
+    batch_time = time.perf_counter() - start
+
+    worst = 0.0
+    for period, expected in zip(rsi_periods, expected_rsi):
+        error, same_nan = max_error(expected, rsi[period])
+        worst = max(worst, error)
+        ok &= same_nan and error <= args.tolerance
+    print(f"🔍 RSI {rsi_periods[0]}..{rsi_periods[-1]}: סטייה מקסימלית {worst:.2e}")
+
+    worst = 0.0
+    for period, (middle, upper, lower) in zip(bb_periods, expected_bb):
+        for key, expected in (('middle', middle), ('upper', upper), ('lower', lower)):
+            error, same_nan = max_error(expected, bb[key][period])
+            worst = max(worst, error)
+            ok &= same_nan and error <= args.tolerance
+    print(f"🔍 BB {bb_periods[0]}..{bb_periods[-1]}: סטייה מקסימלית {worst:.2e}")
+
+    ok &= check_std_precision(args.bars, [2, 5, 10, 20, 50], args.std_tolerance)
+
+    size_mb = (rsi.nbytes + sum(family.nbytes for family in bb.values())) / 1e6
+    print(f"⏱️  {args.bars:,} ברים | pandas לכל תקופה: {pandas_time:.2f}s | "
+          f"משפחות: {batch_time:.2f}s | האצה: x{pandas_time / batch_time:.1f} | {size_mb:.0f}MB")
+    print("✅ זהות בטווח הסבולת" if ok else "❌ סטייה מעבר לסבולת")
+
+    if not ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
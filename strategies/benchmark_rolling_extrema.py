@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark Rolling Extrema - בדיקת זהות ומהירות של מינימום/מקסימום נע
+משווה את טבלת הקיצון וה-deque המונוטוני ל-rolling().max()/min() של pandas
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'autonomous'))
+
+from rolling_extrema import ExtremaTable, RollingExtremaStream
+from bar_feed import make_synthetic_bars
+
+WINDOWS = [3, 5, 10, 14, 20, 21, 30, 50, 100, 200]
+
+def check_table(series, kind):
+    """טבלת הקיצון מול pandas לכל החלונות (כולל NaN)"""
+    table = ExtremaTable(series.to_numpy(), kind)
+    mismatches = 0
+    for window in WINDOWS:
+        expected = getattr(series.rolling(window=window), kind)().to_numpy()
+        if not np.array_equal(expected, table.window(window), equal_nan=True):
+            mismatches += 1
+            print(f"❌ {kind} {window}: אי-התאמה")
+    return mismatches
+
+def check_stream(series, kind, num_bars):
+    """ה-deque המונוטוני מול pandas על תחילת הסדרה"""
+    series = series.iloc[:num_bars]
+    stream = RollingExtremaStream(WINDOWS, kind)
+    results = {window: np.empty(num_bars) for window in WINDOWS}
+    for i, value in enumerate(series.to_numpy()):
+        for window, extreme in stream.update(value).items():
+            results[window][i] = extreme
+
+    mismatches = 0
+    for window in WINDOWS:
+        expected = getattr(series.rolling(window=window), kind)().to_numpy()
+        if not np.array_equal(expected, results[window], equal_nan=True):
+            mismatches += 1
+            print(f"❌ stream {kind} {window}: אי-התאמה")
+    return mismatches
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Rolling extrema parity & speed benchmark')
+    parser.add_argument('--bars', type=int, default=355000)
+    parser.add_argument('--stream-bars', type=int, default=20000)
+    args = parser.parse_args()
+
+    print("📏 Benchmark Rolling Extrema")
+    print("=" * 60)
+
+    bars = make_synthetic_bars(args.bars)
+    high = bars['high'].copy()
+    low = bars['low'].copy()
+    # חורים בנתונים - NaN פוסל כל חלון שמכיל אותו
+    high.iloc[[5, 1000, 1001, len(high) // 2]] = np.nan
+    low.iloc[[7, 2000, len(low) // 3]] = np.nan
+
+    mismatches = check_table(high, 'max') + check_table(low, 'min')
+    mismatches += check_stream(high, 'max', args.stream_bars) + check_stream(low, 'min', args.stream_bars)
+    print(f"✅ {len(WINDOWS)} חלונות × max/min × טבלה/stream - {mismatches} אי-התאמות")
+
+    start = time.perf_counter()
+    for window in WINDOWS:
+        high.rolling(window=window).max()
+        low.rolling(window=window).min()
+    pandas_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tables = [ExtremaTable(high.to_numpy(), 'max'), ExtremaTable(low.to_numpy(), 'min')]
+    for table in tables:
+        table.windows(WINDOWS)
+    table_time = time.perf_counter() - start
+
+    print(f"⏱️  {args.bars:,} ברים, {len(WINDOWS)} חלונות | pandas: {pandas_time * 1000:.0f}ms | "
+          f"טבלה: {table_time * 1000:.0f}ms | האצה: x{pandas_time / table_time:.1f}")
+    print(f"💾 זיכרון הטבלאות: {sum(table.nbytes for table in tables) / 1e6:.1f}MB "
+          f"({len(tables[0].levels)} levels לכל עמודה)")
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
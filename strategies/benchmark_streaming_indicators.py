@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark Streaming Indicators - בדיקת זהות ומהירות של אינדיקטורים בר-אחר-בר
+משווה כל אינדיקטור streaming לגרסת ה-batch שב-IndicatorLibrary, כולל שמירה/שחזור מצב באמצע
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'autonomous'))
+
+from indicators import IndicatorLibrary
+from streaming_indicators import (StreamingSMA, StreamingEMA, StreamingRSI, StreamingBollinger,
+                                  StreamingStochastic, StreamingATR, StreamingVolumeRatio,
+                                  restore_indicator)
+from bar_feed import make_synthetic_bars
+
+def streaming_cases():
+    """(שם, בנאי, פונקציה מהערך לסקלר, ערך batch)"""
+    return [
+        ('sma_20', lambda: StreamingSMA(20), None, lambda lib: lib.get('sma', period=20)),
+        ('sma_50', lambda: StreamingSMA(50), None, lambda lib: lib.get('sma', period=50)),
+        ('ema_12', lambda: StreamingEMA(12), None, lambda lib: lib.get('ema', period=12)),
+        ('ema_26', lambda: StreamingEMA(26), None, lambda lib: lib.get('ema', period=26)),
+        ('rsi_14', lambda: StreamingRSI(14), None, lambda lib: lib.get('rsi', period=14)),
+        ('bb_upper_20', lambda: StreamingBollinger(20), 'upper', lambda lib: lib.get('bb_upper', period=20)),
+        ('bb_lower_20', lambda: StreamingBollinger(20), 'lower', lambda lib: lib.get('bb_lower', period=20)),
+        ('bb_position_20', lambda: StreamingBollinger(20), 'position', lambda lib: lib.get('bb_position', period=20)),
+        ('stoch_k_14', lambda: StreamingStochastic(14), 'k', lambda lib: lib.get('stoch_k', period=14)),
+        ('stoch_d_14', lambda: StreamingStochastic(14), 'd', lambda lib: lib.get('stoch_d', period=14)),
+        ('atr_14', lambda: StreamingATR(14), None, lambda lib: lib.get('atr', period=14)),
+        ('volume_ratio_20', lambda: StreamingVolumeRatio(20), None, lambda lib: lib.get('volume_ratio', period=20)),
+    ]
+
+def run_stream(make, key, bars, checkpoint):
+    """הרצה בר-אחר-בר; ב-checkpoint המצב עובר JSON ומשוחזר לאובייקט חדש"""
+    indicator = make()
+    out = np.empty(len(bars))
+    elapsed = 0.0
+    for i, bar in enumerate(bars):
+        if i == checkpoint:
+            indicator = restore_indicator(json.loads(json.dumps(indicator.state())))
+        start = time.perf_counter()
+        value = indicator.update(bar)
+        elapsed += time.perf_counter() - start
+        out[i] = value[key] if key else value
+    return out, elapsed
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='Streaming indicator parity & latency benchmark')
+    parser.add_argument('--bars', type=int, default=50000)
+    parser.add_argument('--tolerance', type=float, default=1e-6,
+                        help='סטייה יחסית מותרת (סכומים רצים מול pandas)')
+    args = parser.parse_args()
+
+    print("📡 Benchmark Streaming Indicators")
+    print("=" * 60)
+
+    df = make_synthetic_bars(args.bars)
+    lib = IndicatorLibrary(df)
+    bars = df[['open', 'high', 'low', 'close', 'volume']].to_dict('records')
+    checkpoint = len(bars) // 2
+    ok = True
+
+    for name, make, key, batch in streaming_cases():
+        expected = batch(lib).to_numpy(dtype=np.float64)
+        actual, elapsed = run_stream(make, key, bars, checkpoint)
+
+        same_nan = np.array_equal(np.isnan(expected), np.isnan(actual))
+        valid = np.isfinite(expected) & np.isfinite(actual)
+        same_inf = np.array_equal(np.isinf(expected), np.isinf(actual))
+        scale = np.maximum(np.abs(expected[valid]), 1.0)
+        error = float(np.max(np.abs(expected[valid] - actual[valid]) / scale)) if valid.any() else 0.0
+        passed = same_nan and same_inf and error <= args.tolerance
+        ok &= passed
+
+        print(f"{'✅' if passed else '❌'} {name:<16} סטייה יחסית {error:.1e} | "
+              f"{elapsed / len(bars) * 1e6:.2f}µs לבר")
+
+    print("✅ זהות בר-אחר-בר (כולל שחזור מצב)" if ok else "❌ סטייה מגרסת ה-batch")
+
+    if not ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
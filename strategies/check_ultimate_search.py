@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Check Ultimate Search - הרצת run_ultimate_search מקצה לקצה על נתונים סינתטיים
+כל אסטרטגיה ואבחון רצים על df שבו נבנו רק העמודות שהם הצהירו עליהן (@uses_columns) -
+עמודה שחסרה בהצהרה נכשלת כאן ב-KeyError, והאותות חייבים להיות זהים לחישוב המלא
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'autonomous'))
+
+from ultimate_strategy_builder_2024 import UltimateStrategyBuilder
+from bar_feed import make_synthetic_bars
+
+STRATEGY_METHODS = [
+    'create_high_frequency_strategy',
+    'create_conservative_scalping_strategy',
+    'create_momentum_surge_strategy'
+]
+
+class SyntheticBuilder(UltimateStrategyBuilder):
+    """הבונה עם נתונים סינתטיים במקום data/NQ2018.csv"""
+
+    def __init__(self, bars):
+        super().__init__()
+        self.bars = bars
+
+    def load_data(self):
+        self.df_2024 = self.bars.copy()
+        return True
+
+def captured_signals(builder, method):
+    """אותות הכניסה והיציאה שהאסטרטגיה מעבירה ל-advanced_backtest"""
+    captured = []
+    builder.advanced_backtest = lambda df, entry, exit_, name: captured.append((entry.to_numpy(bool), exit_.to_numpy(bool)))
+    getattr(builder, method)()
+    return captured[0]
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='End-to-end check of run_ultimate_search on synthetic bars')
+    parser.add_argument('--bars', type=int, default=30000)
+    args = parser.parse_args()
+
+    print("🧪 Check Ultimate Search")
+    print("=" * 60)
+
+    bars = make_synthetic_bars(args.bars)
+    failures = []
+
+    try:
+        SyntheticBuilder(bars).run_ultimate_search()
+    except Exception as e:
+        failures.append(f"run_ultimate_search: {type(e).__name__}: {e}")
+
+    # run_ultimate_search בולע שגיאות של אסטרטגיות - כל אחת נבדקת שוב על df עצל נקי
+    full = SyntheticBuilder(bars)
+    full.load_data()
+    full.calculate_comprehensive_indicators()
+
+    for method in ['diagnose_market_patterns'] + STRATEGY_METHODS:
+        lazy = SyntheticBuilder(bars)
+        lazy.load_data()
+        try:
+            lazy.ensure_indicators_for(getattr(lazy, method))
+            if method == 'diagnose_market_patterns':
+                lazy.diagnose_market_patterns()
+                continue
+            lazy_signals = captured_signals(lazy, method)
+        except Exception as e:
+            failures.append(f"{method}: {type(e).__name__}: {e}")
+            continue
+        full_signals = captured_signals(full, method)
+        if not all(np.array_equal(a, b) for a, b in zip(lazy_signals, full_signals)):
+            failures.append(f"{method}: האותות שונים מהחישוב המלא")
+
+    print()
+    print("=" * 60)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        raise SystemExit(1)
+    print(f"✅ run_ultimate_search ו-{len(STRATEGY_METHODS) + 1} הפונקציות רצו על {args.bars:,} ברים - אותות זהים לחישוב המלא")
+
+if __name__ == "__main__":
+    main()
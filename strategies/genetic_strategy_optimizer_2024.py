@@ -7,9 +7,20 @@ import pandas as pd
 import numpy as np
 import random
 from datetime import datetime
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from indicators import IndicatorLibrary
+from first_passage import FirstPassageIndex
+from jump_chain import next_true_index
+from threshold_index import ThresholdIndex
+from trade_ledger import TradeLedger
+
 class GeneticStrategyOptimizer:
     def __init__(self):
         self.df = None
@@ -17,18 +28,17 @@ class GeneticStrategyOptimizer:
         self.population_size = 50
         self.generations = 20
         self.mutation_rate = 0.1
+        self.min_trades = 200
+        self.first_passage = None
+        self.thresholds = {}
         
     def load_data(self):
         """טעינת נתונים"""
         print("📊 טוען נתוני NQ לשנת 2024...")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ נטענו {len(self.df_2024):,} נקודות נתונים מ-2024")
             
@@ -46,40 +56,36 @@ class GeneticStrategyOptimizer:
         print("📊 מחשב אינדיקטורים...")
         
         df = self.df_2024
+        ind = IndicatorLibrary(df)
         
         # Basic
-        df['returns'] = df['close'].pct_change()
+        df['returns'] = ind.get('returns')
         df['hour'] = df.index.hour
         df['is_market_open'] = df['hour'].between(9, 15)
         
         # Moving averages
         periods = [5, 8, 13, 21, 34, 55, 89]
         for period in periods:
-            df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+            df[f'sma_{period}'] = ind.get('sma', period=period)
+            df[f'ema_{period}'] = ind.get('ema', period=period)
         
         # RSI
         for period in [14, 21]:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            df[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+            df[f'rsi_{period}'] = ind.get('rsi', period=period)
         
         # MACD
-        df['macd'] = df['ema_13'] - df['ema_21']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        df['macd'] = ind.get('macd', fast=13, slow=21)
+        df['macd_signal'] = ind.get('macd_signal', fast=13, slow=21, signal=9)
+        df['macd_hist'] = ind.get('macd_hist', fast=13, slow=21, signal=9)
         
         # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
+        df['bb_middle'] = ind.get('bb_middle', period=20)
+        df['bb_upper'] = ind.get('bb_upper', period=20, num_std=2)
+        df['bb_lower'] = ind.get('bb_lower', period=20, num_std=2)
         
         # Volume
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma']
+        df['volume_ma'] = ind.get('volume_ma', period=20)
+        df['volume_ratio'] = ind.get('volume_ratio', period=20)
         
         # Stochastic
         df['stoch_k'] = self.calculate_stochastic(df, 14)
@@ -89,20 +95,24 @@ class GeneticStrategyOptimizer:
         
         # Price position
         df['price_position'] = (df['close'] - df['low']) / (df['high'] - df['low'])
+        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+        
+        # אינדקס חצייה ראשונה על open - משותף לכל האסטרטגיות
+        self.first_passage = FirstPassageIndex(df['open'].to_numpy())
+        
+        # אינדקס ספים לכל עמודה שה-DNA משווה לסף רציף
+        self.thresholds = {
+            column: ThresholdIndex(df[column].to_numpy(dtype=np.float64))
+            for column in ['rsi_14', 'rsi_21', 'bb_position', 'volume_ratio', 'macd_hist', 'stoch_k']
+        }
         
     def calculate_stochastic(self, df, period):
         """חישוב Stochastic"""
-        lowest_low = df['low'].rolling(window=period).min()
-        highest_high = df['high'].rolling(window=period).max()
-        return 100 * (df['close'] - lowest_low) / (highest_high - lowest_low)
+        return IndicatorLibrary(df).get('stoch_k', period=period)
     
     def calculate_atr(self, df, period):
         """חישוב ATR"""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        return tr.rolling(window=period).mean()
+        return IndicatorLibrary(df).get('atr', period=period)
     
     def create_random_strategy(self):
         """יצירת אסטרטגיה רנדומלית"""
@@ -144,9 +154,27 @@ class GeneticStrategyOptimizer:
         
         return {'entry': entry_params, 'exit': exit_params}
     
+    def threshold_filters(self, strategy):
+        """(עמודה, low, high) לכל תנאי כניסה רציף פעיל - low < value < high"""
+        entry_params = strategy['entry']
+        filters = [(f"rsi_{entry_params['rsi_period']}", entry_params['rsi_lower'], entry_params['rsi_upper'])]
+        if entry_params['use_bb']:
+            filters.append(('bb_position', None, entry_params['bb_position']))
+        if entry_params['use_volume']:
+            filters.append(('volume_ratio', entry_params['volume_threshold'], None))
+        if entry_params['use_macd']:
+            filters.append(('macd_hist', entry_params['macd_threshold'], None))
+        if entry_params['use_stoch']:
+            filters.append(('stoch_k', entry_params['stoch_lower'], entry_params['stoch_upper']))
+        return filters
+    
+    def entry_signal_bound(self, strategy):
+        """חסם עליון למספר אותות הכניסה (ולכן לעסקאות) - searchsorted לכל סף, בלי לבנות מסכות"""
+        return min(self.thresholds[column].count(low, high) for column, low, high in self.threshold_filters(strategy))
+    
     def apply_strategy(self, strategy):
         """הפעלת אסטרטגיה על הנתונים"""
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         entry_params = strategy['entry']
         exit_params = strategy['exit']
@@ -154,32 +182,15 @@ class GeneticStrategyOptimizer:
         # Entry conditions
         entry_conditions = pd.Series(True, index=df.index)
         
-        # RSI condition
-        rsi_col = f"rsi_{entry_params['rsi_period']}"
-        entry_conditions &= (df[rsi_col] > entry_params['rsi_lower']) & (df[rsi_col] < entry_params['rsi_upper'])
+        # RSI / Bollinger Bands / Volume / MACD / Stochastic - ספים מאינדקס הדירוג
+        for column, low, high in self.threshold_filters(strategy):
+            entry_conditions &= self.thresholds[column].mask(low, high)
         
         # EMA condition
         ema_short_col = f"ema_{entry_params['ema_short']}"
         ema_long_col = f"ema_{entry_params['ema_long']}"
         entry_conditions &= df[ema_short_col] > df[ema_long_col]
         
-        # Bollinger Bands
-        if entry_params['use_bb']:
-            bb_position = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-            entry_conditions &= bb_position < entry_params['bb_position']
-        
-        # Volume
-        if entry_params['use_volume']:
-            entry_conditions &= df['volume_ratio'] > entry_params['volume_threshold']
-        
-        # MACD
-        if entry_params['use_macd']:
-            entry_conditions &= df['macd_hist'] > entry_params['macd_threshold']
-        
-        # Stochastic
-        if entry_params['use_stoch']:
-            entry_conditions &= (df['stoch_k'] > entry_params['stoch_lower']) & (df['stoch_k'] < entry_params['stoch_upper'])
-        
         # Time filter
         entry_conditions &= df['hour'].between(entry_params['hour_start'], entry_params['hour_end'])
         entry_conditions &= df['is_market_open']
@@ -189,131 +200,91 @@ class GeneticStrategyOptimizer:
         
         # RSI exit
         rsi_col = f"rsi_{entry_params['rsi_period']}"
-        exit_conditions |= df[rsi_col] > exit_params['rsi_exit_high']
+        exit_conditions |= self.thresholds[rsi_col].above(exit_params['rsi_exit_high'])
         
         # EMA exit
         exit_conditions |= df[ema_short_col] < df[ema_long_col]
         
         # Bollinger Bands exit
-        bb_position = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-        exit_conditions |= bb_position > exit_params['bb_exit_position']
+        exit_conditions |= self.thresholds['bb_position'].above(exit_params['bb_exit_position'])
         
         # MACD exit
-        exit_conditions |= df['macd_hist'] < exit_params['macd_exit_threshold']
+        exit_conditions |= self.thresholds['macd_hist'].below(exit_params['macd_exit_threshold'])
         
         # Stochastic exit
-        exit_conditions |= df['stoch_k'] > exit_params['stoch_exit_high']
+        exit_conditions |= self.thresholds['stoch_k'].above(exit_params['stoch_exit_high'])
         
         return self.backtest_strategy(df, entry_conditions, exit_conditions, strategy)
     
     def backtest_strategy(self, df, entry_signals, exit_signals, strategy):
-        """Backtesting מהיר"""
+        """Backtesting מהיר - קפיצה מעסקה לעסקה, יעד/סטופ מאינדקס החצייה הראשונה"""
         
-        position = 0
-        entry_price = 0
-        trades = []
-        bars_in_trade = 0
+        if self.first_passage is None or len(self.first_passage) != len(df):
+            self.first_passage = FirstPassageIndex(df['open'].to_numpy())
         
-        for i in range(1, len(df)):
-            current_price = df.iloc[i]['open']  # Realistic execution
+        exit_params = strategy['exit']
+        prices = self.first_passage.prices
+        n = len(prices)
+        next_entry = next_true_index(entry_signals.to_numpy(dtype=bool))
+        next_exit = next_true_index(exit_signals.to_numpy(dtype=bool))
+        entry_bars = []
+        exit_bars = []
+        
+        # אות בבר i-1 -> כניסה/יציאה בפתיחת בר i (כניסה רק עד הבר הלפני אחרון)
+        signal = int(next_entry[0])
+        while signal + 1 < n - 1:
+            entry_bar = signal + 1
+            entry_price = prices[entry_bar]
             
-            # Entry
-            if position == 0 and entry_signals.iloc[i-1] and i < len(df) - 1:
-                position = 1
-                entry_price = current_price
-                bars_in_trade = 0
-                
-            # Exit
-            elif position == 1:
-                bars_in_trade += 1
-                should_exit = False
-                
-                # Signal exit
-                if exit_signals.iloc[i-1]:
-                    should_exit = True
-                
-                # Profit target
-                if strategy['exit']['use_profit_target']:
-                    if current_price > entry_price * (1 + strategy['exit']['profit_target']):
-                        should_exit = True
-                
-                # Stop loss
-                if strategy['exit']['use_stop_loss']:
-                    if current_price < entry_price * (1 - strategy['exit']['stop_loss']):
-                        should_exit = True
-                
-                # Max bars
-                if strategy['exit']['use_max_bars']:
-                    if bars_in_trade >= strategy['exit']['max_bars']:
-                        should_exit = True
-                
-                if should_exit:
-                    exit_price = current_price
-                    trade_return = (exit_price - entry_price) / entry_price
-                    trade_pnl = trade_return * 20000  # NQ point value
-                    
-                    trades.append({
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl': trade_pnl,
-                        'bars_held': bars_in_trade,
-                        'return': trade_return
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-                    bars_in_trade = 0
+            # Signal exit
+            exit_bar = int(next_exit[entry_bar]) + 1
+            
+            # Max bars
+            if exit_params['use_max_bars']:
+                exit_bar = min(exit_bar, entry_bar + max(exit_params['max_bars'], 1))
+            
+            # Profit target / Stop loss - חצייה ראשונה לפני יציאה אחרת
+            if exit_params['use_profit_target'] or exit_params['use_stop_loss']:
+                upper = entry_price * (1 + exit_params['profit_target']) if exit_params['use_profit_target'] else np.inf
+                lower = entry_price * (1 - exit_params['stop_loss']) if exit_params['use_stop_loss'] else -np.inf
+                hit = self.first_passage.first_crossing(entry_bar + 1, exit_bar, upper, lower, strict=True)
+                if hit is not None:
+                    exit_bar = hit
+            
+            if exit_bar >= n:
+                break
+            
+            entry_bars.append(entry_bar)
+            exit_bars.append(exit_bar)
+            
+            signal = int(next_entry[exit_bar])
         
-        return trades
+        open_ = self.first_passage.values
+        return TradeLedger.from_columns(
+            entry_bars, exit_bars, open_[entry_bars], open_[exit_bars], index=df.index, reasons=None
+        )
     
     def evaluate_strategy(self, trades):
         """הערכת אסטרטגיה"""
         
-        if len(trades) < 200:
+        if len(trades) < self.min_trades:
             return 0  # לא עומד בקריטריון
         
         # חישוב מדדים
-        trade_returns = [t['pnl'] for t in trades]
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
+        metrics = trades.metrics()
         
-        if len(losing_trades) == 0:
+        if metrics['num_losses'] == 0:
             return 0  # חשוד
         
-        total_return = sum(trade_returns)
-        num_trades = len(trades)
-        win_rate = len(winning_trades) / num_trades
-        avg_trade = total_return / num_trades
-        
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-        
-        # Win/Loss ratio
-        avg_win = gross_profit / len(winning_trades) if len(winning_trades) > 0 else 0
-        avg_loss = gross_loss / len(losing_trades) if len(losing_trades) > 0 else 0
-        win_loss_ratio = avg_win / avg_loss if avg_loss > 0 else 0
-        
-        # Sharpe Ratio
-        returns_std = np.std(trade_returns) if len(trade_returns) > 1 else 1
-        sharpe = (avg_trade / returns_std) * np.sqrt(252) if returns_std > 0 else 0
-        
-        # Drawdown (simplified)
-        equity_curve = np.cumsum(trade_returns)
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = equity_curve - peak
-        max_drawdown = np.min(drawdown)
-        
-        # רצף הפסדים
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
+        total_return = metrics['total_return']
+        num_trades = metrics['num_trades']
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_daily']
+        max_drawdown = metrics['max_drawdown']
+        max_consecutive_losses = metrics['max_consecutive_losses']
         
         # בדיקת קריטריונים
         criteria_score = 0
@@ -431,8 +402,12 @@ class GeneticStrategyOptimizer:
             
             for i, strategy in enumerate(population):
                 try:
-                    trades = self.apply_strategy(strategy)
-                    result = self.evaluate_strategy(trades)
+                    # פחות אותות כניסה מ-min_trades - evaluate_strategy יחזיר 0 בכל מקרה
+                    if self.entry_signal_bound(strategy) < self.min_trades:
+                        result = 0
+                    else:
+                        trades = self.apply_strategy(strategy)
+                        result = self.evaluate_strategy(trades)
                     
                     if isinstance(result, tuple):
                         fitness, stats = result
@@ -5,9 +5,17 @@ Smart Strategy Finder 2024
 
 import pandas as pd
 import numpy as np
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from indicators import IndicatorLibrary
+from trade_ledger import TradeLedger
+
 class SmartStrategyFinder:
     def __init__(self):
         self.df = None
@@ -18,12 +26,8 @@ class SmartStrategyFinder:
         print("📊 טוען נתוני NQ לשנת 2024...")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ נטענו {len(self.df_2024):,} נקודות נתונים מ-2024")
             print(f"📅 תקופה: {self.df_2024.index.min()} עד {self.df_2024.index.max()}")
@@ -39,54 +43,50 @@ class SmartStrategyFinder:
         print("📊 מחשב אינדיקטורים מתקדמים...")
         
         df = self.df_2024
+        ind = IndicatorLibrary(df)
         
         # Basic
-        df['returns'] = df['close'].pct_change()
+        df['returns'] = ind.get('returns')
         df['hour'] = df.index.hour
         df['day_of_week'] = df.index.dayofweek
         df['is_market_open'] = df['hour'].between(9, 15)
         
         # Moving averages
-        df['ema_9'] = df['close'].ewm(span=9).mean()
-        df['ema_21'] = df['close'].ewm(span=21).mean()
-        df['ema_50'] = df['close'].ewm(span=50).mean()
-        df['sma_20'] = df['close'].rolling(window=20).mean()
+        df['ema_9'] = ind.get('ema', period=9)
+        df['ema_21'] = ind.get('ema', period=21)
+        df['ema_50'] = ind.get('ema', period=50)
+        df['sma_20'] = ind.get('sma', period=20)
         
         # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = ind.get('rsi', period=14)
         
         # MACD
-        df['macd'] = df['ema_9'] - df['ema_21']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        df['macd'] = ind.get('macd', fast=9, slow=21)
+        df['macd_signal'] = ind.get('macd_signal', fast=9, slow=21, signal=9)
+        df['macd_hist'] = ind.get('macd_hist', fast=9, slow=21, signal=9)
         
         # Bollinger Bands
-        df['bb_middle'] = df['sma_20']
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+        df['bb_middle'] = ind.get('bb_middle', period=20)
+        df['bb_upper'] = ind.get('bb_upper', period=20, num_std=2)
+        df['bb_lower'] = ind.get('bb_lower', period=20, num_std=2)
+        df['bb_position'] = ind.get('bb_position', period=20, num_std=2)
         
         # Volume
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_ma']
+        df['volume_ma'] = ind.get('volume_ma', period=20)
+        df['volume_ratio'] = ind.get('volume_ratio', period=20)
         
         # Stochastic
-        df['lowest_low'] = df['low'].rolling(window=14).min()
-        df['highest_high'] = df['high'].rolling(window=14).max()
-        df['stoch_k'] = 100 * (df['close'] - df['lowest_low']) / (df['highest_high'] - df['lowest_low'])
-        df['stoch_d'] = df['stoch_k'].rolling(window=3).mean()
+        df['lowest_low'] = ind.get('rolling_min', period=14)
+        df['highest_high'] = ind.get('rolling_max', period=14)
+        df['stoch_k'] = ind.get('stoch_k', period=14)
+        df['stoch_d'] = ind.get('stoch_d', period=14, smooth=3)
         
         # ATR
         df['high_low'] = df['high'] - df['low']
         df['high_close'] = np.abs(df['high'] - df['close'].shift())
         df['low_close'] = np.abs(df['low'] - df['close'].shift())
-        df['true_range'] = df[['high_low', 'high_close', 'low_close']].max(axis=1)
-        df['atr'] = df['true_range'].rolling(window=14).mean()
+        df['true_range'] = ind.get('true_range')
+        df['atr'] = ind.get('atr', period=14)
         
         # Price patterns
         df['body'] = abs(df['close'] - df['open'])
@@ -95,11 +95,11 @@ class SmartStrategyFinder:
         df['total_range'] = df['high'] - df['low']
         
         # Trend strength
-        df['trend_strength'] = (df['close'] - df['close'].shift(20)) / df['close'].shift(20)
+        df['trend_strength'] = ind.get('trend_strength', period=20)
         
         # Support/Resistance
-        df['resistance'] = df['high'].rolling(window=20).max()
-        df['support'] = df['low'].rolling(window=20).min()
+        df['resistance'] = ind.get('rolling_max', period=20)
+        df['support'] = ind.get('rolling_min', period=20)
         
         print("✅ אינדיקטורים מחושבים")
         
@@ -107,7 +107,7 @@ class SmartStrategyFinder:
         """אסטרטגיית RSI + Bollinger Bands מותאמת למכסימום רווחיות"""
         print("🎯 בוחן אסטרטגיה: Ultimate RSI + BB")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה מתקדמים
         entry_conditions = (
@@ -172,17 +172,19 @@ class SmartStrategyFinder:
         """אסטרטגיית Momentum Breakout מתקדמת"""
         print("🎯 בוחן אסטרטגיה: Momentum Breakout")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
-        # חישוב momentum
-        df['momentum_5'] = df['close'] / df['close'].shift(5) - 1
-        df['momentum_10'] = df['close'] / df['close'].shift(10) - 1
+        # חישוב momentum - עמודות עזר בצד, df_2024 נשאר לקריאה בלבד
+        scratch = {
+            'momentum_5': df['close'] / df['close'].shift(5) - 1,
+            'momentum_10': df['close'] / df['close'].shift(10) - 1
+        }
         
         # תנאי כניסה
         entry_conditions = (
             # Momentum חיובי
-            (df['momentum_5'] > 0.001) &
-            (df['momentum_10'] > 0.002) &
+            (scratch['momentum_5'] > 0.001) &
+            (scratch['momentum_10'] > 0.002) &
             
             # פריצת התנגדות
             (df['close'] > df['resistance'].shift(1)) &
@@ -215,7 +217,7 @@ class SmartStrategyFinder:
         # תנאי יציאה
         exit_conditions = (
             # Momentum נחלש
-            (df['momentum_5'] < 0) |
+            (scratch['momentum_5'] < 0) |
             
             # RSI overbought
             (df['rsi'] > 75) |
@@ -236,16 +238,18 @@ class SmartStrategyFinder:
         """אסטרטגיית Time + Volume Pattern"""
         print("🎯 בוחן אסטרטגיה: Time + Volume Pattern")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # חישוב דפוסי נפח
-        df['volume_spike'] = df['volume'] > df['volume_ma'] * 1.8
-        df['volume_dry'] = df['volume'] < df['volume_ma'] * 0.6
+        scratch = {
+            'volume_spike': df['volume'] > df['volume_ma'] * 1.8,
+            'volume_dry': df['volume'] < df['volume_ma'] * 0.6
+        }
         
         # תנאי כניסה
         entry_conditions = (
             # Volume spike
-            (df['volume_spike']) &
+            (scratch['volume_spike']) &
             
             # נר חיובי
             (df['close'] > df['open']) &
@@ -282,7 +286,7 @@ class SmartStrategyFinder:
         # תנאי יציאה
         exit_conditions = (
             # Volume יבש
-            (df['volume_dry']) |
+            (scratch['volume_dry']) |
             
             # נר שלילי
             (df['close'] < df['open']) &
@@ -306,11 +310,11 @@ class SmartStrategyFinder:
         """אסטרטגיית Scalping אדפטיבית"""
         print("🎯 בוחן אסטרטגיה: Adaptive Scalping")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # זיהוי תנאי שוק
-        df['volatility'] = df['atr'] / df['close']
-        df['high_vol'] = df['volatility'] > df['volatility'].rolling(50).quantile(0.7)
+        scratch = {'volatility': df['atr'] / df['close']}
+        scratch['high_vol'] = scratch['volatility'] > scratch['volatility'].rolling(50).quantile(0.7)
         
         # תנאי כניסה מותאמים לתנודתיות
         low_vol_entry = (
@@ -327,7 +331,7 @@ class SmartStrategyFinder:
         
         entry_conditions = (
             # תנאי לפי תנודתיות
-            ((~df['high_vol'] & low_vol_entry) | (df['high_vol'] & high_vol_entry)) &
+            ((~scratch['high_vol'] & low_vol_entry) | (scratch['high_vol'] & high_vol_entry)) &
             
             # מגמה חיובית
             (df['ema_9'] > df['ema_21']) &
@@ -359,7 +363,7 @@ class SmartStrategyFinder:
         
         exit_conditions = (
             # תנאי לפי תנודתיות
-            ((~df['high_vol'] & low_vol_exit) | (df['high_vol'] & high_vol_exit)) |
+            ((~scratch['high_vol'] & low_vol_exit) | (scratch['high_vol'] & high_vol_exit)) |
             
             # מגמה התהפכה
             (df['ema_9'] < df['ema_21']) |
@@ -375,7 +379,11 @@ class SmartStrategyFinder:
         
         position = 0
         entry_price = 0
-        trades = []
+        entry_bar = 0
+        entry_bars = []
+        exit_bars = []
+        exit_prices = []
+        realized_pnl = 0
         equity_curve = []
         current_equity = 100000
         peak_equity = 100000
@@ -388,6 +396,7 @@ class SmartStrategyFinder:
             if position == 0 and entry_signals.iloc[i-1]:
                 position = 1
                 entry_price = df.iloc[i]['open']
+                entry_bar = i
                 
             # Exit (signal on previous bar, execute on current open)
             elif position == 1 and exit_signals.iloc[i-1]:
@@ -398,17 +407,13 @@ class SmartStrategyFinder:
                 trade_pnl = trade_return * 20000  # NQ point value
                 
                 # Record trade
-                trades.append({
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'pnl': trade_pnl,
-                    'return': trade_return,
-                    'entry_time': df.index[i-1],
-                    'exit_time': df.index[i]
-                })
+                entry_bars.append(entry_bar)
+                exit_bars.append(i)
+                exit_prices.append(exit_price)
                 
                 # Update equity
                 current_equity += trade_pnl
+                realized_pnl += trade_pnl
                 peak_equity = max(peak_equity, current_equity)
                 
                 position = 0
@@ -417,7 +422,7 @@ class SmartStrategyFinder:
             # Update equity curve
             if position == 1:
                 unrealized_pnl = (df.iloc[i]['close'] - entry_price) / entry_price * 20000
-                current_unrealized_equity = 100000 + sum([t['pnl'] for t in trades]) + unrealized_pnl
+                current_unrealized_equity = 100000 + realized_pnl + unrealized_pnl
             else:
                 current_unrealized_equity = current_equity
             
@@ -425,18 +430,14 @@ class SmartStrategyFinder:
         
         # Close final position
         if position == 1:
-            exit_price = df.iloc[-1]['close']
-            trade_return = (exit_price - entry_price) / entry_price
-            trade_pnl = trade_return * 20000
-            
-            trades.append({
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'pnl': trade_pnl,
-                'return': trade_return,
-                'entry_time': df.index[-2],
-                'exit_time': df.index[-1]
-            })
+            entry_bars.append(entry_bar)
+            exit_bars.append(len(df) - 1)
+            exit_prices.append(df.iloc[-1]['close'])
+        
+        trades = TradeLedger.from_columns(
+            entry_bars, exit_bars, df['open'].to_numpy()[entry_bars], exit_prices,
+            index=df.index, reasons=None
+        )
         
         return self.evaluate_strategy(trades, equity_curve, strategy_name)
     
@@ -447,56 +448,27 @@ class SmartStrategyFinder:
             return None
         
         # Basic metrics
-        trade_returns = [t['pnl'] for t in trades]
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
+        metrics = trades.metrics()
         
-        if len(losing_trades) == 0:
+        if metrics['num_losses'] == 0:
             return None
         
-        total_return = sum(trade_returns)
-        num_trades = len(trades)
-        win_rate = len(winning_trades) / num_trades
-        avg_trade = total_return / num_trades
-        
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss
-        
-        # Win/Loss ratio
-        avg_win = gross_profit / len(winning_trades)
-        avg_loss = gross_loss / len(losing_trades)
-        win_loss_ratio = avg_win / avg_loss
-        
-        # Sharpe Ratio
-        returns_std = np.std(trade_returns)
-        sharpe = (avg_trade / returns_std) * np.sqrt(252*24) if returns_std > 0 else 0
-        
-        # Drawdown
+        total_return = metrics['total_return']
+        num_trades = metrics['num_trades']
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_hourly']
+        max_consecutive_losses = metrics['max_consecutive_losses']
+        monthly_profits = metrics['monthly_profits']
+        
+        # Drawdown - על עקומת ההון בר-אחר-בר (כולל רווח לא ממומש)
         equity_curve = np.array(equity_curve)
         peak = np.maximum.accumulate(equity_curve)
         drawdown = equity_curve - peak
         max_drawdown = np.min(drawdown)
         
-        # Max consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
-        
-        # Monthly profits
-        monthly_profits = {}
-        for trade in trades:
-            month = trade['exit_time'].strftime('%Y-%m')
-            if month not in monthly_profits:
-                monthly_profits[month] = 0
-            monthly_profits[month] += trade['pnl']
-        
         # Check criteria
         criteria_met = {
             'min_trades': num_trades >= 200,
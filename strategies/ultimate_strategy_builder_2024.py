@@ -5,25 +5,187 @@ Ultimate Strategy Builder 2024
 
 import pandas as pd
 import numpy as np
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from indicators import IndicatorLibrary
+from indicator_graph import IndicatorGraph, uses_columns
+from trade_ledger import TradeLedger
+
+# גרף העמודות של הבונה - כל עמודה מוצהרת עם התלויות שלה ומחושבת רק כשמפנים אליה
+COLUMN_GRAPH = IndicatorGraph()
+
+# Basic
+COLUMN_GRAPH.indicator('returns', 'returns')
+
+@COLUMN_GRAPH.column('hour')
+def _hour(df, ind):
+    return df.index.hour
+
+@COLUMN_GRAPH.column('day_of_week')
+def _day_of_week(df, ind):
+    return df.index.dayofweek
+
+@COLUMN_GRAPH.column('is_market_open', depends=['hour'])
+def _is_market_open(df, ind):
+    return df['hour'].between(9, 15)
+
+# Moving averages, RSI
+COLUMN_GRAPH.indicator('ema_{period}', 'ema')
+COLUMN_GRAPH.indicator('sma_{period}', 'sma')
+COLUMN_GRAPH.indicator('rsi_{period}', 'rsi')
+
+# MACD variants
+COLUMN_GRAPH.indicator('macd_fast', 'macd', depends=['ema_8', 'ema_21'], fast=8, slow=21)
+COLUMN_GRAPH.indicator('macd_slow', 'macd', depends=['ema_13', 'ema_34'], fast=13, slow=34)
+COLUMN_GRAPH.indicator('macd_signal_fast', 'macd_signal', depends=['macd_fast'], fast=8, slow=21, signal=9)
+COLUMN_GRAPH.indicator('macd_signal_slow', 'macd_signal', depends=['macd_slow'], fast=13, slow=34, signal=9)
+COLUMN_GRAPH.indicator('macd_hist_fast', 'macd_hist', depends=['macd_fast', 'macd_signal_fast'], fast=8, slow=21, signal=9)
+COLUMN_GRAPH.indicator('macd_hist_slow', 'macd_hist', depends=['macd_slow', 'macd_signal_slow'], fast=13, slow=34, signal=9)
+
+# Bollinger Bands
+COLUMN_GRAPH.indicator('bb_middle_{period}', 'bb_middle')
+COLUMN_GRAPH.indicator('bb_upper_{period}', 'bb_upper', depends=['bb_middle_{period}'], num_std=2)
+COLUMN_GRAPH.indicator('bb_lower_{period}', 'bb_lower', depends=['bb_middle_{period}'], num_std=2)
+COLUMN_GRAPH.indicator('bb_width_{period}', 'bb_width', depends=['bb_upper_{period}', 'bb_lower_{period}'], num_std=2)
+COLUMN_GRAPH.indicator('bb_position_{period}', 'bb_position', depends=['bb_lower_{period}', 'bb_width_{period}'], num_std=2)
+
+# Stochastic
+COLUMN_GRAPH.indicator('lowest_low_{period}', 'rolling_min')
+COLUMN_GRAPH.indicator('highest_high_{period}', 'rolling_max')
+COLUMN_GRAPH.indicator('stoch_k_{period}', 'stoch_k', depends=['lowest_low_{period}', 'highest_high_{period}'])
+COLUMN_GRAPH.indicator('stoch_d_{period}', 'stoch_d', depends=['stoch_k_{period}'], smooth=3)
+
+# Volume
+COLUMN_GRAPH.indicator('volume_ma_{period}', 'volume_ma')
+COLUMN_GRAPH.indicator('volume_ratio_{period}', 'volume_ratio', depends=['volume_ma_{period}'])
+
+# ATR and volatility
+@COLUMN_GRAPH.column('high_low')
+def _high_low(df, ind):
+    return df['high'] - df['low']
+
+@COLUMN_GRAPH.column('high_close')
+def _high_close(df, ind):
+    return np.abs(df['high'] - df['close'].shift())
+
+@COLUMN_GRAPH.column('low_close')
+def _low_close(df, ind):
+    return np.abs(df['low'] - df['close'].shift())
+
+COLUMN_GRAPH.indicator('true_range', 'true_range', depends=['high_low', 'high_close', 'low_close'])
+COLUMN_GRAPH.indicator('atr', 'atr', depends=['true_range'], period=14)
+COLUMN_GRAPH.indicator('volatility', 'volatility', depends=['returns'], period=20)
+
+# Price action
+@COLUMN_GRAPH.column('body')
+def _body(df, ind):
+    return abs(df['close'] - df['open'])
+
+@COLUMN_GRAPH.column('upper_shadow')
+def _upper_shadow(df, ind):
+    return df['high'] - np.maximum(df['open'], df['close'])
+
+@COLUMN_GRAPH.column('lower_shadow')
+def _lower_shadow(df, ind):
+    return np.minimum(df['open'], df['close']) - df['low']
+
+@COLUMN_GRAPH.column('total_range')
+def _total_range(df, ind):
+    return df['high'] - df['low']
+
+@COLUMN_GRAPH.column('is_bullish')
+def _is_bullish(df, ind):
+    return df['close'] > df['open']
+
+@COLUMN_GRAPH.column('is_doji', depends=['body', 'total_range'])
+def _is_doji(df, ind):
+    return df['body'] < df['total_range'] * 0.1
+
+# Trend indicators
+COLUMN_GRAPH.indicator('trend_strength_short', 'trend_strength', period=5)
+COLUMN_GRAPH.indicator('trend_strength_medium', 'trend_strength', period=20)
+COLUMN_GRAPH.indicator('trend_strength_long', 'trend_strength', period=50)
+
+# Support/Resistance
+COLUMN_GRAPH.indicator('resistance_{period}', 'rolling_max')
+COLUMN_GRAPH.indicator('support_{period}', 'rolling_min')
+
+@COLUMN_GRAPH.column('dist_to_resistance_{period}', depends=['resistance_{period}'])
+def _dist_to_resistance(df, ind, period):
+    return (df[f'resistance_{period}'] - df['close']) / df['close']
+
+@COLUMN_GRAPH.column('dist_to_support_{period}', depends=['support_{period}'])
+def _dist_to_support(df, ind, period):
+    return (df['close'] - df[f'support_{period}']) / df['close']
+
+# Time-based features
+@COLUMN_GRAPH.column('is_morning', depends=['hour'])
+def _is_morning(df, ind):
+    return df['hour'].isin([9, 10, 11])
+
+@COLUMN_GRAPH.column('is_afternoon', depends=['hour'])
+def _is_afternoon(df, ind):
+    return df['hour'].isin([13, 14, 15])
+
+@COLUMN_GRAPH.column('is_prime_time', depends=['hour'])
+def _is_prime_time(df, ind):
+    return df['hour'].isin([9, 10, 11, 13, 14])
+
+@COLUMN_GRAPH.column('is_weekday', depends=['day_of_week'])
+def _is_weekday(df, ind):
+    return df['day_of_week'] < 5
+
+# Market regime indicators
+@COLUMN_GRAPH.column('high_vol_regime', depends=['volatility'])
+def _high_vol_regime(df, ind):
+    return df['volatility'] > df['volatility'].rolling(100).quantile(0.7)
+
+@COLUMN_GRAPH.column('trending_regime', depends=['trend_strength_medium'])
+def _trending_regime(df, ind):
+    return abs(df['trend_strength_medium']) > 0.01
+
+# כל העמודות בסדר המקורי - לחישוב מלא
+COMPREHENSIVE_COLUMNS = (
+    ['returns', 'hour', 'day_of_week', 'is_market_open'] +
+    [f'{kind}_{period}' for period in [3, 5, 8, 13, 21, 34, 55, 89] for kind in ['ema', 'sma']] +
+    [f'rsi_{period}' for period in [9, 14, 21]] +
+    ['macd_fast', 'macd_slow', 'macd_signal_fast', 'macd_signal_slow', 'macd_hist_fast', 'macd_hist_slow'] +
+    [f'bb_{kind}_{period}' for period in [15, 20, 30] for kind in ['middle', 'upper', 'lower', 'width', 'position']] +
+    [f'{kind}_{period}' for period in [14, 21] for kind in ['lowest_low', 'highest_high', 'stoch_k', 'stoch_d']] +
+    [f'{kind}_{period}' for period in [10, 20, 30] for kind in ['volume_ma', 'volume_ratio']] +
+    ['high_low', 'high_close', 'low_close', 'true_range', 'atr', 'volatility'] +
+    ['body', 'upper_shadow', 'lower_shadow', 'total_range', 'is_bullish', 'is_doji'] +
+    ['trend_strength_short', 'trend_strength_medium', 'trend_strength_long'] +
+    [f'{kind}_{period}' for period in [20, 50] for kind in ['resistance', 'support', 'dist_to_resistance', 'dist_to_support']] +
+    ['is_morning', 'is_afternoon', 'is_prime_time', 'is_weekday'] +
+    ['high_vol_regime', 'trending_regime']
+)
+
+# עמודות הזמן הבסיסיות - נבנות תמיד, גם כשפונקציה לא מצהירה עליהן
+BASE_COLUMNS = ['hour', 'day_of_week', 'is_market_open']
+
+# סיבות היציאה של advanced_backtest - לקודים ביומן העסקאות
+EXIT_REASONS = ['signal', 'stop_loss', 'take_profit', 'max_time', 'final_close']
+
 class UltimateStrategyBuilder:
     def __init__(self):
         self.df = None
         self.df_2024 = None
+        self.indicators = None
         
     def load_data(self):
         """טעינת נתונים"""
         print("📊 טוען נתוני NQ לשנת 2024...")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ נטענו {len(self.df_2024):,} נקודות נתונים מ-2024")
             
@@ -33,100 +195,25 @@ class UltimateStrategyBuilder:
             print(f"❌ שגיאה: {e}")
             return False
     
-    def calculate_comprehensive_indicators(self):
-        """חישוב אינדיקטורים מקיפים"""
+    def calculate_comprehensive_indicators(self, columns=None):
+        """חישוב אינדיקטורים מקיפים - כולם, או רק העמודות המבוקשות ותלויותיהן"""
         print("📊 מחשב אינדיקטורים מקיפים...")
         
+        if columns is None:
+            columns = COMPREHENSIVE_COLUMNS
+        
         df = self.df_2024
+        if self.indicators is None or self.indicators.df is not df:
+            self.indicators = IndicatorLibrary(df)
+        added = COLUMN_GRAPH.materialize(df, columns, self.indicators)
         
-        # Basic
-        df['returns'] = df['close'].pct_change()
-        df['hour'] = df.index.hour
-        df['day_of_week'] = df.index.dayofweek
-        df['is_market_open'] = df['hour'].between(9, 15)
-        
-        # Moving averages - wide range
-        for period in [3, 5, 8, 13, 21, 34, 55, 89]:
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
-            df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
-        
-        # RSI multiple periods
-        for rsi_period in [9, 14, 21]:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-            rs = gain / loss
-            df[f'rsi_{rsi_period}'] = 100 - (100 / (1 + rs))
-        
-        # MACD variants
-        df['macd_fast'] = df['ema_8'] - df['ema_21']
-        df['macd_slow'] = df['ema_13'] - df['ema_34']
-        df['macd_signal_fast'] = df['macd_fast'].ewm(span=9).mean()
-        df['macd_signal_slow'] = df['macd_slow'].ewm(span=9).mean()
-        df['macd_hist_fast'] = df['macd_fast'] - df['macd_signal_fast']
-        df['macd_hist_slow'] = df['macd_slow'] - df['macd_signal_slow']
-        
-        # Bollinger Bands multiple periods
-        for bb_period in [15, 20, 30]:
-            df[f'bb_middle_{bb_period}'] = df['close'].rolling(window=bb_period).mean()
-            bb_std = df['close'].rolling(window=bb_period).std()
-            df[f'bb_upper_{bb_period}'] = df[f'bb_middle_{bb_period}'] + (bb_std * 2)
-            df[f'bb_lower_{bb_period}'] = df[f'bb_middle_{bb_period}'] - (bb_std * 2)
-            df[f'bb_width_{bb_period}'] = df[f'bb_upper_{bb_period}'] - df[f'bb_lower_{bb_period}']
-            df[f'bb_position_{bb_period}'] = (df['close'] - df[f'bb_lower_{bb_period}']) / df[f'bb_width_{bb_period}']
-        
-        # Stochastic
-        for stoch_period in [14, 21]:
-            df[f'lowest_low_{stoch_period}'] = df['low'].rolling(window=stoch_period).min()
-            df[f'highest_high_{stoch_period}'] = df['high'].rolling(window=stoch_period).max()
-            df[f'stoch_k_{stoch_period}'] = 100 * (df['close'] - df[f'lowest_low_{stoch_period}']) / (df[f'highest_high_{stoch_period}'] - df[f'lowest_low_{stoch_period}'])
-            df[f'stoch_d_{stoch_period}'] = df[f'stoch_k_{stoch_period}'].rolling(window=3).mean()
-        
-        # Volume indicators
-        for vol_period in [10, 20, 30]:
-            df[f'volume_ma_{vol_period}'] = df['volume'].rolling(window=vol_period).mean()
-            df[f'volume_ratio_{vol_period}'] = df['volume'] / df[f'volume_ma_{vol_period}']
-        
-        # ATR and volatility
-        df['high_low'] = df['high'] - df['low']
-        df['high_close'] = np.abs(df['high'] - df['close'].shift())
-        df['low_close'] = np.abs(df['low'] - df['close'].shift())
-        df['true_range'] = df[['high_low', 'high_close', 'low_close']].max(axis=1)
-        df['atr'] = df['true_range'].rolling(window=14).mean()
-        df['volatility'] = df['returns'].rolling(window=20).std()
-        
-        # Price action
-        df['body'] = abs(df['close'] - df['open'])
-        df['upper_shadow'] = df['high'] - np.maximum(df['open'], df['close'])
-        df['lower_shadow'] = np.minimum(df['open'], df['close']) - df['low']
-        df['total_range'] = df['high'] - df['low']
-        df['is_bullish'] = df['close'] > df['open']
-        df['is_doji'] = df['body'] < df['total_range'] * 0.1
-        
-        # Trend indicators
-        df['trend_strength_short'] = (df['close'] - df['close'].shift(5)) / df['close'].shift(5)
-        df['trend_strength_medium'] = (df['close'] - df['close'].shift(20)) / df['close'].shift(20)
-        df['trend_strength_long'] = (df['close'] - df['close'].shift(50)) / df['close'].shift(50)
-        
-        # Support/Resistance
-        for sr_period in [20, 50]:
-            df[f'resistance_{sr_period}'] = df['high'].rolling(window=sr_period).max()
-            df[f'support_{sr_period}'] = df['low'].rolling(window=sr_period).min()
-            df[f'dist_to_resistance_{sr_period}'] = (df[f'resistance_{sr_period}'] - df['close']) / df['close']
-            df[f'dist_to_support_{sr_period}'] = (df['close'] - df[f'support_{sr_period}']) / df['close']
-        
-        # Time-based features
-        df['is_morning'] = df['hour'].isin([9, 10, 11])
-        df['is_afternoon'] = df['hour'].isin([13, 14, 15])
-        df['is_prime_time'] = df['hour'].isin([9, 10, 11, 13, 14])
-        df['is_weekday'] = df['day_of_week'] < 5
-        
-        # Market regime indicators
-        df['high_vol_regime'] = df['volatility'] > df['volatility'].rolling(100).quantile(0.7)
-        df['trending_regime'] = abs(df['trend_strength_medium']) > 0.01
-        
-        print("✅ אינדיקטורים מקיפים מחושבים")
+        print(f"✅ אינדיקטורים מקיפים מחושבים ({len(added)} עמודות חדשות, {len(df.columns)} סה\"כ)")
     
+    def ensure_indicators_for(self, func):
+        """חישוב עצל: עמודות הזמן הבסיסיות והעמודות שהפונקציה הצהירה עליהן, לפי גרף התלויות"""
+        self.calculate_comprehensive_indicators(COLUMN_GRAPH.required_columns(func, always=BASE_COLUMNS))
+    
+    @uses_columns('hour', 'returns', 'rsi_14', 'volume_ratio_20')
     def diagnose_market_patterns(self):
         """אבחון דפוסי שוק"""
         print("\n🔍 מבצע אבחון דפוסי שוק...")
@@ -149,11 +236,14 @@ class UltimateStrategyBuilder:
         
         return profitable_hours, rsi_returns, vol_returns
     
+    @uses_columns('is_prime_time', 'is_weekday', 'hour', 'ema_3', 'ema_8', 'ema_21', 'ema_34', 'rsi_9', 'rsi_14',
+                  'macd_hist_fast', 'volume_ratio_10', 'atr', 'bb_position_20', 'is_bullish', 'body', 'total_range',
+                  'support_20', 'resistance_20', 'stoch_k_14', 'stoch_d_14')
     def create_high_frequency_strategy(self):
         """יצירת אסטרטגיית high frequency מותאמת"""
         print("\n🎯 בונה אסטרטגיית High Frequency מותאמת...")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה מרובי שכבות
         # שכבה 1: תנאי זמן ובסיסיים
@@ -229,11 +319,14 @@ class UltimateStrategyBuilder:
         
         return self.advanced_backtest(df, entry_conditions, exit_conditions, "High Frequency Strategy")
     
+    @uses_columns('hour', 'is_weekday', 'ema_5', 'ema_13', 'ema_34', 'ema_55', 'rsi_14', 'macd_hist_fast',
+                  'volume_ratio_20', 'bb_position_20', 'stoch_k_14', 'dist_to_support_20', 'dist_to_resistance_20',
+                  'high_vol_regime', 'is_bullish', 'body', 'total_range')
     def create_conservative_scalping_strategy(self):
         """יצירת אסטרטגיית scalping שמרנית"""
         print("\n🎯 בונה אסטרטגיית Scalping שמרנית...")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה שמרניים
         entry_conditions = (
@@ -300,21 +393,26 @@ class UltimateStrategyBuilder:
         
         return self.advanced_backtest(df, entry_conditions, exit_conditions, "Conservative Scalping")
     
+    @uses_columns('volume_ratio_10', 'is_prime_time', 'is_weekday', 'ema_3', 'ema_8', 'ema_21', 'ema_34', 'rsi_9',
+                  'rsi_14', 'macd_hist_fast', 'bb_position_20', 'stoch_k_14', 'dist_to_resistance_20', 'is_bullish',
+                  'body', 'total_range')
     def create_momentum_surge_strategy(self):
         """יצירת אסטרטגיית momentum surge"""
         print("\n🎯 בונה אסטרטגיית Momentum Surge...")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
-        # זיהוי momentum surge
-        df['price_surge'] = (df['close'] / df['close'].shift(3) - 1) > 0.002
-        df['volume_surge'] = df['volume_ratio_10'] > 1.8
-        df['momentum_surge'] = df['price_surge'] & df['volume_surge']
+        # זיהוי momentum surge - במילון עזר, בלי להוסיף עמודות ל-df_2024 המשותף
+        scratch = {
+            'price_surge': (df['close'] / df['close'].shift(3) - 1) > 0.002,
+            'volume_surge': df['volume_ratio_10'] > 1.8
+        }
+        scratch['momentum_surge'] = scratch['price_surge'] & scratch['volume_surge']
         
         # תנאי כניסה
         entry_conditions = (
             # Momentum surge
-            (df['momentum_surge']) &
+            (scratch['momentum_surge']) &
             
             # זמן טוב
             (df['is_prime_time']) &
@@ -378,7 +476,12 @@ class UltimateStrategyBuilder:
         
         position = 0
         entry_price = 0
-        trades = []
+        entry_bar = 0
+        entry_bars = []
+        exit_bars = []
+        exit_prices = []
+        exit_codes = []
+        bars_held = []
         bars_in_trade = 0
         max_bars_per_trade = 20  # מגבלת זמן לעסקה
         
@@ -396,6 +499,7 @@ class UltimateStrategyBuilder:
             if position == 0 and entry_signals.iloc[i-1]:
                 position = 1
                 entry_price = current_price
+                entry_bar = i
                 bars_in_trade = 0
                 
             # Exit
@@ -426,19 +530,12 @@ class UltimateStrategyBuilder:
                 
                 if should_exit:
                     exit_price = current_price
-                    trade_return = (exit_price - entry_price) / entry_price
-                    trade_pnl = trade_return * 20000  # NQ point value
                     
-                    trades.append({
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl': trade_pnl,
-                        'return': trade_return,
-                        'bars_held': bars_in_trade,
-                        'exit_reason': exit_reason,
-                        'entry_time': df.index[i-1],
-                        'exit_time': df.index[i]
-                    })
+                    entry_bars.append(entry_bar)
+                    exit_bars.append(i)
+                    exit_prices.append(exit_price)
+                    exit_codes.append(EXIT_REASONS.index(exit_reason))
+                    bars_held.append(bars_in_trade)
                     
                     position = 0
                     entry_price = 0
@@ -447,19 +544,16 @@ class UltimateStrategyBuilder:
         # Close final position
         if position == 1:
             exit_price = df.iloc[-1]['close']
-            trade_return = (exit_price - entry_price) / entry_price
-            trade_pnl = trade_return * 20000
-            
-            trades.append({
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'pnl': trade_pnl,
-                'return': trade_return,
-                'bars_held': bars_in_trade,
-                'exit_reason': "final_close",
-                'entry_time': df.index[-2],
-                'exit_time': df.index[-1]
-            })
+            entry_bars.append(entry_bar)
+            exit_bars.append(len(df) - 1)
+            exit_prices.append(exit_price)
+            exit_codes.append(EXIT_REASONS.index('final_close'))
+            bars_held.append(bars_in_trade)
+        
+        trades = TradeLedger.from_columns(
+            entry_bars, exit_bars, df['open'].to_numpy()[entry_bars], exit_prices,
+            exit_reason=exit_codes, bars_held=bars_held, index=df.index, reasons=EXIT_REASONS
+        )
         
         return self.comprehensive_evaluation(trades, strategy_name)
     
@@ -473,56 +567,22 @@ class UltimateStrategyBuilder:
             return None
         
         # Basic metrics
-        trade_returns = [t['pnl'] for t in trades]
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
+        metrics = trades.metrics()
         
-        if len(losing_trades) == 0:
+        if metrics['num_losses'] == 0:
             print(f"   ❌ {strategy_name}: אין עסקאות מפסידות - חשוד")
             return None
         
-        total_return = sum(trade_returns)
-        num_trades = len(trades)
-        win_rate = len(winning_trades) / num_trades
-        avg_trade = total_return / num_trades
-        
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss
-        
-        # Win/Loss ratio
-        avg_win = gross_profit / len(winning_trades)
-        avg_loss = gross_loss / len(losing_trades)
-        win_loss_ratio = avg_win / avg_loss
-        
-        # Sharpe Ratio
-        returns_std = np.std(trade_returns)
-        sharpe = (avg_trade / returns_std) * np.sqrt(252*24) if returns_std > 0 else 0
-        
-        # Drawdown calculation
-        equity_curve = np.cumsum(trade_returns) + 100000
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = equity_curve - peak
-        max_drawdown = np.min(drawdown)
-        
-        # Max consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
-        
-        # Monthly analysis
-        monthly_profits = {}
-        for trade in trades:
-            month = trade['exit_time'].strftime('%Y-%m')
-            if month not in monthly_profits:
-                monthly_profits[month] = 0
-            monthly_profits[month] += trade['pnl']
+        total_return = metrics['total_return']
+        num_trades = metrics['num_trades']
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_hourly']
+        max_drawdown = metrics['max_drawdown']
+        max_consecutive_losses = metrics['max_consecutive_losses']
+        monthly_profits = metrics['monthly_profits']
         
         # Recovery time analysis
         max_recovery_months = 0
@@ -597,8 +657,8 @@ class UltimateStrategyBuilder:
         if not self.load_data():
             return None
         
-        # חישוב אינדיקטורים
-        self.calculate_comprehensive_indicators()
+        # חישוב אינדיקטורים עצל - רק מה שהאבחון והאסטרטגיות מפנים אליו
+        self.ensure_indicators_for(self.diagnose_market_patterns)
         
         # אבחון שוק
         self.diagnose_market_patterns()
@@ -622,6 +682,7 @@ class UltimateStrategyBuilder:
         
         for strategy_func in strategies:
             try:
+                self.ensure_indicators_for(strategy_func)
                 result = strategy_func()
                 
                 if result:
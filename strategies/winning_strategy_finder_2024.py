@@ -5,9 +5,16 @@ Winning Strategy Finder 2024
 
 import pandas as pd
 import numpy as np
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from market_data import load_market_data
+from trade_ledger import TradeLedger
+
 class WinningStrategyFinder:
     def __init__(self):
         self.df = None
@@ -18,12 +25,8 @@ class WinningStrategyFinder:
         print("📊 טוען נתוני NQ לשנת 2024...")
         
         try:
-            self.df = pd.read_csv('../data/NQ2018.csv')
-            self.df['datetime'] = pd.to_datetime(self.df['datetime'])
-            self.df.set_index('datetime', inplace=True)
-            
-            # הפרדת 2024
-            self.df_2024 = self.df[self.df.index.year == 2024].copy()
+            # טעינת 2024 בלבד מהמטמון הבינארי
+            self.df_2024 = load_market_data('../data/NQ2018.csv', years=[2024])
             
             print(f"✅ נטענו {len(self.df_2024):,} נקודות נתונים מ-2024")
             
@@ -87,7 +90,7 @@ class WinningStrategyFinder:
         """אסטרטגיית מעקב מגמה פשוטה"""
         print("\n🎯 בוחן: Simple Trend Following")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה פשוטים
         entry_conditions = (
@@ -133,7 +136,7 @@ class WinningStrategyFinder:
         """אסטרטגיית RSI mean reversion"""
         print("\n🎯 בוחן: RSI Mean Reversion")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה
         entry_conditions = (
@@ -176,7 +179,7 @@ class WinningStrategyFinder:
         """אסטרטגיית פריצת נפח"""
         print("\n🎯 בוחן: Volume Breakout")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה
         entry_conditions = (
@@ -218,7 +221,7 @@ class WinningStrategyFinder:
         """אסטרטגיה מבוססת זמן"""
         print("\n🎯 בוחן: Time Based Strategy")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה
         entry_conditions = (
@@ -262,7 +265,7 @@ class WinningStrategyFinder:
         """אסטרטגיית scalping אגרסיבית"""
         print("\n🎯 בוחן: Aggressive Scalping")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה רחבים
         entry_conditions = (
@@ -304,7 +307,7 @@ class WinningStrategyFinder:
         """אסטרטגיה שמרנית לונג"""
         print("\n🎯 בוחן: Conservative Long")
         
-        df = self.df_2024.copy()
+        df = self.df_2024
         
         # תנאי כניסה שמרניים
         entry_conditions = (
@@ -353,7 +356,10 @@ class WinningStrategyFinder:
         
         position = 0
         entry_price = 0
-        trades = []
+        entry_bar = 0
+        entry_bars = []
+        exit_bars = []
+        exit_prices = []
         
         for i in range(1, len(df)):
             if i >= len(df) - 1:
@@ -365,21 +371,15 @@ class WinningStrategyFinder:
             if position == 0 and entry_signals.iloc[i-1]:
                 position = 1
                 entry_price = current_price
+                entry_bar = i
                 
             # Exit
             elif position == 1 and exit_signals.iloc[i-1]:
                 exit_price = current_price
-                trade_return = (exit_price - entry_price) / entry_price
-                trade_pnl = trade_return * 20000  # NQ point value
                 
-                trades.append({
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'pnl': trade_pnl,
-                    'return': trade_return,
-                    'entry_time': df.index[i-1],
-                    'exit_time': df.index[i]
-                })
+                entry_bars.append(entry_bar)
+                exit_bars.append(i)
+                exit_prices.append(exit_price)
                 
                 position = 0
                 entry_price = 0
@@ -387,17 +387,14 @@ class WinningStrategyFinder:
         # Close final position
         if position == 1:
             exit_price = df.iloc[-1]['close']
-            trade_return = (exit_price - entry_price) / entry_price
-            trade_pnl = trade_return * 20000
-            
-            trades.append({
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'pnl': trade_pnl,
-                'return': trade_return,
-                'entry_time': df.index[-2],
-                'exit_time': df.index[-1]
-            })
+            entry_bars.append(entry_bar)
+            exit_bars.append(len(df) - 1)
+            exit_prices.append(exit_price)
+        
+        trades = TradeLedger.from_columns(
+            entry_bars, exit_bars, df['open'].to_numpy()[entry_bars], exit_prices,
+            index=df.index, reasons=None
+        )
         
         return self.evaluate_strategy(trades, strategy_name)
     
@@ -411,56 +408,22 @@ class WinningStrategyFinder:
             return None
         
         # Basic metrics
-        trade_returns = [t['pnl'] for t in trades]
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] < 0]
+        metrics = trades.metrics()
         
-        if len(losing_trades) == 0:
+        if metrics['num_losses'] == 0:
             print(f"   ❌ {strategy_name}: אין עסקאות מפסידות")
             return None
         
-        total_return = sum(trade_returns)
-        num_trades = len(trades)
-        win_rate = len(winning_trades) / num_trades
-        avg_trade = total_return / num_trades
-        
-        # Profit Factor
-        gross_profit = sum([t['pnl'] for t in winning_trades])
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades]))
-        profit_factor = gross_profit / gross_loss
-        
-        # Win/Loss ratio
-        avg_win = gross_profit / len(winning_trades)
-        avg_loss = gross_loss / len(losing_trades)
-        win_loss_ratio = avg_win / avg_loss
-        
-        # Sharpe Ratio
-        returns_std = np.std(trade_returns)
-        sharpe = (avg_trade / returns_std) * np.sqrt(252*24) if returns_std > 0 else 0
-        
-        # Drawdown
-        equity_curve = np.cumsum(trade_returns) + 100000
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = equity_curve - peak
-        max_drawdown = np.min(drawdown)
-        
-        # Max consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                consecutive_losses = 0
-        
-        # Monthly profits
-        monthly_profits = {}
-        for trade in trades:
-            month = trade['exit_time'].strftime('%Y-%m')
-            if month not in monthly_profits:
-                monthly_profits[month] = 0
-            monthly_profits[month] += trade['pnl']
+        total_return = metrics['total_return']
+        num_trades = metrics['num_trades']
+        win_rate = metrics['win_rate']
+        avg_trade = metrics['avg_trade']
+        profit_factor = metrics['profit_factor']
+        win_loss_ratio = metrics['win_loss_ratio']
+        sharpe = metrics['sharpe_hourly']
+        max_drawdown = metrics['max_drawdown']
+        max_consecutive_losses = metrics['max_consecutive_losses']
+        monthly_profits = metrics['monthly_profits']
         
         # Check criteria
         criteria_met = {